@@ -1,30 +1,87 @@
 # src/pymock/app.py
 from typing import Any
 
-from flask import Flask
+from flask import Blueprint, Flask, Response, request
+from werkzeug.exceptions import HTTPException, MethodNotAllowed, NotFound
 
 from pymock.config.loader import get_config
-from pymock.server.create_endpoint_blueprint import create_endpoint_blueprint
+from pymock.server.access_log import AccessLog, AccessLogMiddleware
+from pymock.server.admin import create_admin_blueprint
+from pymock.server.cache import ResponseCache
+from pymock.server.create_endpoint_blueprint import create_endpoint_blueprint, create_endpoint_routes
+from pymock.server.metrics import Metrics
+from pymock.server.proxy import Fallback
+from pymock.server.router import create_route_table
+from pymock.server.routes import LiveRouteTable, register_route_table
 
 MAX_PORT_NUMBER = 65535  # Maximum valid TCP/UDP port number
 
 
-def create_app(endpoint_configs: list[dict[str, Any]]) -> Flask:
+def create_app(
+    endpoint_configs: list[dict[str, Any]],
+    response_cache: ResponseCache | None = None,
+    *,
+    live_routes: LiveRouteTable | None = None,
+    router: str = "werkzeug",
+    fallback: Fallback | None = None,
+    metrics: Metrics | None = None,
+    access_log: AccessLog | None = None,
+) -> Flask:
     """
     Factory function to create and configure the Flask application.
 
     Args:
         endpoint_configs: List of endpoint configurations for routing.
+        response_cache: Cache for scenarios that opt into response caching. A default
+            ResponseCache is created if omitted.
+        live_routes: Serve the endpoints from this swappable route table, kept up to date by
+            an EndpointReloader, instead of compiling endpoint_configs.
+        router: 'werkzeug' registers each endpoint as a Flask URL rule; 'trie' serves them
+            all from one view through a TrieRouteTable, which scales to many endpoints.
+        fallback: Serves the requests that match no endpoint or no scenario, e.g. from a
+            recording proxy or a replayed capture.
+        metrics: Request counts and timings of the endpoints, served on /__pymock/metrics.
+            Pass the EndpointReloader's metrics along with live_routes.
+        access_log: Logs a sample of the requests as JSON lines.
 
     Returns:
         Configured Flask application instance.
     """
     app = Flask(__name__, template_folder="templates")
-    blueprint = create_endpoint_blueprint(endpoint_configs)
+    if response_cache is None:
+        response_cache = ResponseCache()
+    if metrics is None:
+        metrics = Metrics()
+    app.register_blueprint(create_admin_blueprint(response_cache, metrics))
+    if live_routes is None and router != "werkzeug":
+        live_routes = LiveRouteTable(
+            create_route_table(create_endpoint_routes(endpoint_configs, response_cache, fallback, metrics), router)
+        )
+    if live_routes is None:
+        blueprint = create_endpoint_blueprint(endpoint_configs, response_cache, fallback, metrics)
+    else:
+        blueprint = Blueprint("mock_blueprint", __name__)
+        register_route_table(blueprint, live_routes)
     app.register_blueprint(blueprint)
+    if fallback is not None:
+        for error in (NotFound, MethodNotAllowed):
+            app.register_error_handler(error, _create_fallback_handler(fallback))
+    if access_log is not None:
+        # Flask's documented way to add WSGI middleware, which mypy sees as replacing a method.
+        app.wsgi_app = AccessLogMiddleware(app.wsgi_app, access_log)  # type: ignore[method-assign]
     return app
 
 
+def _create_fallback_handler(fallback: Fallback):
+    """Hands requests that match no route to the fallback, keeping the error if it declines."""
+
+    def handle(error: HTTPException) -> Response | HTTPException:
+        response = fallback(request._get_current_object())  # type: ignore[attr-defined]
+        return error if response is None else response
+
+    return handle
+
+
 if __name__ == "__main__":
     config = get_config("config.yaml")
     endpoints_config = config.get("endpoints", [])
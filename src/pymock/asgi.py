@@ -0,0 +1,253 @@
+# src/pymock/asgi.py
+import asyncio
+import io
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import Any
+
+from werkzeug.exceptions import HTTPException, InternalServerError, MethodNotAllowed, NotFound
+from werkzeug.wrappers import Request as WerkzeugRequest
+from werkzeug.wrappers import Response as WerkzeugResponse
+
+from pymock.server.access_log import SCENARIO_ENVIRON_KEY, AccessLog
+from pymock.server.admin import create_admin_routes
+from pymock.server.cache import ResponseCache
+from pymock.server.create_endpoint_blueprint import create_endpoint_routes
+from pymock.server.latency import remaining_delay
+from pymock.server.metrics import Metrics
+from pymock.server.proxy import Fallback
+from pymock.server.router import create_route_table
+from pymock.server.routes import EndpointHandler, EndpointRoute, LiveRouteTable, RouteTable
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+
+class AsgiApp:
+    """
+    ASGI application serving the same routes as the Flask app, on an asyncio event loop.
+
+    Each connection costs a coroutine instead of an OS thread, so thousands of idle or slow
+    clients can be served by one process. Requests are matched with werkzeug's router and
+    handed to the route handlers as werkzeug requests. Handlers run in worker threads, since
+    rendering, file reads, store updates and upstream calls block, except those of routes that
+    only serve pre-encoded responses. Response delays are awaited on the event loop's timers,
+    so delayed responses do not hold up other requests.
+
+    Requests not matching any of routes fall through to live_routes, when given, and then to
+    fallback. Sampled requests are written to access_log, when given.
+    """
+
+    def __init__(
+        self,
+        routes: list[EndpointRoute],
+        live_routes: LiveRouteTable | None = None,
+        fallback: Fallback | None = None,
+        access_log: AccessLog | None = None,
+    ):
+        self.routes = RouteTable(routes)
+        self.live_routes = live_routes
+        self.fallback = fallback
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await _handle_lifespan(receive, send)
+        else:
+            msg = f"Unsupported ASGI scope type: {scope['type']}"
+            raise RuntimeError(msg)
+
+    async def _handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = await _read_body(receive)
+        environ = _build_environ(scope, body)
+        started = time.monotonic()
+        access_log = self.access_log if self.access_log is not None and self.access_log.sampled() else None
+        try:
+            route: tuple[EndpointHandler, dict[str, Any]] | HTTPException = self._match(environ)
+        except HTTPException as e:
+            route = e
+        if self._runs_inline(route):
+            response = self._respond(environ, route)
+        else:
+            response = await asyncio.to_thread(self._respond, environ, route)
+        if delay := remaining_delay(environ, started):
+            await asyncio.sleep(delay)
+        app_iter, status, headers = response.get_wsgi_response(environ)
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": int(status.split(" ", 1)[0]),
+                    "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+                }
+            )
+            if response.is_sequence:
+                await send({"type": "http.response.body", "body": b"".join(app_iter)})
+                return
+            # Streamed bodies, such as response files, are read chunk by chunk in a worker thread.
+            chunks = iter(app_iter)
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            response.close()
+            if access_log is not None:
+                access_log.record(
+                    environ["REQUEST_METHOD"],
+                    environ["PATH_INFO"],
+                    response.status_code,
+                    time.monotonic() - started,
+                    size=response.content_length,
+                    scenario=environ.get(SCENARIO_ENVIRON_KEY),
+                    remote_addr=environ.get("REMOTE_ADDR"),
+                )
+
+    def dispatch(self, environ: dict[str, Any]) -> WerkzeugResponse:
+        """Matches the request described by environ and returns the response of its route."""
+        try:
+            route: tuple[EndpointHandler, dict[str, Any]] | HTTPException = self._match(environ)
+        except HTTPException as e:
+            route = e
+        return self._respond(environ, route)
+
+    def _match(self, environ: dict[str, Any]) -> tuple[EndpointHandler, dict[str, Any]]:
+        try:
+            return self.routes.match(environ)
+        except NotFound:
+            if self.live_routes is None:
+                raise
+            return self.live_routes.current.match(environ)
+
+    def _runs_inline(self, route: tuple[EndpointHandler, dict[str, Any]] | HTTPException) -> bool:
+        """Returns True if the response to a route, or to a routing error, can be made without blocking."""
+        if isinstance(route, HTTPException):
+            return self.fallback is None
+        handler = route[0]
+        return handler in self.routes.inline_handlers or (
+            self.live_routes is not None and handler in self.live_routes.current.inline_handlers
+        )
+
+    def _respond(
+        self, environ: dict[str, Any], route: tuple[EndpointHandler, dict[str, Any]] | HTTPException
+    ) -> WerkzeugResponse:
+        """Returns the response of a matched route, or of the fallback for a routing error."""
+        source = WerkzeugRequest(environ)
+        try:
+            if isinstance(route, HTTPException):
+                raise route
+            handler, path_params = route
+            return handler(source, path_params)
+        except (NotFound, MethodNotAllowed) as e:
+            if self.fallback is not None and (response := self.fallback(source)) is not None:
+                return response
+            return e.get_response(environ)
+        except HTTPException as e:
+            return e.get_response(environ)
+        except Exception:
+            logger.exception("Failed to handle %s %s", source.method, source.path)
+            return InternalServerError().get_response(environ)
+
+
+def create_asgi_app(
+    endpoint_configs: list[dict[str, Any]],
+    response_cache: ResponseCache | None = None,
+    *,
+    live_routes: LiveRouteTable | None = None,
+    router: str = "werkzeug",
+    fallback: Fallback | None = None,
+    metrics: Metrics | None = None,
+    access_log: AccessLog | None = None,
+) -> AsgiApp:
+    """
+    Factory function to create the ASGI application.
+
+    Args:
+        endpoint_configs: List of endpoint configurations for routing.
+        response_cache: Cache for scenarios that opt into response caching. A default
+            ResponseCache is created if omitted.
+        live_routes: Serve the endpoints from this swappable route table, kept up to date by
+            an EndpointReloader, instead of compiling endpoint_configs.
+        router: Router matching the endpoints, 'werkzeug' or 'trie'.
+        fallback: Serves the requests that match no endpoint or no scenario.
+        metrics: Request counts and timings of the endpoints, served on /__pymock/metrics.
+        access_log: Logs a sample of the requests as JSON lines.
+
+    Returns:
+        Configured ASGI application instance.
+    """
+    if response_cache is None:
+        response_cache = ResponseCache()
+    if metrics is None:
+        metrics = Metrics()
+    if live_routes is None and router != "werkzeug":
+        live_routes = LiveRouteTable(
+            create_route_table(create_endpoint_routes(endpoint_configs, response_cache, fallback, metrics), router)
+        )
+    if live_routes is not None:
+        return AsgiApp(create_admin_routes(response_cache, metrics), live_routes, fallback, access_log)
+    routes = create_admin_routes(response_cache, metrics) + create_endpoint_routes(
+        endpoint_configs, response_cache, fallback, metrics
+    )
+    return AsgiApp(routes, fallback=fallback, access_log=access_log)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _build_environ(scope: Scope, body: bytes) -> dict[str, Any]:
+    """Translates an ASGI HTTP scope into the WSGI environ werkzeug requests are built from."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": client[1],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _handle_lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
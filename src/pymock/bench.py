@@ -0,0 +1,319 @@
+# src/pymock/bench.py
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from werkzeug.test import EnvironBuilder
+
+from pymock.app import create_app
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_REQUESTS = 2000
+DEFAULT_TOLERANCE = 0.2
+# Slow cases stop early, once they ran for this many seconds.
+DEFAULT_MAX_SECONDS = 10.0
+RESPONSE_KINDS = ("static", "jinja", "template", "file")
+# Requests traced for allocations, at most: tracing slows requests down, so it is a separate,
+# shorter run of a tenth of the timed requests.
+_TRACED_REQUESTS = 200
+_TEMPLATE_NAME = "bench.json.j2"
+_TEMPLATE = '{"key": "{{ key }}", "items": [{% for item in items %}{{ item | tojson }}{{ "," if not loop.last }}'
+_TEMPLATE += "{% endfor %}]}"
+# Rules of a scenario, in order: the first rule differs between scenarios, so a request
+# matching the last scenario is checked against every one before it.
+_RULE_TARGETS = (
+    {"target": "params", "prop": "key"},
+    {"target": "headers", "prop": "X-Tenant"},
+    {"target": "body", "prop": "$.order.customer.id"},
+    {"target": "cookies", "prop": "session"},
+)
+_REQUEST_VALUES = {"params": "variant", "headers": "acme", "body": "c-42", "cookies": "s-1"}
+
+
+class BenchCase(NamedTuple):
+    """One synthetic configuration to benchmark, and the shape of its responses."""
+
+    endpoints: int
+    scenarios: int
+    rules: int
+    response: str
+    body_bytes: int
+
+    @property
+    def name(self) -> str:
+        return f"e{self.endpoints}-s{self.scenarios}-r{self.rules}-{self.response}-{self.body_bytes}b"
+
+
+class BenchResult(NamedTuple):
+    """The measurements of one case."""
+
+    requests_per_second: float
+    p50_us: float
+    p99_us: float
+    alloc_kib: float
+
+
+# Each case varies one dimension of the first one.
+DEFAULT_CASES = (
+    BenchCase(10, 3, 1, "static", 1024),
+    BenchCase(1000, 3, 1, "static", 1024),
+    BenchCase(10, 50, 1, "static", 1024),
+    BenchCase(10, 3, 4, "static", 1024),
+    BenchCase(10, 3, 1, "jinja", 1024),
+    BenchCase(10, 3, 1, "template", 1024),
+    BenchCase(10, 3, 1, "file", 1024),
+    BenchCase(10, 3, 1, "static", 65536),
+    BenchCase(10, 3, 1, "jinja", 65536),
+)
+
+
+def generate_endpoints(case: BenchCase, workdir: Path) -> list[dict[str, Any]]:
+    """
+    Generates the endpoint configs of a case. Files and templates the responses need are
+    written to workdir, which must be the working directory while the endpoints are served.
+    """
+    if case.response not in RESPONSE_KINDS:
+        msg = f"Unknown response kind {case.response!r}: expected one of {', '.join(RESPONSE_KINDS)}"
+        raise ConfigError(msg)
+    if not 1 <= case.rules <= len(_RULE_TARGETS):
+        msg = f"Benchmark scenarios have 1 to {len(_RULE_TARGETS)} rules, not {case.rules}"
+        raise ConfigError(msg)
+
+    items = _items(case.body_bytes, dynamic=case.response == "jinja")
+    if case.response == "template":
+        (workdir / "templates").mkdir(exist_ok=True)
+        (workdir / "templates" / _TEMPLATE_NAME).write_text(_TEMPLATE)
+        response = {"template": _TEMPLATE_NAME, "data": {"key": "{{ request.args.key }}", "items": items}}
+    elif case.response == "file":
+        path = workdir / "body.json"
+        path.write_text(json.dumps({"items": items}))
+        response = {"file": str(path), "content_type": "application/json"}
+    else:
+        response = {"data": {"items": items}}
+
+    return [
+        {
+            "path": f"/bench/{endpoint}/orders",
+            "method": "POST",
+            "scenarios": [
+                {
+                    "scenario_name": f"scenario-{scenario}",
+                    "rules": _rules(case.rules, f"variant-{scenario}"),
+                    "response": {"status": 200, **response},
+                }
+                for scenario in range(case.scenarios)
+            ],
+        }
+        for endpoint in range(case.endpoints)
+    ]
+
+
+def run_case(
+    case: BenchCase, requests: int = DEFAULT_REQUESTS, max_seconds: float = DEFAULT_MAX_SECONDS
+) -> BenchResult:
+    """
+    Serves the requests of a case through the raw WSGI callable of the app, and measures them.
+    Fewer requests are made if they take longer than max_seconds in total.
+
+    Requests go to the last scenario of an endpoint halfway through the endpoint list, so every
+    scenario of the endpoint is considered.
+
+    Raises:
+        ConfigError: If the case is invalid, or its request is not answered with 200.
+    """
+    with tempfile.TemporaryDirectory(prefix="pymock-bench-") as workdir, _working_directory(workdir):
+        app = create_app(generate_endpoints(case, Path(workdir)))
+        body = json.dumps({"order": {"customer": {"id": _REQUEST_VALUES["body"]}}}).encode()
+        builder = EnvironBuilder(
+            path=f"/bench/{case.endpoints // 2}/orders",
+            method="POST",
+            query_string={"key": f"variant-{case.scenarios - 1}"},
+            headers=[("X-Tenant", _REQUEST_VALUES["headers"]), ("Cookie", f"session={_REQUEST_VALUES['cookies']}")],
+            data=body,
+            content_type="application/json",
+        )
+        environ = builder.get_environ()
+
+        statuses: list[str] = []
+
+        def start_response(
+            status: str, _headers: list[tuple[str, str]], _exc_info: Any = None
+        ) -> Callable[[bytes], object]:
+            statuses.append(status)
+            return _discard
+
+        def call() -> None:
+            statuses.clear()
+            result = app({**environ, "wsgi.input": io.BytesIO(body)}, start_response)
+            try:
+                for _ in result:
+                    pass
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            if not statuses[0].startswith("200"):
+                msg = f"Benchmark request for {case.name} was answered with {statuses[0]}"
+                raise ConfigError(msg)
+
+        for _ in range(min(requests, 20)):
+            call()
+        gc.collect()
+        latencies = []
+        started = time.perf_counter()
+        deadline = started + max_seconds
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            call()
+            request_stopped = time.perf_counter()
+            latencies.append(request_stopped - request_started)
+            if request_stopped > deadline:
+                break
+        elapsed = time.perf_counter() - started
+
+        return BenchResult(
+            requests_per_second=round(len(latencies) / elapsed, 1),
+            p50_us=round(_percentile(latencies, 0.5) * 1e6, 1),
+            p99_us=round(_percentile(latencies, 0.99) * 1e6, 1),
+            alloc_kib=round(_peak_allocations(call, min(_TRACED_REQUESTS, len(latencies) // 10 + 1)) / 1024, 1),
+        )
+
+
+def run_benchmarks(
+    cases: Iterable[BenchCase], requests: int = DEFAULT_REQUESTS, max_seconds: float = DEFAULT_MAX_SECONDS
+) -> dict[str, BenchResult]:
+    """Runs several cases, logging each result as it completes."""
+    results = {}
+    for case in cases:
+        results[case.name] = result = run_case(case, requests, max_seconds)
+        logger.info("%s: %.0f req/s, p99 %.1f us", case.name, result.requests_per_second, result.p99_us)
+    return results
+
+
+def save_baseline(path: str | os.PathLike, results: dict[str, BenchResult]) -> None:
+    """Writes results as a JSON baseline, recording the interpreter they were measured on."""
+    baseline = {
+        "version": BASELINE_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cases": {name: result._asdict() for name, result in results.items()},
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def load_baseline(path: str | os.PathLike) -> dict[str, BenchResult]:
+    """
+    Reads a baseline written by save_baseline.
+
+    Raises:
+        ConfigError: If the file cannot be read or is not a baseline.
+    """
+    try:
+        baseline = json.loads(Path(path).read_text())
+        if baseline.get("version") != BASELINE_FORMAT_VERSION:
+            msg = f"Unsupported baseline version {baseline.get('version')!r} in '{path}'"
+            raise ConfigError(msg)
+        return {name: BenchResult(**values) for name, values in baseline["cases"].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        msg = f"Cannot read benchmark baseline '{path}': {e}"
+        raise ConfigError(msg) from e
+
+
+def compare(
+    results: dict[str, BenchResult], baseline: dict[str, BenchResult], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """
+    Returns a description of each regression of results against the baseline: throughput
+    lower, or p99 latency or allocations higher, by more than the tolerance (a fraction).
+    Cases missing from the baseline are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result.requests_per_second < expected.requests_per_second * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result.requests_per_second:.0f} req/s, baseline {expected.requests_per_second:.0f}"
+            )
+        if result.p99_us > expected.p99_us * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result.p99_us:.1f} us, baseline {expected.p99_us:.1f}")
+        if result.alloc_kib > expected.alloc_kib * (1 + tolerance):
+            regressions.append(f"{name}: {result.alloc_kib:.1f} KiB allocated, baseline {expected.alloc_kib:.1f}")
+    return regressions
+
+
+def format_results(results: dict[str, BenchResult], baseline: dict[str, BenchResult] | None = None) -> str:
+    """Formats results as a table, with the change from the baseline's throughput if given."""
+    width = max((len(name) for name in results), default=4)
+    lines = [f"{'case':<{width}}  {'req/s':>9}  {'p50 us':>8}  {'p99 us':>8}  {'KiB':>8}  {'vs base':>7}"]
+    for name, result in results.items():
+        expected = (baseline or {}).get(name)
+        change = f"{result.requests_per_second / expected.requests_per_second - 1:+.0%}" if expected else "-"
+        lines.append(
+            f"{name:<{width}}  {result.requests_per_second:>9.0f}  {result.p50_us:>8.1f}  "
+            f"{result.p99_us:>8.1f}  {result.alloc_kib:>8.1f}  {change:>7}"
+        )
+    return "\n".join(lines)
+
+
+def _rules(count: int, first_value: str) -> list[dict[str, Any]]:
+    values = [first_value, *(_REQUEST_VALUES[target["target"]] for target in _RULE_TARGETS[1:count])]
+    return [{**target, "op": "equals", "value": value} for target, value in zip(_RULE_TARGETS, values, strict=False)]
+
+
+def _items(body_bytes: int, *, dynamic: bool) -> list[dict[str, Any]]:
+    """Builds a list of items serializing to about body_bytes of JSON."""
+    name = "{{ request.args.key }}" if dynamic else "item"
+    item_bytes = len(json.dumps({"id": 0, "name": "variant-0", "price": 9.99, "tags": ["a", "b"]})) + 2
+    return [
+        {"id": index, "name": name, "price": 9.99, "tags": ["a", "b"]}
+        for index in range(max(1, body_bytes // item_bytes))
+    ]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def _discard(_data: bytes) -> None:
+    """The write callable start_response returns; Flask returns its response body instead of writing it."""
+
+
+def _peak_allocations(call: Any, requests: int) -> float:
+    """Returns the mean peak of memory allocated while handling a request, in bytes."""
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(requests):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / requests
+
+
+@contextmanager
+def _working_directory(path: str) -> Iterator[None]:
+    """Template responses are looked up in 'templates' under the working directory."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
@@ -1,33 +1,179 @@
 # src/pymock/cli.py
 import argparse
 import sys
+from collections.abc import Callable
+from typing import Any
 
-from pymock.app import create_app
-from pymock.config.loader import get_config
-from pymock.logging_config import setup_logging
+from pymock.server.exceptions import ConfigError
 
+# Subcommands; any other first argument is treated as a config path for 'serve'.
+COMMANDS = ("serve", "compile", "bench", "load")
 
-def run_server(config_path: str) -> None:
-    config = get_config(config_path)
-    logging_conf = config.get("logging", {})
-    setup_logging(logging_conf)
+ENGINES = ("wsgi", "asgi")
 
-    server_conf = config["server"]
-    endpoints_config = config["endpoints"]
+# Choices and defaults shown by 'serve --help', repeated from the server modules so that parsing
+# arguments, or 'pymock --version', imports none of Flask, Jinja2 or Faker.
+ROUTERS = ("werkzeug", "trie")
+CAPTURE_MODES = ("off", "record", "replay")
+DEFAULT_WATCH_INTERVAL = 1.0
+DEFAULT_KEEPALIVE = 5.0
+DEFAULT_BACKLOG = 2048
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
 
-    app = create_app(endpoints_config)
-    app.run(
-        host=server_conf.get("host", "0.0.0.0"),
-        port=server_conf.get("port", 8085),
-        debug=config.get("debug", False),
-        threaded=True,
+
+def _serve(args: argparse.Namespace) -> None:
+    from pymock import serve  # noqa: PLC0415
+
+    overrides = {
+        key: value
+        for key, value in {
+            "engine": args.engine,
+            "router": args.router,
+            "workers": args.workers,
+            "max_requests": args.max_requests,
+            "max_requests_jitter": args.max_requests_jitter,
+            "keepalive": args.keepalive,
+            "backlog": args.backlog,
+            "reuse_port": args.reuse_port,
+            "graceful_timeout": args.graceful_timeout,
+            "watch": args.watch,
+            "watch_interval": args.watch_interval,
+        }.items()
+        if value is not None
+    }
+    capture_overrides = {
+        key: value
+        for key, value in {"mode": args.capture, "file": args.capture_file, "upstream": args.upstream}.items()
+        if value is not None
+    }
+    serve.run_server(
+        args.config, clear_cache=args.clear_cache, server_overrides=overrides, capture_overrides=capture_overrides
     )
 
 
-def main() -> None:
-    """Parses command-line arguments and starts the PyMock server."""
-    parser = argparse.ArgumentParser(
-        description="PyMock: A versatile mock API server.",
+def _compile(args: argparse.Namespace) -> None:
+    from pymock.config.loader import ConfigLoader  # noqa: PLC0415
+
+    snapshot = ConfigLoader.compile_snapshot(args.config, args.output)
+    endpoints = sum(len(result.endpoints) for result in snapshot.files)
+    print(f"Compiled {endpoints} endpoints from {len(snapshot.files)} files into {args.output}")  # noqa: T201
+
+
+def _bench(args: argparse.Namespace) -> None:
+    # The benchmark harness is only needed by this command.
+    from pymock import bench  # noqa: PLC0415
+
+    cases = [case for case in bench.DEFAULT_CASES if not args.cases or any(part in case.name for part in args.cases)]
+    if not cases:
+        msg = f"No benchmark case matches {', '.join(args.cases)}"
+        raise ConfigError(msg)
+    baseline = bench.load_baseline(args.compare) if args.compare else None
+    results = bench.run_benchmarks(cases, args.requests, args.max_seconds)
+    print(bench.format_results(results, baseline))  # noqa: T201
+    if args.save:
+        bench.save_baseline(args.save, results)
+        print(f"Saved baseline to {args.save}")  # noqa: T201
+    if baseline is not None:
+        regressions = bench.compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)  # noqa: T201
+        if regressions:
+            sys.exit(1)
+
+
+def _add_bench_command(subparsers: Any) -> None:
+    # Defaults are repeated here so that 'pymock --help' does not import the benchmark harness.
+    parser = subparsers.add_parser(
+        "bench",
+        help="Benchmark the request pipeline on synthetic configurations",
+        description="Serve synthetic endpoints through the WSGI app and report req/s, p50/p99 latency and "
+        "allocations per case. Save the results as a baseline, and compare later runs against it: the "
+        "command fails if a case regressed by more than the tolerance.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "cases",
+        nargs="*",
+        help="Only run the cases whose name contains one of these strings, e.g. 'jinja' or 'e1000'",
+    )
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Timed requests per case")
+    parser.add_argument(
+        "--max-seconds", type=float, default=10.0, help="Stop timing a case early after this many seconds"
+    )
+    parser.add_argument("--save", type=str, help="Write the results to this JSON baseline")
+    parser.add_argument("--compare", type=str, help="Compare the results with this JSON baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction by which a case may be slower or allocate more than its baseline",
+    )
+    parser.set_defaults(handler=_bench)
+
+
+def _load(args: argparse.Namespace) -> None:
+    from pymock import load  # noqa: PLC0415
+
+    if (args.corpus is None) == (args.config is None):
+        msg = "Give either --corpus or --config as the source of requests"
+        raise ConfigError(msg)
+    if args.processes < 1 or args.connections < 1:
+        msg = "--processes and --connections must be at least 1"
+        raise ConfigError(msg)
+    requests = load.read_corpus(args.corpus) if args.corpus else load.requests_from_config(args.config)
+    plan = load.LoadPlan(
+        target=args.target,
+        requests=requests,
+        duration=args.duration,
+        connections=args.connections,
+        rate=args.rate / args.processes if args.rate else None,
+        timeout=args.timeout,
+        processes=args.processes,
+    )
+    mode = f"open loop at {args.rate:g} req/s" if args.rate else "closed loop"
+    print(  # noqa: T201
+        f"Sending {len(requests)} distinct requests to {args.target} for {args.duration:g}s, {mode}, "
+        f"over {args.processes} x {args.connections} connections"
+    )
+    summary = load.summarize(load.run_load(plan), args.duration)
+    print(load.format_summary(summary))  # noqa: T201
+    if args.json:
+        load.write_summary(args.json, summary)
+
+
+def _add_load_command(subparsers: Any) -> None:
+    parser = subparsers.add_parser(
+        "load",
+        help="Send load to a running server and report throughput and latency per endpoint",
+        description="Replay a request corpus, or one request per scenario of a configuration, against a "
+        "server over keep-alive connections. Without --rate, each connection sends its next request as "
+        "soon as it has a response (closed loop); with --rate, requests are sent at that fixed rate "
+        "(open loop) and latencies include the time they waited for a free connection.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--corpus",
+        type=str,
+        help="JSONL file with one request per line: method, path, and optionally headers, body and endpoint",
+    )
+    source.add_argument("--config", type=str, help="Configuration whose endpoints' scenarios requests are built from")
+    parser.add_argument("--target", type=str, default="http://127.0.0.1:8085", help="Base URL of the server")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds to send requests for")
+    parser.add_argument("-c", "--connections", type=int, default=8, help="Keep-alive connections per process")
+    parser.add_argument("-p", "--processes", type=int, default=1, help="Load-generating processes")
+    parser.add_argument("--rate", type=float, help="Total requests per second (open loop); unlimited if omitted")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for a response")
+    parser.add_argument("--json", type=str, help="Also write the results to this JSON file")
+    parser.set_defaults(handler=_load)
+
+
+def _add_compile_command(subparsers: Any) -> None:
+    parser = subparsers.add_parser(
+        "compile",
+        help="Compile a configuration and its endpoint files into a snapshot for fast startup",
+        description="Compile a configuration into a snapshot. Serve it with 'pymock serve <snapshot>'; "
+        "endpoint files changed since compiling are re-read when the server starts.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     parser.add_argument(
@@ -35,20 +181,140 @@ def main() -> None:
         type=str,
         help="Path to the configuration YAML file",
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="mocks.snapshot",
+        help="Path of the snapshot to write",
+    )
+    parser.set_defaults(handler=_compile)
+
+
+def _add_serve_command(subparsers: Any) -> None:
+    parser = subparsers.add_parser(
+        "serve",
+        help="Start the mock server (default command)",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "config",
+        type=str,
+        help="Path to the configuration YAML file, or to a snapshot written by 'pymock compile'",
+    )
     parser.add_argument(
         "--clear-cache",
         action="store_true",
-        help="Clear all caches (Flask-Caching and Jinja2 templates) before running",
+        help="Clear all caches (Jinja2 templates and bytecode, cached responses) before running. "
+        "Cached responses can also be flushed at runtime with DELETE /__pymock/cache",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        default=None,
+        help="Reload endpoint files when they change, without restarting (uses watchdog if installed)",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        help=f"Seconds between checks for changed endpoint files when polling [{DEFAULT_WATCH_INTERVAL}]",
+    )
+    capture = parser.add_argument_group("capture", "Override the matching 'capture' settings of the config file")
+    capture.add_argument(
+        "--capture",
+        choices=CAPTURE_MODES,
+        help="'record' proxies requests no scenario matches to --upstream and records them; "
+        "'replay' answers them from the recordings [off]",
+    )
+    capture.add_argument(
+        "--capture-file",
+        type=str,
+        help="Capture file to record into or replay from [pymock.capture]",
+    )
+    capture.add_argument(
+        "--upstream",
+        type=str,
+        help="Base URL of the server to record, e.g. http://localhost:9000",
+    )
+    workers = parser.add_argument_group("workers", "Override the matching 'server' settings of the config file")
+    workers.add_argument(
+        "--engine",
+        choices=ENGINES,
+        help="Serving engine: 'wsgi' (threaded or pre-forked Flask) or 'asgi' (asyncio, needs uvicorn) [wsgi]",
+    )
+    workers.add_argument(
+        "--router",
+        choices=ROUTERS,
+        help="Endpoint router: 'werkzeug' (one URL rule per endpoint) or 'trie' (for many endpoints) [werkzeug]",
+    )
+    workers.add_argument(
+        "--workers",
+        type=int,
+        help="Number of pre-forked worker processes; 1 runs the single-process threaded server",
+    )
+    workers.add_argument(
+        "--max-requests",
+        type=int,
+        help="Restart a worker after it served this many requests (0 disables recycling)",
+    )
+    workers.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        help="Random extra requests added per worker to max-requests, to spread restarts",
+    )
+    workers.add_argument(
+        "--keepalive",
+        type=float,
+        help=f"Seconds an idle keep-alive connection stays open (0 disables keep-alive) [{DEFAULT_KEEPALIVE}]",
+    )
+    workers.add_argument(
+        "--backlog",
+        type=int,
+        help=f"Maximum number of pending connections [{DEFAULT_BACKLOG}]",
+    )
+    workers.add_argument(
+        "--reuse-port",
+        action="store_true",
+        default=None,
+        help="Give each worker its own SO_REUSEPORT socket instead of sharing one",
+    )
+    workers.add_argument(
+        "--graceful-timeout",
+        type=float,
+        help=f"Seconds workers get to finish in-flight requests when stopping [{DEFAULT_GRACEFUL_TIMEOUT}]",
+    )
+    parser.set_defaults(handler=_serve)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="PyMock: A versatile mock API server.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     parser.add_argument(
         "--version",
         action="version",
         version="PyMock 0.1.0",  # Replace with dynamic version if needed
     )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_serve_command(subparsers)
+    _add_compile_command(subparsers)
+    _add_bench_command(subparsers)
+    _add_load_command(subparsers)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parses command-line arguments and runs the requested PyMock command."""
+    argv = sys.argv[1:] if argv is None else argv
+    # Keep supporting the original 'pymock config.yaml [--clear-cache]' form.
+    if argv and argv[0] not in COMMANDS and argv[0] not in {"-h", "--help", "--version"}:
+        argv = ["serve", *argv]
 
-    args = parser.parse_args()
+    args = _build_parser().parse_args(argv)
+    handler: Callable[[argparse.Namespace], None] = args.handler
     try:
-        run_server(args.config)
+        handler(args)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)  # noqa: T201
         sys.exit(1)
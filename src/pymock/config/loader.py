@@ -1,18 +1,40 @@
 # src/pymock/config/loader.py
 import logging
 import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-from pymock.config.validator import validate_config
+from pymock.config.snapshot import (
+    ConfigSnapshot,
+    EndpointFileResult,
+    digest_bytes,
+    is_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+from pymock.config.validator import validate_config, validate_endpoint
 from pymock.constants.schemas import CONFIG_SCHEMA
 from pymock.server.exceptions import ConfigError
 
 logger = logging.getLogger(__name__)
 
+# libyaml's loader is several times faster than the pure-Python one; it is used when PyYAML
+# was built with it.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+ENDPOINT_FILE_SUFFIXES = (".yaml", ".yml")
+DEFAULT_LOADER_CHUNK_SIZE = 64
+DEFAULT_SLOW_FILE_MS = 100.0
+# Below this many files, starting worker processes costs more than it saves.
+MIN_FILES_FOR_PROCESS_POOL = 256
+SLOWEST_FILES_REPORTED = 5
+
 
 class ConfigLoader:
     """Manages loading and caching of YAML configuration files."""
@@ -24,7 +46,8 @@ class ConfigLoader:
         Returns the singleton configuration, loading it from the provided path if not cached.
 
         Args:
-            config_path: Path to the main YAML configuration file.
+            config_path: Path to the main YAML configuration file, or to a snapshot written by
+                'pymock compile'.
 
         Returns:
             The loaded configuration dictionary.
@@ -32,6 +55,8 @@ class ConfigLoader:
         Raises:
             ConfigError: If loading or validation fails.
         """
+        if is_snapshot(config_path):
+            return ConfigLoader._load_snapshot(config_path)
         return ConfigLoader._load_config(config_path)
 
     @staticmethod
@@ -49,20 +74,10 @@ class ConfigLoader:
             ConfigError: If file access, parsing, or validation fails.
         """
         try:
-            config_file = Path(config_path)
-            with config_file.open(encoding="utf-8") as file:
-                config = yaml.safe_load(file)  # Remove 'or {}' to let errors propagate
-                if config is None:
-                    config = {}
-
-            if not isinstance(config, dict):
-                msg = f"Config at '{config_path}' must be a dictionary, got {type(config)}"
-                raise ConfigError(msg)
-
-            validate_config(config, CONFIG_SCHEMA)
+            config = ConfigLoader._read_main_config(config_path)
             config = ConfigLoader._apply_env_overrides(config)
             endpoints_path = config.get("endpoints_path", [])
-            config["endpoints"] = ConfigLoader._scan_endpoint_dirs(endpoints_path)
+            config["endpoints"] = ConfigLoader._scan_endpoint_dirs(endpoints_path, config.get("loader", {}))
             return config
 
         except (yaml.YAMLError, ConfigError, OSError) as e:
@@ -70,6 +85,91 @@ class ConfigLoader:
             msg = f"Configuration error at '{config_path}': {e!s}"
             raise ConfigError(msg) from e
 
+    @staticmethod
+    def _read_main_config(config_path: str, data: bytes | None = None) -> dict[str, Any]:
+        """Parses and validates the main config file, before environment overrides."""
+        if data is None:
+            data = Path(config_path).read_bytes()
+        # Remove 'or {}' to let errors propagate
+        config = yaml.load(data, Loader=SafeLoader)  # noqa: S506
+        if config is None:
+            config = {}
+
+        if not isinstance(config, dict):
+            msg = f"Config at '{config_path}' must be a dictionary, got {type(config)}"
+            raise ConfigError(msg)
+
+        validate_config(config, CONFIG_SCHEMA)
+        return config
+
+    @staticmethod
+    def compile_snapshot(config_path: str, output_path: str) -> ConfigSnapshot:
+        """
+        Loads a configuration and all its endpoint files, and writes them to a snapshot.
+
+        Environment overrides are not baked in; they are applied whenever the snapshot is loaded.
+
+        Args:
+            config_path: Path to the main YAML configuration file.
+            output_path: Path of the snapshot to write.
+
+        Returns:
+            The snapshot written.
+
+        Raises:
+            ConfigError: If loading or validation fails.
+        """
+        try:
+            data = Path(config_path).read_bytes()
+            config = ConfigLoader._read_main_config(config_path, data)
+            endpoints_path = ConfigLoader._apply_env_overrides(dict(config)).get("endpoints_path", [])
+            files = ConfigLoader.scan_endpoint_files(endpoints_path, config.get("loader", {}))
+        except (yaml.YAMLError, ConfigError, OSError) as e:
+            msg = f"Configuration error at '{config_path}': {e!s}"
+            raise ConfigError(msg) from e
+
+        for result in files:
+            if result.error is not None:
+                msg = f"Failed to parse endpoint file '{result.path}': {result.error}"
+                raise ConfigError(msg)
+        snapshot = ConfigSnapshot(str(config_path), digest_bytes(data), config, files)
+        write_snapshot(output_path, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _load_snapshot(snapshot_path: str) -> dict[str, Any]:
+        """
+        Loads a configuration from a snapshot, re-reading only the sources that changed since.
+
+        The main config is re-validated only if its content hash changed. Endpoint files are
+        re-parsed only if their size or modification time and then their content hash changed;
+        new files are parsed and deleted ones dropped. Endpoint directories that do not exist
+        where the snapshot is loaded are taken from the snapshot as they are.
+        """
+        try:
+            snapshot = read_snapshot(snapshot_path)
+            config = snapshot.config
+            try:
+                data = Path(snapshot.config_path).read_bytes()
+            except OSError:
+                logger.info("Config '%s' not found; using the snapshot's copy", snapshot.config_path)
+            else:
+                if digest_bytes(data) != snapshot.config_digest:
+                    logger.info("Config '%s' changed since the snapshot; reloading it", snapshot.config_path)
+                    config = ConfigLoader._read_main_config(snapshot.config_path, data)
+
+            config = ConfigLoader._apply_env_overrides(dict(config))
+            endpoints_path = config.get("endpoints_path", [])
+            config["endpoints"] = ConfigLoader._scan_endpoint_dirs(
+                endpoints_path, config.get("loader", {}), previous=snapshot.files
+            )
+            return config
+
+        except (yaml.YAMLError, ConfigError, OSError, pickle.UnpicklingError) as e:
+            logger.error("Failed to load snapshot '%s': %s", snapshot_path, e, exc_info=True)
+            msg = f"Configuration error at '{snapshot_path}': {e!s}"
+            raise ConfigError(msg) from e
+
     @staticmethod
     def _apply_env_overrides(config: dict[str, Any]) -> dict[str, Any]:
         """
@@ -118,35 +218,165 @@ class ConfigLoader:
         return config
 
     @staticmethod
-    def _scan_endpoint_dirs(endpoint_dirs: list[str]) -> list[dict[str, Any]]:
+    def _scan_endpoint_dirs(
+        endpoint_dirs: list[str],
+        loader_conf: dict[str, Any] | None = None,
+        previous: list[EndpointFileResult] | None = None,
+    ) -> list[dict[str, Any]]:
         """
-        Scans directories recursively for endpoint YAML files.
+        Scans directories recursively for endpoint YAML files (.yaml and .yml).
+
+        Each file may hold several YAML documents, and each document either one endpoint or a
+        list of endpoints. Endpoints are returned in a deterministic order: by directory, then
+        by file path, then by position within the file.
 
         Args:
             endpoint_dirs: List of directory paths to scan.
+            loader_conf: The 'loader' config section, see scan_endpoint_files.
+            previous: Results of an earlier scan, e.g. from a snapshot, reused for unchanged files.
 
         Returns:
             List of endpoint configurations from YAML files.
         """
+        started = time.perf_counter()
+        results = ConfigLoader.scan_endpoint_files(endpoint_dirs, loader_conf, previous)
+
         endpoints: list[dict[str, Any]] = []
+        for result in results:
+            if result.error is not None:
+                logger.error("Failed to parse endpoint file '%s': %s", result.path, result.error)
+            endpoints.extend(result.endpoints)
+
+        logger.info(
+            "Loaded %d endpoints from %d files in %.1f ms",
+            len(endpoints),
+            len(results),
+            (time.perf_counter() - started) * 1000,
+        )
+        return endpoints
 
+    @staticmethod
+    def scan_endpoint_files(
+        endpoint_dirs: list[str],
+        loader_conf: dict[str, Any] | None = None,
+        previous: list[EndpointFileResult] | None = None,
+    ) -> list[EndpointFileResult]:
+        """
+        Parses the endpoint files of the given directories, in a process pool for large trees.
+
+        Args:
+            endpoint_dirs: List of directory paths to scan.
+            loader_conf: The 'loader' config section: 'workers' (processes, 1 disables the
+                pool), 'chunk_size' (files per task) and 'slow_file_ms' (parse time above
+                which a file is reported).
+            previous: Results of an earlier scan. Files whose size and modification time, or
+                else whose content hash, did not change are not parsed again.
+
+        Returns:
+            One result per file, in file order.
+        """
+        loader_conf = loader_conf or {}
+        known = {result.path: result for result in previous or []}
+        results: list[EndpointFileResult | None] = []
+        to_parse: list[tuple[int, str]] = []
         for dir_path in map(Path, endpoint_dirs):
             if not dir_path.exists():
-                logger.warning("Endpoints directory '%s' does not exist", dir_path)
+                reused = [result for result in known.values() if Path(result.path).is_relative_to(dir_path)]
+                if reused:
+                    logger.info(
+                        "Endpoints directory '%s' does not exist; using %d snapshot files", dir_path, len(reused)
+                    )
+                    results.extend(reused)
+                else:
+                    logger.warning("Endpoints directory '%s' does not exist", dir_path)
                 continue
+            for file_path in ConfigLoader._find_endpoint_files(dir_path):
+                result = known.get(file_path)
+                if result is None or not result.is_current(os.stat(file_path)):
+                    to_parse.append((len(results), file_path))
+                results.append(result)
+
+        workers = loader_conf.get("workers", os.cpu_count() or 1)
+        chunk_size = loader_conf.get("chunk_size", DEFAULT_LOADER_CHUNK_SIZE)
+        paths = [file_path for _, file_path in to_parse]
+        digests = [result.digest if (result := results[position]) is not None else "" for position, _ in to_parse]
+        if workers > 1 and len(paths) >= MIN_FILES_FOR_PROCESS_POOL:
+            logger.debug("Parsing %d endpoint files with %d processes", len(paths), workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_load_endpoint_file, paths, digests, chunksize=chunk_size))
+        else:
+            parsed = list(map(_load_endpoint_file, paths, digests))
+
+        changed = 0
+        for (position, _), result in zip(to_parse, parsed, strict=True):
+            earlier = results[position]
+            if earlier is not None and result.error is None and earlier.digest == result.digest:
+                results[position] = earlier._replace(mtime_ns=result.mtime_ns, size=result.size)
+            else:
+                results[position] = result
+                changed += 1
+        if previous is not None and paths:
+            logger.info("Checked %d of %d endpoint files; %d re-parsed", len(paths), len(results), changed)
+
+        ConfigLoader._report_timings(parsed, loader_conf.get("slow_file_ms", DEFAULT_SLOW_FILE_MS))
+        return [result for result in results if result is not None]
 
-            for file_path in dir_path.rglob("*.yaml"):
-                try:
-                    with file_path.open(encoding="utf-8") as file:
-                        endpoint_config = yaml.safe_load(file)
-                        if isinstance(endpoint_config, dict) and endpoint_config:
-                            endpoints.append(endpoint_config)
-                        elif endpoint_config is not None:
-                            logger.warning("Skipping non-dict config in '%s'", file_path)
-                except yaml.YAMLError as e:
-                    logger.error("Failed to parse endpoint file '%s': %s", file_path, e)
+    @staticmethod
+    def _find_endpoint_files(dir_path: Path) -> list[str]:
+        return [
+            str(file_path)
+            for file_path in sorted(dir_path.rglob("*"))
+            if file_path.suffix in ENDPOINT_FILE_SUFFIXES and file_path.is_file()
+        ]
 
-        return endpoints
+    @staticmethod
+    def _report_timings(results: list[EndpointFileResult], slow_file_ms: float) -> None:
+        """Logs files slower to parse than slow_file_ms, and the slowest files at debug level."""
+        for result in results:
+            if result.elapsed_ms > slow_file_ms:
+                logger.warning("Endpoint file '%s' took %.1f ms to parse", result.path, result.elapsed_ms)
+        if logger.isEnabledFor(logging.DEBUG):
+            slowest = sorted(results, key=lambda result: result.elapsed_ms, reverse=True)[:SLOWEST_FILES_REPORTED]
+            for result in slowest:
+                logger.debug("Parsed '%s' in %.1f ms", result.path, result.elapsed_ms)
+
+
+def _load_endpoint_file(file_path: str, known_digest: str = "") -> EndpointFileResult:
+    """
+    Parses one endpoint file and validates its endpoints against ENDPOINT_SCHEMA. Runs in worker
+    processes, so errors are returned, not raised.
+
+    If the file's content hash equals known_digest, it is not parsed and the result holds no
+    endpoints; the caller keeps the ones it already has.
+    """
+    started = time.perf_counter()
+    endpoints: list[dict[str, Any]] = []
+    digest = ""
+    mtime_ns = size = 0
+    error = None
+    try:
+        with open(file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+            data = file.read()
+        digest = digest_bytes(data)
+        if digest == known_digest:
+            return EndpointFileResult(file_path, [], 0.0, digest, mtime_ns, size)
+        for document in yaml.load_all(data, Loader=SafeLoader):
+            entries = document if isinstance(document, list) else [document]
+            for entry in entries:
+                if isinstance(entry, dict) and entry:
+                    endpoints.append(entry)
+                elif entry is not None:
+                    logger.warning("Skipping non-dict config in '%s'", file_path)
+        for endpoint in endpoints:
+            if (invalid := validate_endpoint(endpoint)) is not None:
+                raise ConfigError(invalid)
+    except (yaml.YAMLError, OSError, ConfigError) as e:
+        endpoints = []
+        error = str(e)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return EndpointFileResult(file_path, endpoints, elapsed_ms, digest, mtime_ns, size, error)
 
 
 # Module-level convenience function
@@ -0,0 +1,98 @@
+# src/pymock/config/snapshot.py
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"PYMOCK-SNAPSHOT\n"
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class EndpointFileResult(NamedTuple):
+    """
+    The endpoints parsed from one file, with what is needed to tell whether the file changed.
+    """
+
+    path: str
+    endpoints: list[dict[str, Any]]
+    elapsed_ms: float
+    digest: str = ""
+    mtime_ns: int = 0
+    size: int = 0
+    error: str | None = None
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        """Returns True if the file still has the size and modification time it was parsed with."""
+        return self.error is None and (stat.st_mtime_ns, stat.st_size) == (self.mtime_ns, self.size)
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    A compiled configuration: the validated main config, before environment overrides, and the
+    endpoint files it was built from.
+    """
+
+    config_path: str
+    config_digest: str
+    config: dict[str, Any]
+    files: list[EndpointFileResult]
+
+
+def digest_bytes(data: bytes) -> str:
+    """Returns the content hash recorded for source files."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_snapshot(path: str | os.PathLike) -> bool:
+    """Returns True if path is a snapshot file written by write_snapshot."""
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(path: str | os.PathLike, snapshot: ConfigSnapshot) -> None:
+    """
+    Writes a snapshot atomically, so a running server never reads a partial file.
+    """
+    target = Path(path)
+    payload = pickle.dumps((SNAPSHOT_FORMAT_VERSION, snapshot), protocol=pickle.HIGHEST_PROTOCOL)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(payload)
+        os.replace(tmp_path, target)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot(path: str | os.PathLike) -> ConfigSnapshot:
+    """
+    Reads a snapshot, unpickling it straight from a memory map of the file.
+
+    Snapshots are pickles: only load files you created with 'pymock compile'.
+
+    Raises:
+        ConfigError: If the file is not a snapshot or was written by another format version.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            msg = f"'{path}' is not a PyMock snapshot"
+            raise ConfigError(msg)
+        with memoryview(mapped) as view:
+            version, snapshot = pickle.loads(view[len(SNAPSHOT_MAGIC) :])  # noqa: S301
+    if version != SNAPSHOT_FORMAT_VERSION:
+        msg = f"Snapshot '{path}' has format version {version}, expected {SNAPSHOT_FORMAT_VERSION}; recompile it"
+        raise ConfigError(msg)
+    return snapshot
@@ -1,8 +1,9 @@
 # src/pymock/config/validator.py
 import logging
+from functools import lru_cache
+from typing import Any
 
-from jsonschema import ValidationError, validate
-
+from pymock.constants.schemas import ENDPOINT_SCHEMA
 from pymock.server.exceptions import ConfigError
 
 logger = logging.getLogger(__name__)
@@ -12,9 +13,59 @@ def validate_config(config: dict, schema: dict) -> None:
     """
     Validates the configuration against a predefined schema.
     """
+    # jsonschema takes a while to import, and loading a snapshot usually does not need it.
+    from jsonschema import ValidationError, validate  # noqa: PLC0415
+
     try:
         validate(instance=config, schema=schema)
     except ValidationError as e:
         logger.error("Invalid Configuration: %s", e, exc_info=True)
         error_message = "Configuration error: " + str(e)
         raise ConfigError(error_message) from e
+
+
+def compile_schema(schema: Any, description: str) -> Any:
+    """
+    Checks a JSON schema and builds its validator once, for the draft the schema declares
+    (the latest by default), with format checking enabled.
+
+    Args:
+        schema: The JSON schema.
+        description: What the schema is, for error messages.
+
+    Returns:
+        A jsonschema Validator, whose is_valid and iter_errors can be called repeatedly.
+
+    Raises:
+        ConfigError: If the schema itself is invalid.
+    """
+    from jsonschema.exceptions import SchemaError  # noqa: PLC0415
+    from jsonschema.validators import validator_for  # noqa: PLC0415
+
+    validator_class = validator_for(schema)
+    try:
+        validator_class.check_schema(schema)
+    except SchemaError as e:
+        msg = f"Invalid {description}: {e.message}"
+        raise ConfigError(msg) from e
+    return validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+
+
+def validate_endpoint(endpoint: dict[str, Any]) -> str | None:
+    """
+    Validates an endpoint definition against ENDPOINT_SCHEMA.
+
+    Returns:
+        A description of the first error, or None if the endpoint is valid.
+    """
+    validator = _endpoint_validator()
+    if validator.is_valid(endpoint):
+        return None
+    error = min(validator.iter_errors(endpoint), key=lambda error: len(error.path))
+    name = f"{endpoint.get('method', '?')} {endpoint.get('path', '?')}"
+    return f"Invalid endpoint {name}: {error.message} at {error.json_path}"
+
+
+@lru_cache(maxsize=1)
+def _endpoint_validator() -> Any:
+    return compile_schema(ENDPOINT_SCHEMA, "endpoint schema")
@@ -4,9 +4,162 @@ CONFIG_SCHEMA: dict = {
     "properties": {
         "server": {
             "type": "object",
-            "properties": {"host": {"type": "string"}, "port": {"type": "integer", "minimum": 0, "maximum": 65535}},
+            "properties": {
+                "host": {"type": "string"},
+                "port": {"type": "integer", "minimum": 0, "maximum": 65535},
+                "engine": {"type": "string", "enum": ["wsgi", "asgi"]},
+                "workers": {"type": "integer", "minimum": 1},
+                "max_requests": {"type": "integer", "minimum": 0},
+                "max_requests_jitter": {"type": "integer", "minimum": 0},
+                "keepalive": {"type": "number", "minimum": 0},
+                "backlog": {"type": "integer", "minimum": 1},
+                "reuse_port": {"type": "boolean"},
+                "graceful_timeout": {"type": "number", "minimum": 0},
+                "router": {"type": "string", "enum": ["werkzeug", "trie"]},
+                "watch": {"type": "boolean"},
+                "watch_interval": {"type": "number", "exclusiveMinimum": 0},
+            },
         },
         "endpoints_path": {"type": "array", "items": {"type": "string"}},
+        "logging": {
+            "type": "object",
+            "properties": {
+                "level": {"type": "string"},
+                "file": {"type": "string"},
+                "queue": {"type": "boolean"},
+                "queue_size": {"type": "integer", "minimum": 1},
+                "access_log": {
+                    "type": "object",
+                    "properties": {
+                        "enabled": {"type": "boolean"},
+                        "file": {"type": "string"},
+                        "sample_rate": {"type": "number", "exclusiveMinimum": 0, "maximum": 1},
+                    },
+                },
+            },
+        },
+        "loader": {
+            "type": "object",
+            "properties": {
+                "workers": {"type": "integer", "minimum": 1},
+                "chunk_size": {"type": "integer", "minimum": 1},
+                "slow_file_ms": {"type": "number", "minimum": 0},
+            },
+        },
+        "capture": {
+            "type": "object",
+            "properties": {
+                "mode": {"type": "string", "enum": ["off", "record", "replay"]},
+                "file": {"type": "string"},
+                "upstream": {"type": "string"},
+                "key_headers": {"type": "array", "items": {"type": "string"}},
+                "match_body": {"type": "boolean"},
+                "timeout": {"type": "number", "exclusiveMinimum": 0},
+            },
+        },
+        "cache": {
+            "type": "object",
+            "properties": {
+                "max_entries": {"type": "integer", "minimum": 1},
+                "max_bytes": {"type": "integer", "minimum": 1},
+            },
+        },
+        "request_body": {
+            "type": "object",
+            "properties": {
+                "max_size": {"type": "integer", "minimum": 0},
+                "stream": {"type": "boolean"},
+            },
+        },
+        "store": {
+            "type": "object",
+            "properties": {
+                "max_records": {"type": "integer", "minimum": 1},
+                "shards": {"type": "integer", "minimum": 1},
+                "file": {"type": "string"},
+            },
+        },
+        "templates": {
+            "type": "object",
+            "properties": {
+                "cache_size": {"type": "integer", "minimum": 0},
+                "auto_reload": {"type": "boolean"},
+                "bytecode_cache_dir": {"type": "string"},
+                "fake": {
+                    "type": "object",
+                    "properties": {
+                        "pool_size": {"type": "integer", "minimum": 1},
+                        "seed": {"type": ["integer", "string"]},
+                        "locale": {"type": "string"},
+                    },
+                },
+            },
+        },
     },
     "required": ["server", "endpoints_path"],
 }
+
+# A JSON schema, or true/false, as accepted in 'request_schema'.
+_JSON_SCHEMA: dict = {"type": ["object", "boolean"]}
+
+ENDPOINT_SCHEMA: dict = {
+    "type": "object",
+    "properties": {
+        "path": {"type": "string", "minLength": 1},
+        "method": {"type": "string", "minLength": 1},
+        "cache": {"type": ["object", "boolean", "null"]},
+        "store": {
+            "type": ["string", "object"],
+            "properties": {
+                "resource": {"type": "string", "minLength": 1},
+                "key": {"type": "string", "minLength": 1},
+                "indexes": {"type": "array", "items": {"type": "string"}},
+                "action": {"type": "string", "enum": ["create", "read", "replace", "update", "delete", "list"]},
+            },
+            "required": ["resource"],
+            "additionalProperties": False,
+        },
+        "request_body": {
+            "type": "object",
+            "properties": {
+                "max_size": {"type": ["integer", "null"], "minimum": 0},
+                "stream": {"type": "boolean"},
+            },
+            "additionalProperties": False,
+        },
+        "request_schema": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "integer", "minimum": 400, "maximum": 499},
+                "body": _JSON_SCHEMA,
+                "params": _JSON_SCHEMA,
+                "headers": _JSON_SCHEMA,
+                "cookies": _JSON_SCHEMA,
+            },
+            "additionalProperties": False,
+        },
+        "scenarios": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "scenario_name": {"type": "string"},
+                    "rules": {"type": "array"},
+                    "response": {
+                        "type": "object",
+                        "properties": {
+                            "status": {"type": "integer", "minimum": 100, "maximum": 599},
+                            "headers": {"type": "object"},
+                            "template": {"type": "string"},
+                            "file": {"type": "string"},
+                            "content_type": {"type": "string"},
+                            "cache": {"type": ["object", "boolean", "null"]},
+                            "delay": {"type": ["number", "object"]},
+                        },
+                    },
+                },
+            },
+        },
+    },
+    "required": ["path", "method"],
+}
@@ -0,0 +1,312 @@
+# src/pymock/load.py
+import http.client
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+from pymock.config.loader import get_config
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATION = 10.0
+DEFAULT_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 10.0
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# Values substituted for the variables of endpoint paths, by converter.
+_PATH_VARIABLE = re.compile(r"<(?:([a-zA-Z_][a-zA-Z0-9_]*)(?:\([^)]*\))?:)?[a-zA-Z_][a-zA-Z0-9_]*>")
+_CONVERTER_SAMPLES = {"int": "1", "float": "1.0", "uuid": "00000000-0000-0000-0000-000000000001", "path": "a/b"}
+_SIMPLE_JSONPATH = re.compile(r"^\$?\.?([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)$")
+
+
+class LoadRequest(NamedTuple):
+    """A request to send, and the endpoint it is reported under."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+    endpoint: str
+
+
+class EndpointStats:
+    """Latencies and outcomes of the requests sent to one endpoint."""
+
+    __slots__ = ("errors", "latencies", "statuses")
+
+    def __init__(self):
+        self.latencies = array("d")
+        self.statuses: Counter[int] = Counter()
+        self.errors = 0
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies.extend(other.latencies)
+        self.statuses.update(other.statuses)
+        self.errors += other.errors
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        ordered = sorted(self.latencies)
+        summary: dict[str, Any] = {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "requests_per_second": round(len(ordered) / duration, 1),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+        for fraction in PERCENTILES:
+            summary[f"p{fraction * 100:g}_ms"] = round(_percentile(ordered, fraction) * 1000, 3)
+        summary["max_ms"] = round(ordered[-1] * 1000, 3) if ordered else 0.0
+        return summary
+
+
+class LoadPlan(NamedTuple):
+    """What one load-generating process runs."""
+
+    target: str
+    requests: list[LoadRequest]
+    duration: float
+    connections: int
+    # Requests per second for this process (open loop), or None to send back to back (closed loop).
+    rate: float | None
+    timeout: float
+    process_index: int = 0
+    processes: int = 1
+
+
+def read_corpus(path: str | os.PathLike) -> list[LoadRequest]:
+    """
+    Reads requests from a JSONL file, one object per line with 'method', 'path' and optionally
+    'headers', 'body' (a string, or JSON sent as application/json) and 'endpoint' (the name
+    results are grouped under, by default the method and path without query).
+
+    Raises:
+        ConfigError: If the file cannot be read or a line is not a valid request.
+    """
+    requests = []
+    try:
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    requests.append(
+                        _make_request(
+                            entry.get("method", "GET"),
+                            entry["path"],
+                            entry.get("headers", {}),
+                            entry.get("body"),
+                            entry.get("endpoint"),
+                        )
+                    )
+                except (ValueError, KeyError, AttributeError, TypeError) as e:
+                    msg = f"Invalid request on line {number} of corpus '{path}': {e}"
+                    raise ConfigError(msg) from e
+    except OSError as e:
+        msg = f"Cannot read corpus '{path}': {e.strerror or e}"
+        raise ConfigError(msg) from e
+    if not requests:
+        msg = f"Corpus '{path}' has no requests"
+        raise ConfigError(msg)
+    return requests
+
+
+def requests_from_config(config_path: str) -> list[LoadRequest]:
+    """
+    Builds one request per scenario of the configured endpoints, satisfying its 'equals' rules
+    on params, headers, cookies and simple JSON body paths. Scenarios with other rules may be
+    answered by another scenario of their endpoint.
+    """
+    requests = []
+    for endpoint in get_config(config_path).get("endpoints", []):
+        method = endpoint["method"].upper()
+        label = f"{method} {endpoint['path']}"
+        path = _PATH_VARIABLE.sub(lambda match: _CONVERTER_SAMPLES.get(match.group(1) or "", "x"), endpoint["path"])
+        for scenario in endpoint.get("scenarios", []) or [{}]:
+            params: dict[str, Any] = {}
+            headers: dict[str, str] = {}
+            cookies: dict[str, str] = {}
+            body: dict[str, Any] = {}
+            for rule in scenario.get("rules", []):
+                if not isinstance(rule, dict) or str(rule.get("op", "")).upper() != "EQUALS":
+                    continue
+                target, prop, value = rule.get("target"), rule.get("prop"), rule.get("value")
+                if target in {"params", "headers", "cookies"} and prop:
+                    {"params": params, "headers": headers, "cookies": cookies}[target][prop] = str(value)
+                elif target == "body" and prop and (match := _SIMPLE_JSONPATH.match(prop)):
+                    _set_path(body, match.group(1).split("."), value)
+            if cookies:
+                headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+            query = f"?{urlencode(params)}" if params else ""
+            requests.append(_make_request(method, f"{path}{query}", headers, body or None, label))
+    if not requests:
+        msg = f"No endpoints configured in '{config_path}'"
+        raise ConfigError(msg)
+    return requests
+
+
+def run_load(plan: LoadPlan) -> dict[str, EndpointStats]:
+    """
+    Sends requests to the target until plan.duration elapses, from plan.processes processes of
+    plan.connections threads each, and returns the stats per endpoint.
+
+    Each thread keeps one keep-alive connection, reopened after errors. In the closed loop,
+    every thread sends its next request as soon as it has the previous response. In the open
+    loop, requests are scheduled at a fixed rate, whether or not earlier ones were answered,
+    and latencies are measured from the scheduled time, so queueing delay is included.
+    """
+    _parse_target(plan.target)
+    if plan.processes == 1:
+        results = [_run_process(plan)]
+    else:
+        # Spawned rather than forked, so the caller's threads and locks are not copied.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=plan.processes, mp_context=context) as executor:
+            results = list(
+                executor.map(_run_process, [plan._replace(process_index=index) for index in range(plan.processes)])
+            )
+
+    merged: dict[str, EndpointStats] = {}
+    for result in results:
+        for endpoint, stats in result.items():
+            merged.setdefault(endpoint, EndpointStats()).merge(stats)
+    return merged
+
+
+def summarize(stats: dict[str, EndpointStats], duration: float) -> dict[str, Any]:
+    """Summarizes the stats of a run, per endpoint and in total."""
+    total = EndpointStats()
+    for endpoint_stats in stats.values():
+        total.merge(endpoint_stats)
+    return {
+        "duration": round(duration, 3),
+        "total": total.summary(duration),
+        "endpoints": {endpoint: stats[endpoint].summary(duration) for endpoint in sorted(stats)},
+    }
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    """Formats a summary as a table with one row per endpoint and a total row."""
+    rows = [*summary["endpoints"].items(), ("total", summary["total"])]
+    width = max(len(name) for name, _ in rows)
+    header = (
+        f"{'endpoint':<{width}}  {'requests':>9}  {'errors':>6}  {'req/s':>9}  "
+        f"{'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  {'max ms':>8}  statuses"
+    )
+    lines = [header]
+    for name, row in rows:
+        statuses = " ".join(f"{status}:{count}" for status, count in row["statuses"].items())
+        lines.append(
+            f"{name:<{width}}  {row['requests']:>9}  {row['errors']:>6}  {row['requests_per_second']:>9.0f}  "
+            f"{row['p50_ms']:>8.2f}  {row['p90_ms']:>8.2f}  {row['p99_ms']:>8.2f}  {row['max_ms']:>8.2f}  {statuses}"
+        )
+    return "\n".join(lines)
+
+
+def write_summary(path: str | os.PathLike, summary: dict[str, Any]) -> None:
+    """Writes a summary as JSON."""
+    Path(path).write_text(json.dumps(summary, indent=2) + "\n")
+
+
+def _run_process(plan: LoadPlan) -> dict[str, EndpointStats]:
+    """Runs the connection threads of one process and merges their stats."""
+    connection_class, host, port, prefix = _parse_target(plan.target)
+    # Requests are numbered across processes, so that each process sends its share of the corpus.
+    slots = itertools.count()
+    started = time.perf_counter()
+    deadline = started + plan.duration
+    interval = 1 / plan.rate if plan.rate else 0.0
+    thread_stats: list[dict[str, EndpointStats]] = [{} for _ in range(plan.connections)]
+
+    def run(stats: dict[str, EndpointStats]) -> None:
+        connection = connection_class(host, port, timeout=plan.timeout)
+        try:
+            while True:
+                slot = next(slots)
+                scheduled = started + slot * interval if interval else time.perf_counter()
+                if scheduled >= deadline:
+                    return
+                if interval and (wait := scheduled - time.perf_counter()) > 0:
+                    time.sleep(wait)
+                request = plan.requests[(slot * plan.processes + plan.process_index) % len(plan.requests)]
+                endpoint_stats = stats.get(request.endpoint)
+                if endpoint_stats is None:
+                    endpoint_stats = stats[request.endpoint] = EndpointStats()
+                try:
+                    connection.request(
+                        request.method, f"{prefix}{request.path}", body=request.body or None, headers=request.headers
+                    )
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    endpoint_stats.errors += 1
+                    connection.close()
+                    continue
+                endpoint_stats.latencies.append(time.perf_counter() - scheduled)
+                endpoint_stats.statuses[response.status] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(stats,), daemon=True) for stats in thread_stats]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged: dict[str, EndpointStats] = {}
+    for stats in thread_stats:
+        for endpoint, endpoint_stats in stats.items():
+            merged.setdefault(endpoint, EndpointStats()).merge(endpoint_stats)
+    return merged
+
+
+def _parse_target(target: str) -> tuple[type[http.client.HTTPConnection], str, int | None, str]:
+    parts = urlsplit(target)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        msg = f"Invalid target URL {target!r}: expected http(s)://host[:port][/prefix]"
+        raise ConfigError(msg)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    return connection_class, parts.hostname, parts.port, parts.path.rstrip("/")
+
+
+def _make_request(
+    method: str, path: str, headers: dict[str, str], body: Any, endpoint: str | None = None
+) -> LoadRequest:
+    headers = {str(name): str(value) for name, value in headers.items()}
+    if body is None:
+        data = b""
+    elif isinstance(body, str):
+        data = body.encode()
+    else:
+        data = json.dumps(body).encode()
+        if not any(name.lower() == "content-type" for name in headers):
+            headers["Content-Type"] = "application/json"
+    if not path.startswith("/"):
+        path = f"/{path}"
+    return LoadRequest(method.upper(), path, headers, data, endpoint or f"{method.upper()} {path.split('?')[0]}")
+
+
+def _set_path(document: dict[str, Any], keys: list[str], value: Any) -> None:
+    for key in keys[:-1]:
+        child = document.get(key)
+        if not isinstance(child, dict):
+            child = document[key] = {}
+        document = child
+    document[keys[-1]] = value
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
@@ -1,9 +1,54 @@
 # pymock/logging_config.py
+import atexit
 import logging
+import os
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Any
 
+from pymock.server.access_log import ACCESS_LOGGER_NAME
 
-def setup_logging(logging_config: dict[str, str] | None) -> None:
-    """Configures application-wide logging based on the provided dictionary."""
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+DEFAULT_QUEUE_SIZE = 10_000
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A QueueHandler that never blocks: when the queue is full, records are dropped and counted
+    rather than holding up the request that logged them.
+    """
+
+    # Always a bounded Queue, whose maxsize is reused for the queues of forked workers.
+    queue: Queue[logging.LogRecord]
+
+    def __init__(self, log_queue: Queue[logging.LogRecord]):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+# The handler and listener of the queue mode, while it is set up.
+_queue_handler: DroppingQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def setup_logging(logging_config: dict[str, Any] | None) -> None:
+    """
+    Configures application-wide logging based on the provided dictionary.
+
+    Logs go to the console, and also to 'file' when given. With 'queue: true', loggers only
+    put records on a bounded in-memory queue, and a background thread writes them, so slow
+    disks or consoles do not add to request latency. Records are dropped when the queue is full.
+
+    An 'access_log' section adds JSON access logs, on stdout or in its own 'file', on the
+    'pymock.access' logger; see AccessLog for the sampling.
+    """
     if not logging_config:
         logging_config = {}
 
@@ -13,21 +58,93 @@ def setup_logging(logging_config: dict[str, str] | None) -> None:
     # Convert string level to actual logging level constant
     level = getattr(logging, level_str, logging.INFO)
 
-    # We can also ensure any existing root handlers are cleared
-    # if you want to avoid duplicates:
-    for handler in logging.root.handlers[:]:
-        logging.root.removeHandler(handler)
+    stop_logging()
+    root = logging.getLogger()
+    access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+    for logger in (root, access_logger):
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+    root.setLevel(level)
 
-    logging.basicConfig(
-        level=level,
-        filename=log_file,  # if None, logs go to console; if set, logs go to file
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+
+    access_conf = logging_config.get("access_log") or {}
+    access_handlers: list[logging.Handler] = []
+    if access_conf and access_conf.get("enabled", True):
+        access_file = access_conf.get("file")
+        access_handler = logging.FileHandler(access_file) if access_file else logging.StreamHandler(sys.stdout)
+        access_handler.setFormatter(logging.Formatter("%(message)s"))
+        access_handlers.append(access_handler)
+    # Access logs have their own handlers, and are written whatever the application's level.
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+
+    if not logging_config.get("queue", False):
+        for handler in handlers:
+            root.addHandler(handler)
+        for handler in access_handlers:
+            access_logger.addHandler(handler)
+        return
+
+    # One queue and writer thread serve both loggers; filters route each record to its handlers.
+    for handler in handlers:
+        handler.addFilter(lambda record: record.name != ACCESS_LOGGER_NAME)
+    for handler in access_handlers:
+        handler.addFilter(logging.Filter(ACCESS_LOGGER_NAME))
+    queue_handler = _start_queue(
+        Queue(logging_config.get("queue_size", DEFAULT_QUEUE_SIZE)), [*handlers, *access_handlers]
     )
+    root.addHandler(queue_handler)
+    access_logger.addHandler(queue_handler)
 
-    # OPTIONAL: If you want logs to go BOTH to file and console,
-    # you can add a secondary StreamHandler. For example:
-    if log_file:
-        console = logging.StreamHandler()
-        console.setLevel(level)
-        console.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
-        logging.getLogger().addHandler(console)
+
+def stop_logging() -> None:
+    """
+    Writes out the records still queued in queue mode and stops its writer thread. Records
+    logged afterwards are written synchronously.
+    """
+    global _listener, _queue_handler  # noqa: PLW0603
+    if _listener is None or _queue_handler is None:
+        return
+    _listener.stop()
+    # The handlers' filters keep routing records to the right ones.
+    for logger in (logging.getLogger(), logging.getLogger(ACCESS_LOGGER_NAME)):
+        logger.removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            logger.addHandler(handler)
+    if _queue_handler.dropped:
+        logging.getLogger(__name__).warning("%d log records were dropped: the queue was full", _queue_handler.dropped)
+    _listener = None
+    _queue_handler = None
+
+
+def _start_queue(log_queue: Queue[logging.LogRecord], handlers: list[logging.Handler]) -> DroppingQueueHandler:
+    """Starts the writer thread of log_queue and returns the handler putting records on it."""
+    global _listener, _queue_handler  # noqa: PLW0603
+    if _queue_handler is None:
+        _queue_handler = DroppingQueueHandler(log_queue)
+    else:
+        _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _queue_handler
+
+
+def _restart_queue_in_child() -> None:
+    """
+    Forked workers do not inherit the writer thread, and the queue's locks may have been held
+    by it when forking: give them a queue and writer thread of their own.
+    """
+    if _listener is not None and _queue_handler is not None:
+        _start_queue(Queue(_queue_handler.queue.maxsize), list(_listener.handlers))
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_in_child)
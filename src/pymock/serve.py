@@ -0,0 +1,182 @@
+# src/pymock/serve.py
+import atexit
+import logging
+import os
+from typing import Any
+
+from pymock.app import create_app
+from pymock.asgi import create_asgi_app
+from pymock.config.loader import get_config
+from pymock.logging_config import setup_logging
+from pymock.server.access_log import AccessLog
+from pymock.server.body import BodyPolicy
+from pymock.server.cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, ResponseCache
+from pymock.server.exceptions import ConfigError
+from pymock.server.fake import DEFAULT_POOL_SIZE, FakePool
+from pymock.server.metrics import Metrics
+from pymock.server.prefork import DEFAULT_BACKLOG, DEFAULT_GRACEFUL_TIMEOUT, DEFAULT_KEEPALIVE, PreforkServer
+from pymock.server.proxy import create_capture_fallback
+from pymock.server.reload import DEFAULT_WATCH_INTERVAL, EndpointReloader
+from pymock.server.store import DEFAULT_MAX_RECORDS, DEFAULT_SHARDS, ResourceStore
+from pymock.server.templates.handler import DEFAULT_TEMPLATE_CACHE_SIZE, TemplateHandler
+
+logger = logging.getLogger(__name__)
+
+
+def run_server(
+    config_path: str,
+    *,
+    clear_cache: bool = False,
+    server_overrides: dict[str, Any] | None = None,
+    capture_overrides: dict[str, Any] | None = None,
+) -> None:
+    """Loads a configuration and serves its endpoints, with the engine and workers it sets."""
+    config = get_config(config_path)
+    logging_conf = config.get("logging", {})
+    setup_logging(logging_conf)
+
+    templates_conf = config.get("templates", {})
+    TemplateHandler.configure(
+        cache_size=templates_conf.get("cache_size", DEFAULT_TEMPLATE_CACHE_SIZE),
+        auto_reload=templates_conf.get("auto_reload", config.get("debug", False)),
+        bytecode_cache_dir=templates_conf.get("bytecode_cache_dir"),
+    )
+    fake_conf = templates_conf.get("fake", {})
+    FakePool.configure(
+        pool_size=fake_conf.get("pool_size", DEFAULT_POOL_SIZE),
+        seed=fake_conf.get("seed"),
+        locale=fake_conf.get("locale"),
+    )
+    body_conf = config.get("request_body", {})
+    BodyPolicy.configure(max_size=body_conf.get("max_size"), stream=body_conf.get("stream", False))
+    cache_conf = config.get("cache", {})
+    response_cache = ResponseCache(
+        max_entries=cache_conf.get("max_entries", DEFAULT_MAX_ENTRIES),
+        max_bytes=cache_conf.get("max_bytes", DEFAULT_MAX_BYTES),
+    )
+    if clear_cache:
+        TemplateHandler.clear_cache()
+        response_cache.clear()
+
+    server_conf = {**config["server"], **(server_overrides or {})}
+    _configure_store(config.get("store", {}), server_conf.get("workers", 1))
+    endpoints_config = config["endpoints"]
+    host = server_conf.get("host", "0.0.0.0")
+    port = server_conf.get("port", 8085)
+
+    fallback = create_capture_fallback({**config.get("capture", {}), **(capture_overrides or {})})
+    metrics = Metrics()
+    access_log = AccessLog.from_config(logging_conf.get("access_log"))
+
+    engine = server_conf.get("engine", "wsgi")
+    workers = server_conf.get("workers", 1)
+    router = server_conf.get("router", "werkzeug")
+    reloader = None
+    if server_conf.get("watch", False):
+        if workers > 1:
+            msg = "Watch mode reloads endpoints in a single process; it cannot be combined with multiple workers"
+            raise ConfigError(msg)
+        reloader = EndpointReloader(
+            config.get("endpoints_path", []),
+            response_cache,
+            loader_conf=config.get("loader", {}),
+            interval=server_conf.get("watch_interval", DEFAULT_WATCH_INTERVAL),
+            router=router,
+            fallback=fallback,
+            metrics=metrics,
+        )
+        reloader.start()
+    live_routes = reloader.live_routes if reloader is not None else None
+
+    if engine == "asgi":
+        if workers > 1:
+            msg = "The asgi engine serves from a single process; use the wsgi engine for multiple workers"
+            raise ConfigError(msg)
+        _run_asgi(
+            create_asgi_app(
+                endpoints_config,
+                response_cache,
+                live_routes=live_routes,
+                router=router,
+                fallback=fallback,
+                metrics=metrics,
+                access_log=access_log,
+            ),
+            host,
+            port,
+            server_conf,
+        )
+        return
+
+    # The app is created before any fork, so workers share it copy-on-write.
+    app = create_app(
+        endpoints_config,
+        response_cache,
+        live_routes=live_routes,
+        router=router,
+        fallback=fallback,
+        metrics=metrics,
+        access_log=access_log,
+    )
+    if workers > 1:
+        PreforkServer(
+            app,
+            host,
+            port,
+            workers=workers,
+            max_requests=server_conf.get("max_requests", 0),
+            max_requests_jitter=server_conf.get("max_requests_jitter", 0),
+            keepalive=server_conf.get("keepalive", DEFAULT_KEEPALIVE),
+            backlog=server_conf.get("backlog", DEFAULT_BACKLOG),
+            reuse_port=server_conf.get("reuse_port", False),
+            graceful_timeout=server_conf.get("graceful_timeout", DEFAULT_GRACEFUL_TIMEOUT),
+        ).run()
+        return
+
+    app.run(
+        host=host,
+        port=port,
+        debug=config.get("debug", False),
+        threaded=True,
+    )
+
+
+def _configure_store(store_conf: dict[str, Any], workers: int) -> None:
+    """
+    Configures the resource store and restores it from its file, if it exists. A single process
+    saves it back on exit; with several workers, each has its own records and none is saved.
+    """
+    store_file = store_conf.get("file")
+    ResourceStore.configure(
+        max_records=store_conf.get("max_records", DEFAULT_MAX_RECORDS),
+        shards=store_conf.get("shards", DEFAULT_SHARDS),
+        file=store_file,
+    )
+    if store_file is None:
+        return
+    store = ResourceStore.shared()
+    if os.path.exists(store_file):
+        store.restore()
+    if workers > 1:
+        logger.warning("Each of the %d workers keeps its own resource store; it is not saved on exit.", workers)
+    else:
+        atexit.register(store.save)
+
+
+def _run_asgi(app: Any, host: str, port: int, server_conf: dict[str, Any]) -> None:
+    """Serves the ASGI application with uvicorn, an optional dependency."""
+    try:
+        import uvicorn  # noqa: PLC0415
+    except ImportError as e:
+        msg = "The asgi engine requires uvicorn; install it with: pip install 'pymock[asgi]'"
+        raise ConfigError(msg) from e
+
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        backlog=server_conf.get("backlog", DEFAULT_BACKLOG),
+        timeout_keep_alive=max(1, round(server_conf.get("keepalive", DEFAULT_KEEPALIVE))),
+        timeout_graceful_shutdown=round(server_conf.get("graceful_timeout", DEFAULT_GRACEFUL_TIMEOUT)),
+        log_config=None,
+    )
@@ -0,0 +1,109 @@
+# src/pymock/server/access_log.py
+import json
+import logging
+import random
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOGGER_NAME = "pymock.access"
+# WSGI environ key under which a route handler records the name of the scenario it served.
+SCENARIO_ENVIRON_KEY = "pymock.scenario"
+
+
+class AccessLog:
+    """
+    Writes one JSON line per request to the 'pymock.access' logger, for a sample of requests.
+
+    Whether a request is logged is decided before anything is measured or formatted, so the
+    requests left out of the sample cost one random number.
+    """
+
+    __slots__ = ("logger", "sample_rate")
+
+    def __init__(self, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            msg = f"Access log sample_rate must be in (0, 1], got {sample_rate}"
+            raise ConfigError(msg)
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+    @classmethod
+    def from_config(cls, access_conf: dict[str, Any] | None) -> "AccessLog | None":
+        """Builds the access log of the 'logging.access_log' config section, or None if it is off."""
+        if not access_conf or not access_conf.get("enabled", True):
+            return None
+        return cls(access_conf.get("sample_rate", 1.0))
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate  # noqa: S311
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        duration: float,
+        *,
+        size: int | None = None,
+        scenario: str | None = None,
+        remote_addr: str | None = None,
+    ) -> None:
+        self.logger.info(
+            json.dumps(
+                {
+                    "time": round(time.time(), 3),
+                    "method": method,
+                    "path": path,
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 3),
+                    "bytes": size,
+                    "scenario": scenario,
+                    "remote_addr": remote_addr,
+                },
+                separators=(",", ":"),
+            )
+        )
+
+
+class AccessLogMiddleware:
+    """
+    WSGI middleware logging the sampled requests of an application to an AccessLog.
+
+    The duration covers the whole request, including response delays, up to the point the
+    application returned its body.
+    """
+
+    def __init__(self, app: Callable, access_log: AccessLog):
+        self.app = app
+        self.access_log = access_log
+
+    def __call__(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if not self.access_log.sampled():
+            return self.app(environ, start_response)
+
+        started = time.perf_counter()
+        response_start: list[Any] = []
+
+        def capture_start_response(status: str, headers: list[tuple[str, str]], *args: Any) -> Callable:
+            response_start[:] = [status, headers]
+            return start_response(status, headers, *args)
+
+        try:
+            return self.app(environ, capture_start_response)
+        finally:
+            status, headers = response_start or ("500", [])
+            length = next((value for name, value in headers if name.lower() == "content-length"), None)
+            self.access_log.record(
+                environ["REQUEST_METHOD"],
+                environ.get("PATH_INFO", "/"),
+                int(status.split(" ", 1)[0]),
+                time.perf_counter() - started,
+                size=int(length) if length is not None else None,
+                scenario=environ.get(SCENARIO_ENVIRON_KEY),
+                remote_addr=environ.get("REMOTE_ADDR"),
+            )
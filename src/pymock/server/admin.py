@@ -0,0 +1,72 @@
+# src/pymock/server/admin.py
+import logging
+from typing import Any
+
+from flask import Blueprint, Response
+from werkzeug.wrappers import Request as WerkzeugRequest
+
+from pymock.server.cache import ResponseCache
+from pymock.server.exceptions import ConfigError
+from pymock.server.metrics import PROMETHEUS_CONTENT_TYPE, Metrics
+from pymock.server.response import json_response
+from pymock.server.routes import EndpointRoute, register_routes
+from pymock.server.store import ResourceStore
+
+logger = logging.getLogger(__name__)
+
+ADMIN_URL_PREFIX = "/__pymock"
+
+
+def create_admin_routes(response_cache: ResponseCache, metrics: Metrics) -> list[EndpointRoute]:
+    """
+    Creates the routes of PyMock's own endpoints under the reserved ADMIN_URL_PREFIX.
+    The store routes act on the shared ResourceStore, as it is when they are called.
+    """
+
+    def cache_stats(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        return json_response(response_cache.stats())
+
+    def clear_cache(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        cleared = response_cache.clear()
+        return json_response({"cleared": cleared})
+
+    def store_stats(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        return json_response(ResourceStore.shared().stats())
+
+    def clear_store(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        return json_response({"cleared": ResourceStore.shared().clear()})
+
+    def save_store(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        try:
+            return json_response({"saved": ResourceStore.shared().save()})
+        except ConfigError as e:
+            return json_response({"error": str(e)}, 400)
+
+    def restore_store(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        try:
+            return json_response({"restored": ResourceStore.shared().restore()})
+        except ConfigError as e:
+            return json_response({"error": str(e)}, 400)
+
+    def prometheus_metrics(_source: WerkzeugRequest, _path_params: dict[str, Any]) -> Response:
+        return Response(metrics.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    return [
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/cache", "GET", cache_stats),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/cache", "DELETE", clear_cache),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/store", "GET", store_stats),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/store", "DELETE", clear_store),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/store/snapshot", "POST", save_store),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/store/restore", "POST", restore_store),
+        EndpointRoute(f"{ADMIN_URL_PREFIX}/metrics", "GET", prometheus_metrics),
+    ]
+
+
+def create_admin_blueprint(response_cache: ResponseCache, metrics: Metrics) -> Blueprint:
+    """
+    Creates the Blueprint serving PyMock's own endpoints under the reserved ADMIN_URL_PREFIX.
+    """
+    admin_bp = Blueprint("pymock_admin", __name__)
+    register_routes(admin_bp, create_admin_routes(response_cache, metrics))
+    logger.debug("Admin endpoints registered under %s", ADMIN_URL_PREFIX)
+    return admin_bp
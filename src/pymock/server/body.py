@@ -0,0 +1,299 @@
+# src/pymock/server/body.py
+import codecs
+import json
+import logging
+import re
+
+# The C string scanner of json.loads, which typeshed does not declare.
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import IO, Any, ClassVar
+
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+
+from pymock.server.exceptions import ConfigError
+from pymock.server.response import StaticResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+BODY_TOO_LARGE = StaticResponse.from_data(413, {"error": "Request body too large"})
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_BODY = r'[^"\\]*(?:\\.[^"\\]*)*'
+_PLAIN = r'[^"\[\]{}]*'
+_SCALAR = re.compile(r"[^\s,\]}]+")
+_DECODER = json.JSONDecoder()
+# Jinja2 expressions of response data reading the request body, which a streamed body leaves unread.
+_BODY_ACCESS = re.compile(r"\brequest\s*\.\s*(?:json|get_json|data|get_data|form|values|files|stream)\b")
+
+
+def _atomic(pattern: str, name: str) -> str:
+    """
+    Wraps a pattern in an atomic group, emulated with a lookahead and a backreference as Python
+    3.10 has none: a later failure does not backtrack into it, so text left incomplete at the end
+    of what was read is given up on in one pass.
+    """
+    return rf"(?=(?P<{name}>{pattern}))(?P={name})"
+
+
+def _string(name: str) -> str:
+    return rf'"{_atomic(_STRING_BODY, name)}"'
+
+
+def _flat(name: str) -> str:
+    # What a skipped container holds between brackets: anything but brackets and quotes, and strings.
+    return _atomic(rf"{_PLAIN}(?:{_string(name + 's')}{_PLAIN})*", name)
+
+
+_STRING_REST = re.compile(_string("s")[1:], re.DOTALL)
+# Plain text, strings, and containers that hold no other containers, so only deeper brackets
+# are handled one by one.
+_SKIPPED = re.compile(rf"{_PLAIN}(?:(?:{_string('s')}|\{{{_flat('o')}\}}|\[{_flat('a')}\]){_PLAIN})*", re.DOTALL)
+
+
+class BodyPolicy:
+    """
+    How an endpoint reads request bodies: the size above which they are rejected with a 413,
+    and whether JSON bodies are streamed.
+
+    A streamed body is parsed from the input stream as it is read, keeping only the top-level
+    keys the endpoint's rules use and stopping as soon as all of them were found. The values
+    of other keys are skipped without building Python objects, and are not checked for errors.
+    """
+
+    __slots__ = ("chunk_size", "max_size", "stream")
+
+    _max_size: ClassVar[int | None] = None
+    _stream: ClassVar[bool] = False
+
+    def __init__(self, max_size: int | None = None, *, stream: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if max_size is not None and max_size < 0:
+            msg = f"Invalid request body max_size: {max_size}"
+            raise ConfigError(msg)
+        self.max_size = max_size
+        self.stream = stream
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def configure(cls, *, max_size: int | None = None, stream: bool = False) -> None:
+        """
+        Sets the defaults of the endpoints that have no 'request_body' setting of their own.
+
+        Args:
+            max_size: Maximum body size in bytes, or None for no limit.
+            stream: Whether JSON bodies are streamed.
+        """
+        cls._max_size = max_size
+        cls._stream = stream
+
+    @classmethod
+    def from_config(cls, spec: dict[str, Any] | None) -> "BodyPolicy | None":
+        """
+        Builds the policy of a 'request_body' endpoint setting, e.g. {"max_size": 1048576,
+        "stream": true}, on top of the configured defaults.
+
+        Returns:
+            The BodyPolicy, or None when bodies are read whole with no limit.
+        """
+        spec = spec or {}
+        max_size = spec.get("max_size", cls._max_size)
+        stream = spec.get("stream", cls._stream)
+        if max_size is None and not stream:
+            return None
+        return cls(max_size, stream=stream)
+
+    def without_streaming(self) -> "BodyPolicy | None":
+        """Returns the same policy with streaming disabled, or None if it then does nothing."""
+        return BodyPolicy(self.max_size) if self.max_size is not None else None
+
+    def limit(self, source: Any) -> None:
+        """
+        Applies the size limit to a werkzeug request. A declared Content-Length over the limit
+        is rejected before anything is read; chunked bodies are rejected once they are read past it.
+
+        Raises:
+            RequestEntityTooLarge: If the declared Content-Length is over the limit.
+        """
+        if self.max_size is None:
+            return
+        if source.content_length is not None:
+            if source.content_length > self.max_size:
+                raise RequestEntityTooLarge
+            return
+        # werkzeug's max_content_length would cut the body short at the limit rather than reject it.
+        source.environ["wsgi.input"] = _BoundedStream(source.environ["wsgi.input"], self.max_size)
+
+    def read_keys(self, stream: IO[bytes], keys: frozenset[str]) -> dict[str, Any]:
+        """
+        Parses the given top-level keys of a JSON object from a binary stream, reading no
+        further than needed. Other JSON documents than objects give an empty dict.
+
+        Raises:
+            BadRequest: If the body is not valid JSON, up to where it was read.
+        """
+        document = _JsonStream(stream, self.chunk_size)
+        document.skip_whitespace()
+        first = document.char()
+        if not first:
+            msg = "Failed to decode JSON object: empty body"
+            raise BadRequest(msg)
+        if first != "{":
+            return {}
+        document.pos += 1
+        found: dict[str, Any] = {}
+        document.skip_whitespace()
+        if document.char() == "}":
+            return found
+        while True:
+            document.skip_whitespace()
+            if document.char() != '"':
+                document.fail("expected a property name")
+            key = document.string()
+            document.skip_whitespace()
+            if document.char() != ":":
+                document.fail("expected ':'")
+            document.pos += 1
+            document.skip_whitespace()
+            if key in keys:
+                found[key] = document.value()
+                if len(found) == len(keys):
+                    return found
+            else:
+                document.skip_value()
+            document.skip_whitespace()
+            separator = document.char()
+            document.pos += 1
+            if separator == "}":
+                return found
+            if separator != ",":
+                document.fail("expected ',' or '}'")
+
+
+def reads_request_body(data: Any) -> bool:
+    """Returns True if Jinja2 expressions in response data read the request body, as request.json."""
+    return _BODY_ACCESS.search(json.dumps(data, default=str)) is not None
+
+
+class _BoundedStream:
+    """A WSGI input stream raising RequestEntityTooLarge once more than max_size bytes are read from it."""
+
+    __slots__ = ("remaining", "stream")
+
+    def __init__(self, stream: IO[bytes], max_size: int):
+        self.stream = stream
+        self.remaining = max_size
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(DEFAULT_CHUNK_SIZE), b""))
+        chunk = self.stream.read(min(size, self.remaining + 1))
+        self.remaining -= len(chunk)
+        if self.remaining < 0:
+            raise RequestEntityTooLarge
+        return chunk
+
+
+class _JsonStream:
+    """
+    The text of a JSON document, read from a binary stream as the parser needs it. Text already
+    parsed is dropped whenever more is read, so memory is bounded by the values kept.
+    """
+
+    __slots__ = ("chunk_size", "decoder", "eof", "pos", "stream", "text")
+
+    def __init__(self, stream: IO[bytes], chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self) -> bool:
+        """Reads more text, at least as much as is still unparsed; returns False at the end."""
+        if self.eof:
+            return False
+        pending = self.text[self.pos :]
+        chunk = self.stream.read(max(self.chunk_size, len(pending)))
+        self.eof = not chunk
+        try:
+            self.text = pending + self.decoder.decode(chunk, final=self.eof)
+        except UnicodeDecodeError as e:
+            msg = f"Failed to decode JSON object: {e}"
+            raise BadRequest(msg) from e
+        self.pos = 0
+        return True
+
+    def char(self) -> str:
+        """Returns the next character, or '' at the end of the document."""
+        while self.pos >= len(self.text):
+            if not self.more():
+                return ""
+        return self.text[self.pos]
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.text) or not self.more():
+                return
+
+    def string(self) -> str:
+        while True:
+            try:
+                value, self.pos = scanstring(self.text, self.pos + 1)
+            except json.JSONDecodeError:
+                if not self.more():
+                    self.fail("unterminated string")
+                continue
+            return value
+
+    def value(self) -> Any:
+        if self.char() not in '"[{':
+            self.scalar()
+        while True:
+            try:
+                value, self.pos = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    self.fail("invalid value")
+                continue
+            return value
+
+    def scalar(self) -> int:
+        """Reads until the number or literal at the current position is complete; returns its end."""
+        while (match := _SCALAR.match(self.text, self.pos)) is None or match.end() == len(self.text):
+            if not self.more():
+                break
+        if match is None:
+            self.fail("invalid value")
+        return match.end()  # type: ignore[union-attr]
+
+    def skip_value(self) -> None:
+        if self.char() not in "[{":
+            self.pos = self.string_end() if self.char() == '"' else self.scalar()
+            return
+        depth = 0
+        while True:
+            bracket = self.char()
+            if not bracket:
+                self.fail("unexpected end of document")
+            if bracket == '"':
+                self.pos = self.string_end()
+            elif bracket in "[{]}":
+                depth += 1 if bracket in "[{" else -1
+                self.pos += 1
+                if depth == 0:
+                    return
+            # Text up to the next bracket this cannot skip, or up to the end of the text read so far.
+            self.pos = _SKIPPED.match(self.text, self.pos).end()  # type: ignore[union-attr]
+
+    def string_end(self) -> int:
+        """Reads until the string at the current position is complete; returns its end."""
+        while (match := _STRING_REST.match(self.text, self.pos + 1)) is None:
+            if not self.more():
+                self.fail("unterminated string")
+        return match.end()
+
+    def fail(self, reason: str) -> None:
+        msg = f"Failed to decode JSON object: {reason}"
+        raise BadRequest(msg)
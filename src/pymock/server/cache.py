@@ -0,0 +1,199 @@
+# src/pymock/server/cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any, NamedTuple
+
+from pymock.server.exceptions import ConfigError
+from pymock.server.matchers import compile_accessor
+from pymock.server.request import REQUEST_TARGETS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_KEY = ("path", "params")
+
+# Cache keys may also use the path variables of the matched URL rule, e.g. '<oid>' in '/o/<oid>'.
+PATH_PARAMS_TARGET = "path_params"
+CACHE_KEY_TARGETS = (*REQUEST_TARGETS, PATH_PARAMS_TARGET)
+
+
+class CachedResponse(NamedTuple):
+    """A fully rendered response, ready to be replayed."""
+
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class ResponseCache:
+    """
+    Thread-safe in-memory cache of rendered responses.
+
+    Entries expire after their TTL and the least recently used ones are evicted once either
+    the entry count or the total body size exceeds its cap.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[Any, tuple[float, CachedResponse]] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> CachedResponse | None:
+        """Returns the cached response for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: Any, response: CachedResponse, ttl: float) -> None:
+        """Stores a response for ttl seconds, evicting older entries if a cap is exceeded."""
+        size = len(response.body)
+        if size > self.max_bytes:
+            logger.debug("Response of %d bytes exceeds the cache size cap; not cached.", size)
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl, response)
+            self._size_bytes += size
+            while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def clear(self) -> int:
+        """Removes all entries and returns how many there were."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._size_bytes = 0
+        logger.info("Response cache cleared (%d entries).", count)
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Returns the current entry count and body size along with the caps."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: Any) -> None:
+        _, response = self._entries.pop(key)
+        self._size_bytes -= len(response.body)
+
+
+class CachePolicy:
+    """
+    Caching settings of a scenario: how long to keep its response and which request parts key it.
+
+    Key parts are written as '<target>' or '<target>.<prop>', e.g. 'params.id',
+    'headers.X-Tenant', 'body.$.accountId' or 'path_params.oid' for a '/o/<oid>' path variable.
+    Header names are case-insensitive.
+    """
+
+    __slots__ = ("_parts", "key_parts", "scope", "ttl")
+
+    def __init__(self, scope: Any, ttl: float, key_parts: tuple[str, ...] = DEFAULT_CACHE_KEY):
+        self.scope = scope
+        self.ttl = ttl
+        self.key_parts = key_parts
+        self._parts = [(target, compile_accessor(prop)) for target, prop in map(_split_key_part, key_parts)]
+
+    @classmethod
+    def from_config(cls, spec: Any, scope: Any) -> "CachePolicy | None":
+        """
+        Builds a policy from a 'cache' response setting.
+
+        Args:
+            spec: The setting, e.g. {"ttl": 30, "key": ["params.id"]}; None or False disables caching.
+            scope: A hashable value identifying the scenario, prefixed to every key.
+
+        Returns:
+            The CachePolicy, or None when caching is disabled.
+
+        Raises:
+            ConfigError: If the setting is malformed.
+        """
+        if spec is None or spec is False:
+            return None
+        if not isinstance(spec, dict):
+            msg = f"Invalid cache setting {spec!r}: expected a mapping with 'ttl' and optional 'key'"
+            raise ConfigError(msg)
+        ttl = spec.get("ttl")
+        if not isinstance(ttl, int | float) or isinstance(ttl, bool) or ttl <= 0:
+            msg = f"Invalid cache ttl {ttl!r}: expected a positive number of seconds"
+            raise ConfigError(msg)
+        key_parts = spec.get("key", list(DEFAULT_CACHE_KEY))
+        if not isinstance(key_parts, list) or not all(isinstance(part, str) and part for part in key_parts):
+            msg = f"Invalid cache key {key_parts!r}: expected a list of request parts such as 'params.id'"
+            raise ConfigError(msg)
+        for part in key_parts:
+            target, _ = _split_key_part(part)
+            if target not in CACHE_KEY_TARGETS:
+                msg = f"Invalid cache key part {part!r}: the target must be one of {', '.join(CACHE_KEY_TARGETS)}"
+                raise ConfigError(msg)
+        return cls(scope, ttl, tuple(key_parts))
+
+    def key_rules(self) -> list[dict[str, str]]:
+        """Returns the key parts read from the request as target/prop dicts, so they can join a RequestCapturePlan."""
+        return [
+            {"target": target, "prop": prop}
+            for target, prop in map(_split_key_part, self.key_parts)
+            if target != PATH_PARAMS_TARGET
+        ]
+
+    def key(self, request_data: Mapping[str, Any], path_params: Mapping[str, Any] | None = None) -> tuple:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            request_data: The captured request, keyed by request target.
+            path_params: The variables of the matched URL rule.
+
+        Returns:
+            A hashable key starting with the policy's scope.
+        """
+        return (
+            self.scope,
+            *(
+                _freeze(accessor(path_params if target == PATH_PARAMS_TARGET else request_data.get(target)))
+                for target, accessor in self._parts
+            ),
+        )
+
+
+def _split_key_part(part: str) -> tuple[str, str]:
+    target, _, prop = part.partition(".")
+    if target == "headers":
+        # Captured headers are named in werkzeug's title case, e.g. 'X-Api-Key', however they were sent.
+        prop = prop.title()
+    return target, prop
+
+
+def _freeze(value: Any) -> Any:
+    """Converts dicts and lists into hashable tuples."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,234 @@
+# src/pymock/server/capture.py
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import parse_qsl, urlencode
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+# Capture file: CAPTURE_MAGIC, then records of _RECORD_HEADER, the JSON metadata and the body.
+CAPTURE_MAGIC = b"PYMOCK-CAPTURE1\n"
+# Index file: INDEX_MAGIC, _INDEX_HEADER (capture bytes covered), then _INDEX_ENTRY sorted by key.
+INDEX_MAGIC = b"PYMOCK-CAPIDX01\n"
+INDEX_SUFFIX = ".idx"
+
+_RECORD_HEADER = struct.Struct("<16sHIQ")  # key, status, metadata length, body length
+_INDEX_HEADER = struct.Struct("<Q")
+_INDEX_ENTRY = struct.Struct("<16sQ")  # key, offset of the record in the capture file
+KEY_SIZE = 16
+
+
+class CapturedResponse(NamedTuple):
+    """A recorded upstream response, with the request it answered."""
+
+    method: str
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class CaptureKey:
+    """
+    Derives the lookup key of a request: a hash of its method, path, query parameters (in
+    sorted order), the selected headers and, optionally, the body.
+    """
+
+    __slots__ = ("headers", "match_body")
+
+    def __init__(self, headers: Iterable[str] = (), *, match_body: bool = True):
+        self.headers = tuple(sorted({name.lower() for name in headers}))
+        self.match_body = match_body
+
+    def __call__(self, method: str, path: str, query: str, headers: Any, body: bytes) -> bytes:
+        digest = hashlib.blake2b(digest_size=KEY_SIZE)
+        digest.update(method.upper().encode())
+        digest.update(b"\0")
+        digest.update(path.encode())
+        digest.update(b"\0")
+        digest.update(urlencode(sorted(parse_qsl(query, keep_blank_values=True))).encode())
+        for name in self.headers:
+            digest.update(b"\0")
+            digest.update(f"{name}:{headers.get(name, '')}".encode())
+        if self.match_body:
+            digest.update(b"\0")
+            digest.update(hashlib.blake2b(body, digest_size=KEY_SIZE).digest())
+        return digest.digest()
+
+
+class CaptureWriter:
+    """
+    Appends records to a capture file. Each record is written at once to a file opened in append
+    mode, so several threads or worker processes can record into one file. What a short write
+    leaves out is written straight after, so records are never truncated.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if os.fstat(self._fd).st_size == 0:
+                _write_all(self._fd, CAPTURE_MAGIC)
+            else:
+                _check_magic(self.path, CAPTURE_MAGIC)
+        except OSError as e:
+            msg = f"Cannot open capture file '{path}': {e.strerror or e}"
+            raise ConfigError(msg) from e
+
+    def append(self, key: bytes, response: CapturedResponse) -> None:
+        """Appends one request/response pair."""
+        metadata = json.dumps(
+            {"method": response.method, "url": response.url, "headers": response.headers}, separators=(",", ":")
+        ).encode()
+        record = b"".join(
+            (_RECORD_HEADER.pack(key, response.status, len(metadata), len(response.body)), metadata, response.body)
+        )
+        with self._lock:
+            _write_all(self._fd, record)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Writes all of data to a file descriptor, as os.write may write only part of it."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class CaptureStore:
+    """
+    Looks recorded responses up in a capture file through a sorted, memory-mapped index.
+
+    Neither file is parsed when it is opened: lookups binary-search the index in place and read
+    the one record they need, so opening a multi-GB capture costs the same as a small one. The
+    index, '<capture>.idx', is rebuilt from the record headers (skipping the bodies) when it is
+    missing, or extended when records were appended since it was written. When a request was
+    recorded several times, the latest recording is served.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        try:
+            _check_magic(self.path, CAPTURE_MAGIC)
+            self._refresh_index()
+            self._capture = _map(self.path)
+            self._index = _map(self.index_path)
+        except OSError as e:
+            msg = f"Cannot open capture file '{path}': {e.strerror or e}"
+            raise ConfigError(msg) from e
+        self._count = (len(self._index) - len(INDEX_MAGIC) - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+        logger.info("Opened capture '%s' with %d recorded requests", self.path, self._count)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key: bytes) -> CapturedResponse | None:
+        """Returns the latest response recorded for key, or None."""
+        low, high = 0, self._count
+        base = len(INDEX_MAGIC) + _INDEX_HEADER.size
+        while low < high:
+            middle = (low + high) // 2
+            position = base + middle * _INDEX_ENTRY.size
+            entry_key = self._index[position : position + KEY_SIZE]
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                (offset,) = struct.unpack_from("<Q", self._index, position + KEY_SIZE)
+                return self._read(offset)
+        return None
+
+    def _read(self, offset: int) -> CapturedResponse:
+        _, status, metadata_length, body_length = _RECORD_HEADER.unpack_from(self._capture, offset)
+        start = offset + _RECORD_HEADER.size
+        metadata = json.loads(self._capture[start : start + metadata_length])
+        body_start = start + metadata_length
+        return CapturedResponse(
+            metadata["method"],
+            metadata["url"],
+            status,
+            [tuple(header) for header in metadata["headers"]],
+            self._capture[body_start : body_start + body_length],
+        )
+
+    def _refresh_index(self) -> None:
+        size = self.path.stat().st_size
+        entries: dict[bytes, int] = {}
+        indexed_size = len(CAPTURE_MAGIC)
+        try:
+            with open(self.index_path, "rb") as file:
+                if file.read(len(INDEX_MAGIC)) == INDEX_MAGIC:
+                    (indexed_size,) = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+                    if indexed_size == size:
+                        return
+                    if indexed_size < size:
+                        data = file.read()
+                        entries = dict(_INDEX_ENTRY.iter_unpack(data))
+                    else:  # The capture was replaced by a shorter one.
+                        indexed_size = len(CAPTURE_MAGIC)
+        except FileNotFoundError:
+            pass
+
+        scanned = 0
+        for key, offset in _scan_records(self.path, indexed_size, size):
+            entries[key] = offset
+            scanned += 1
+        logger.info("Indexed %d new records of capture '%s'", scanned, self.path)
+        _write_index(self.index_path, size, entries)
+
+
+def _scan_records(path: Path, start: int, stop: int) -> Iterator[tuple[bytes, int]]:
+    """Yields (key, offset) of the records between start and stop, reading only their headers."""
+    with open(path, "rb") as file:
+        offset = start
+        while offset + _RECORD_HEADER.size <= stop:
+            file.seek(offset)
+            key, _, metadata_length, body_length = _RECORD_HEADER.unpack(file.read(_RECORD_HEADER.size))
+            end = offset + _RECORD_HEADER.size + metadata_length + body_length
+            if end > stop:
+                logger.warning("Capture '%s' ends with an incomplete record at offset %d", path, offset)
+                return
+            yield key, offset
+            offset = end
+
+
+def _write_index(index_path: Path, capture_size: int, entries: dict[bytes, int]) -> None:
+    """Writes an index atomically, so readers never map a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=f".{index_path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(INDEX_MAGIC)
+            file.write(_INDEX_HEADER.pack(capture_size))
+            file.write(b"".join(_INDEX_ENTRY.pack(key, entries[key]) for key in sorted(entries)))
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _check_magic(path: Path, magic: bytes) -> None:
+    with open(path, "rb") as file:
+        if file.read(len(magic)) != magic:
+            msg = f"'{path}' is not a PyMock capture file"
+            raise ConfigError(msg)
+
+
+def _map(path: Path) -> mmap.mmap:
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
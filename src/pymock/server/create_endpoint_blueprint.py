@@ -6,50 +6,141 @@ import logging
 import os
 import random
 import uuid
-from collections.abc import Callable
+from collections.abc import Mapping
+from time import perf_counter
+from typing import Any, NamedTuple
 
-from faker import Faker
-from flask import Blueprint, Response, jsonify, make_response, request
-from jinja2 import Environment
+from flask import Blueprint, Response
+from jinja2 import Environment, Template
 from ruleenginex.scenario import Scenario
-
-from pymock.server.request import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wrappers import Request as WerkzeugRequest
+
+from pymock.server.access_log import SCENARIO_ENVIRON_KEY
+from pymock.server.body import BODY_TOO_LARGE, BodyPolicy, reads_request_body
+from pymock.server.cache import CachedResponse, CachePolicy, ResponseCache
+from pymock.server.dispatch import ScenarioIndex
+from pymock.server.fake import FakePool, fake_providers_in
+from pymock.server.files import FileResponse
+from pymock.server.latency import DELAY_ENVIRON_KEY, Delay
+from pymock.server.matchers import Matcher, compile_matcher
+from pymock.server.metrics import EndpointMetrics, Metrics
+from pymock.server.proxy import Fallback
+from pymock.server.render import RenderPlan
+from pymock.server.request import Request, RequestCapturePlan, RequestView
+from pymock.server.response import StaticResponse, json_response
+from pymock.server.routes import EndpointHandler, EndpointRoute, register_routes
+from pymock.server.store import STORE_TARGET, ResourceBinding, ResourceStore
 from pymock.server.templates.handler import TemplateHandler
+from pymock.server.validation import RequestValidator
 
 logger = logging.getLogger(__name__)
 
+NO_MATCHING_SCENARIO = StaticResponse.from_data(404, {"error": "No matching scenario"})
+CONDITIONAL_METHODS = frozenset({"GET", "HEAD"})
+
+
+class CompiledScenario(NamedTuple):
+    """A scenario along with everything precompiled for it at registration time."""
 
-def create_endpoint_blueprint(endpoints_config: list[dict]) -> Blueprint:
+    scenario: Scenario
+    matcher: Matcher
+    render_plan: RenderPlan
+    cache_policy: CachePolicy | None
+    static_response: StaticResponse | None
+    file_response: FileResponse | None
+    delay: Delay | None
+
+
+def create_endpoint_blueprint(
+    endpoints_config: list[dict],
+    response_cache: ResponseCache | None = None,
+    fallback: Fallback | None = None,
+    metrics: Metrics | None = None,
+) -> Blueprint:
     """
     Creates a Flask Blueprint with dynamic endpoints. Each endpoint can define multiple
     scenarios, and the first scenario whose rules match is chosen. Also supports:
       - Inline Jinja2 expressions in the 'data' portion of responses
-      - Caching with a custom key function
+      - Opt-in response caching ('cache' on the endpoint or a scenario's response),
+        keyed by the declared request parts
+      - A fallback, such as record or replay, for requests no scenario matches
+      - Request counts and stage timings, recorded in metrics
+      - Rejecting requests that do not match the endpoint's 'request_schema'
+      - Rejecting request bodies over a size limit, and parsing JSON bodies from the input
+        stream for the keys rules use only ('request_body')
+      - Creating, reading, updating, deleting and listing records of the resource store
+        ('store'), for requests the scenarios do not answer
+    """
+    mock_bp = Blueprint("mock_blueprint", __name__)
+    register_routes(mock_bp, create_endpoint_routes(endpoints_config, response_cache, fallback, metrics))
+    logger.debug("Finished creating blueprint with all endpoints registered.")
+    return mock_bp
+
+
+def create_endpoint_routes(
+    endpoints_config: list[dict],
+    response_cache: ResponseCache | None = None,
+    fallback: Fallback | None = None,
+    metrics: Metrics | None = None,
+) -> list[EndpointRoute]:
+    """
+    Compiles the endpoints into framework-neutral routes, which the Flask Blueprint and the
+    ASGI application both serve.
     """
     logger.debug("Loading endpoints config: %s", endpoints_config)
 
-    fake = Faker()
+    # Pools of the providers templates call without arguments are filled in the background.
+    fake = FakePool.shared()
+    fake.warm(
+        {
+            name
+            for endpoint in endpoints_config
+            for scenario in endpoint.get("scenarios", [])
+            for name in fake_providers_in(scenario.get("response", {}).get("data"))
+        }
+    )
 
-    mock_bp = Blueprint("mock_blueprint", __name__)
+    store = ResourceStore.shared()
     jinja_env = Environment(autoescape=True)
     jinja_env.globals["fake"] = fake
+    jinja_env.globals["store"] = store
     jinja_env.globals["random"] = random
     jinja_env.globals["b64encode"] = base64.b64encode
     jinja_env.globals["b64decode"] = base64.b64decode
     jinja_env.globals["hashlib"] = hashlib
     jinja_env.globals["env"] = os.environ
     jinja_env.globals["uuid4"] = uuid.uuid4
-
-    for endpoint in endpoints_config:
-        _register_endpoint_with_blueprint(mock_bp, endpoint, jinja_env)
-
-    logger.debug("Finished creating blueprint with all endpoints registered.")
-    return mock_bp
+    template_cache: dict[str, Template] = {}
+    if response_cache is None:
+        response_cache = ResponseCache()
+    if metrics is None:
+        metrics = Metrics()
+
+    return [
+        _create_endpoint_route(
+            endpoint, jinja_env, template_cache, response_cache, fallback=fallback, metrics=metrics, store=store
+        )
+        for endpoint in endpoints_config
+    ]
 
 
-def _register_endpoint_with_blueprint(mock_bp: Blueprint, endpoint: dict, jinja_env: Environment):
+def _create_endpoint_route(
+    endpoint: dict,
+    jinja_env: Environment,
+    template_cache: dict[str, Template],
+    response_cache: ResponseCache,
+    *,
+    fallback: Fallback | None = None,
+    metrics: Metrics,
+    store: ResourceStore,
+) -> EndpointRoute:
     """
-    Registers an endpoint with the given Blueprint.
+    Compiles an endpoint into a route. The rules of all scenarios, together with their cache
+    keys and the validated targets, are summarized into a RequestCapturePlan, so requests only
+    capture the parts they look at, and a ScenarioIndex narrows down the scenarios to evaluate.
+    JSON bodies are only streamed if nothing but the rules reads them. An endpoint with a
+    'store' setting is bound to a resource of the store.
     """
     path = endpoint["path"]
     method = endpoint["method"].upper()
@@ -58,124 +149,271 @@ def _register_endpoint_with_blueprint(mock_bp: Blueprint, endpoint: dict, jinja_
     logger.debug("Registering endpoint: %s %s", method, path)
     logger.debug("Scenarios for endpoint %s: %s", path, scenario_configs)
 
-    scenario_list = _create_scenarios_from_config(scenario_configs)
-    route_handler = _create_scenario_based_route_handler(scenario_list, jinja_env)
-
-    mock_bp.add_url_rule(
-        path,
-        endpoint=f"{method}-{path}",
-        view_func=route_handler,
-        methods=[method],
+    compiled_scenarios = _create_scenarios_from_config(endpoint, jinja_env, template_cache)
+    validator = RequestValidator.from_config(endpoint.get("request_schema"), f"{method} {path}")
+    binding = ResourceBinding.from_config(endpoint.get("store"), method, path, store)
+    body_policy = BodyPolicy.from_config(endpoint.get("request_body"))
+    if body_policy is not None and body_policy.stream and _reads_whole_body(scenario_configs, fallback):
+        logger.debug("Not streaming the request bodies of %s %s: they are read whole.", method, path)
+        body_policy = body_policy.without_streaming()
+    capture_plan = RequestCapturePlan.from_rules(
+        [rule for sc in scenario_configs for rule in sc.get("rules", [])]
+        + [rule for cs in compiled_scenarios if cs.cache_policy is not None for rule in cs.cache_policy.key_rules()]
+        + (validator.capture_rules() if validator is not None else [])
+        + (binding.capture_rules() if binding is not None else []),
+        extra_targets=(STORE_TARGET,) if binding is not None else (),
+    )
+    scenario_index = ScenarioIndex.build(scenario_configs)
+    scenario_names = [cs.scenario.scenario_name for cs in compiled_scenarios]
+    if binding is not None:
+        # Requests answered by the store are counted as a scenario of their own, after the others.
+        scenario_names.append(f"store:{binding.action}")
+    endpoint_metrics = EndpointMetrics(metrics, method, path, scenario_names)
+    route_handler = _create_scenario_based_route_handler(
+        compiled_scenarios,
+        capture_plan,
+        scenario_index,
+        response_cache,
+        fallback=fallback,
+        metrics=endpoint_metrics,
+        validator=validator,
+        body_policy=body_policy,
+        binding=binding,
     )
 
-    logger.debug("Endpoint %s %s registered successfully.", method, path)
+    # Only endpoints answering every request with pre-encoded bytes may run on an event loop.
+    blocking = (
+        fallback is not None
+        or validator is not None
+        or binding is not None
+        or any(cs.static_response is None for cs in compiled_scenarios)
+    )
+    logger.debug("Endpoint %s %s compiled successfully.", method, path)
+    return EndpointRoute(path, method, route_handler, blocking)
 
 
-def _create_scenarios_from_config(scenario_configs: list[dict]) -> list[Scenario]:
+def _create_scenarios_from_config(
+    endpoint: dict, jinja_env: Environment, template_cache: dict[str, Template]
+) -> list[CompiledScenario]:
     """
-    Builds a list of Scenario objects from the given scenario configurations.
+    Builds the Scenario objects of an endpoint and precompiles each of them:
+      - its rules into a matcher; rules the matchers cannot compile are interpreted by a
+        single-rule Scenario instead
+      - its response data into a RenderPlan, so requests only render the dynamic leaves
+      - its 'cache' setting, falling back to the endpoint's, into a CachePolicy
+      - its 'delay' setting into a Delay
+      - its whole response into a StaticResponse, if it has neither Jinja2 expressions nor a
+        template, so requests are served pre-encoded bytes
+      - its 'file' setting into a FileResponse, mapping the file into memory once
     """
     logger.debug("Building scenario list from configurations.")
-    scenario_list = [
-        Scenario(
-            scenario_name=sc.get("scenario_name", "Unnamed"),
-            rules=sc.get("rules", []),
-            response=sc.get("response", {}),
+    method = endpoint["method"].upper()
+    compiled_scenarios = []
+    for position, sc in enumerate(endpoint.get("scenarios", [])):
+        rules = sc.get("rules", [])
+        response = sc.get("response", {})
+        scenario = Scenario(scenario_name=sc.get("scenario_name", "Unnamed"), rules=rules, response=response)
+        render_plan = RenderPlan.compile(response.get("data", {}), jinja_env, template_cache)
+        static_response = file_response = None
+        if response.get("file"):
+            file_response = FileResponse(response["file"], response.get("status", 200), response.get("content_type"))
+        elif render_plan.is_static and not response.get("template"):
+            static_response = StaticResponse.from_data(response.get("status", 200), render_plan.data)
+        compiled_scenarios.append(
+            CompiledScenario(
+                scenario=scenario,
+                matcher=compile_matcher(rules, fallback=_interpret_rule),
+                render_plan=render_plan,
+                cache_policy=CachePolicy.from_config(
+                    response.get("cache", endpoint.get("cache")), (method, endpoint["path"], position)
+                ),
+                static_response=static_response,
+                file_response=file_response,
+                delay=Delay.from_config(response.get("delay")),
+            )
         )
-        for sc in scenario_configs
-    ]
-    logger.debug("Scenario list built with %d scenarios.", len(scenario_list))
-    return scenario_list
+    logger.debug("Scenario list built with %d scenarios.", len(compiled_scenarios))
+    return compiled_scenarios
 
 
-def _create_scenario_based_route_handler(scenarios: list[Scenario], jinja_env: Environment) -> Callable[..., Response]:
+def _reads_whole_body(scenario_configs: list[dict], fallback: Fallback | None) -> bool:
     """
-    Creates a route handler that checks each scenario in order, returning the first that matches.
+    Returns True if the request body is read whole by the fallback, which forwards or records
+    it, or by the response data of a scenario, as request.json.
     """
-    logger.debug("Creating route handler for scenarios.")
+    return fallback is not None or any(
+        reads_request_body(sc.get("response", {}).get("data")) for sc in scenario_configs
+    )
 
-    def route_handler(**kwargs) -> Response:
-        logger.debug("Route handler invoked with kwargs: %s", kwargs)
-        request_obj = Request()
-        request_data = request_obj.to_dict()
 
-        logger.debug("Request data: %s", request_data)
+def _interpret_rule(rule: dict) -> Matcher:
+    """
+    Wraps a rule the matchers cannot compile in a single-rule Scenario.
 
-        jinja_env.globals["request"] = request_obj
+    Scenario.evaluate gets a plain dict, as before request capture became lazy. It only holds
+    the rule's target, so the other targets are not captured for it.
+    """
+    evaluate = Scenario(scenario_name="interpreted rule", rules=[rule], response={}).evaluate
+    target = rule.get("target") if isinstance(rule, dict) else None
+
+    def interpret(request_data: Mapping[str, Any]) -> bool:
+        if isinstance(target, str) and target in request_data:
+            return evaluate({target: request_data[target]})
+        return evaluate(dict(request_data))
+
+    return interpret
+
+
+def _create_scenario_based_route_handler(
+    compiled_scenarios: list[CompiledScenario],
+    capture_plan: RequestCapturePlan,
+    scenario_index: ScenarioIndex,
+    response_cache: ResponseCache,
+    *,
+    fallback: Fallback | None = None,
+    metrics: EndpointMetrics,
+    validator: RequestValidator | None = None,
+    body_policy: BodyPolicy | None = None,
+    binding: ResourceBinding | None = None,
+) -> EndpointHandler:
+    """
+    Creates a route handler that checks each candidate scenario in order, returning the first
+    that matches. It only relies on the werkzeug request it is given, not on Flask's globals.
+    Requests the validator rejects get its error response before any scenario is checked, as do
+    bodies over the size limit of the body policy, with a 413. Requests no scenario matches
+    get the action of the resource binding, if any, before the fallback.
+    The handler counts its requests per scenario and times their stages in metrics.
+    """
+    logger.debug("Creating route handler for scenarios.")
 
-        for scenario in scenarios:
-            logger.debug("Checking scenario: %s", scenario.scenario_name)
-            if scenario.evaluate(request_data):
-                logger.debug("Scenario matched: %s", scenario.scenario_name)
-                return _generate_response_for_matched_scenario(scenario, jinja_env, kwargs)
-            else:
+    def route_handler(source: WerkzeugRequest, kwargs: dict[str, Any]) -> Response:
+        started = perf_counter()
+        try:
+            return handle(source, kwargs, started)
+        except RequestEntityTooLarge:
+            metrics.rejected()
+            return BODY_TOO_LARGE.to_flask_response()
+        finally:
+            metrics.observe_request(perf_counter() - started)
+
+    def handle(source: WerkzeugRequest, kwargs: dict[str, Any], started: float) -> Response:
+        # Checked once per request: the debug messages below must not cost anything, such as
+        # capturing the whole request to print it, unless they are logged.
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if body_policy is not None:
+            body_policy.limit(source)
+        resolvers = None if binding is None else {STORE_TARGET: lambda view: binding.lookup(view, kwargs)}
+        request_data = RequestView(Request(source, body_policy), capture_plan, resolvers)
+        if debug:
+            logger.debug("Route handler invoked with kwargs: %s", kwargs)
+            logger.debug("Request data: %s", request_data)
+
+        # The render context is built per request rather than stored in the shared
+        # environment globals, so concurrent requests never see each other's data.
+        render_context = {"request": source}
+
+        if validator is not None:
+            invalid = validator.validate(request_data)
+            metrics.observe_stage("validation", perf_counter() - started)
+            if invalid is not None:
+                metrics.rejected()
+                if debug:
+                    logger.debug("Request rejected by the request schema: %s", invalid.get_data(as_text=True))
+                return invalid
+
+        # Validation is timed on its own, so the rules stage starts once it is done.
+        checked = perf_counter()
+        for position in scenario_index.candidates(request_data):
+            compiled = compiled_scenarios[position]
+            scenario = compiled.scenario
+            if debug:
+                logger.debug("Checking scenario: %s", scenario.scenario_name)
+            if compiled.matcher(request_data):
+                metrics.observe_stage("rules", perf_counter() - checked)
+                metrics.matched(position)
+                source.environ[SCENARIO_ENVIRON_KEY] = scenario.scenario_name
+                if debug:
+                    logger.debug("Scenario matched: %s", scenario.scenario_name)
+                if compiled.delay is not None:
+                    # Held by the serving engine, so the response is not delayed by blocking here.
+                    source.environ[DELAY_ENVIRON_KEY] = compiled.delay.sample()
+                if compiled.file_response is not None:
+                    return compiled.file_response.to_flask_response(source)
+                if compiled.static_response is not None:
+                    conditional = source.method in CONDITIONAL_METHODS
+                    if_none_match = source.headers.get("If-None-Match") if conditional else None
+                    return compiled.static_response.to_flask_response(if_none_match)
+
+                cache_policy = compiled.cache_policy
+                if cache_policy is None:
+                    return _generate_response_for_matched_scenario(
+                        compiled, render_context, kwargs, metrics, debug=debug
+                    )
+
+                cache_key = cache_policy.key(request_data, kwargs)
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    if debug:
+                        logger.debug("Serving cached response for scenario: %s", scenario.scenario_name)
+                    return Response(cached.body, status=cached.status, headers=cached.headers)
+                response = _generate_response_for_matched_scenario(
+                    compiled, render_context, kwargs, metrics, debug=debug
+                )
+                response_cache.set(
+                    cache_key,
+                    CachedResponse(response.status_code, list(response.headers), response.get_data()),
+                    cache_policy.ttl,
+                )
+                return response
+            elif debug:
                 logger.debug("Scenario did not match: %s", scenario.scenario_name)
 
-        logger.debug("No scenario matched for the request.")
-        return make_response(jsonify({"error": "No matching scenario"}), 404)
+        metrics.observe_stage("rules", perf_counter() - checked)
+        if binding is not None:
+            metrics.matched(len(compiled_scenarios))
+            performed = perf_counter()
+            response = binding.perform(request_data, kwargs)
+            metrics.observe_stage("store", perf_counter() - performed)
+            return response
+        metrics.missed()
+        if debug:
+            logger.debug("No scenario matched for the request.")
+        if fallback is not None and (fallback_response := fallback(source)) is not None:
+            return fallback_response
+        return NO_MATCHING_SCENARIO.to_flask_response()
 
     logger.debug("Route handler created successfully.")
     return route_handler
 
 
-def _generate_response_for_matched_scenario(scenario: Scenario, jinja_env: Environment, kwargs: dict) -> Response:
+def _generate_response_for_matched_scenario(
+    compiled: CompiledScenario, render_context: dict, kwargs: dict, metrics: EndpointMetrics, *, debug: bool = False
+) -> Response:
     """
-    Handles the response for a matched scenario.
+    Handles the response for a matched scenario, timing each stage in metrics. Debug messages
+    are only logged if debug is set.
     """
-    logger.debug("Handling response for matched scenario: %s", scenario.scenario_name)
+    scenario = compiled.scenario
     scenario_resp = scenario.get_response()
     status_code = scenario_resp.get("status", 200)
-    data = scenario_resp.get("data", {})
     template_name = scenario_resp.get("template")
 
-    logger.debug("Scenario response: %s", scenario_resp)
-    logger.debug("Rendering data with Jinja2 expressions.")
-    rendered_data = _render_jinja_expressions_in_data(data, jinja_env)
+    if debug:
+        logger.debug("Handling response for matched scenario: %s", scenario.scenario_name)
+        logger.debug("Scenario response: %s", scenario_resp)
+    started = perf_counter()
+    rendered_data = compiled.render_plan.render(render_context)
+    rendered = perf_counter()
+    metrics.observe_stage("jinja", rendered - started)
 
     if template_name:
-        logger.debug("Using template for response: %s", template_name)
+        if debug:
+            logger.debug("Using template for response: %s", template_name)
         template_data = {**rendered_data, **kwargs}
         rendered_content = TemplateHandler.render(template_name, template_data)
-        logger.debug("Template rendered successfully.")
-        return make_response(rendered_content, status_code)
+        metrics.observe_stage("template", perf_counter() - rendered)
+        return Response(rendered_content, status_code)
     else:
-        logger.debug("Returning JSON response.")
-        return make_response(jsonify(rendered_data), status_code)
-
-
-def _render_jinja_expressions_in_data(data: dict, jinja_env: Environment) -> dict:
-    """
-    Renders Jinja2 expressions in dictionary string values.
-    """
-    logger.debug("Rendering data: %s", data)
-    rendered_data = {}
-    for key, value in data.items():
-        if isinstance(value, str) and "{{" in value:
-            logger.debug("Rendering Jinja2 expression for key: %s", key)
-            rendered_data[key] = _render_and_parse_jinja_value(value, jinja_env)
-        else:
-            rendered_data[key] = value
-    logger.debug("Rendered data: %s", rendered_data)
-    return rendered_data
-
-
-def _render_and_parse_jinja_value(value: str, jinja_env: Environment):
-    """
-    Renders a Jinja2 expression and optionally converts it to a list if it looks like one.
-    """
-    logger.debug("Rendering Jinja2 value: %s", value)
-    template = jinja_env.from_string(value)
-    rendered_value = template.render(request=request)
-    if rendered_value.startswith("[") and rendered_value.endswith("]"):
-        logger.debug("Rendered value looks like a list: %s", rendered_value)
-        try:
-            import ast
-
-            parsed_value = ast.literal_eval(rendered_value)
-            logger.debug("Successfully parsed rendered value as a list: %s", parsed_value)
-            return parsed_value
-        except (ValueError, SyntaxError) as e:
-            logger.debug("Failed to parse rendered value as a list: %s", e)
-            return rendered_value
-    logger.debug("Rendered value: %s", rendered_value)
-    return rendered_value
+        response = json_response(rendered_data, status_code)
+        metrics.observe_stage("serialization", perf_counter() - rendered)
+        return response
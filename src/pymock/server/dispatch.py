@@ -0,0 +1,116 @@
+# src/pymock/server/dispatch.py
+import logging
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from pymock.server.matchers import simple_path
+
+logger = logging.getLogger(__name__)
+
+# Below this many indexable scenarios a linear scan is just as fast.
+MIN_INDEXED_SCENARIOS = 4
+
+_MISSING = object()
+
+
+class ScenarioIndex:
+    """
+    Hash index that narrows down which scenarios of an endpoint can match a request.
+
+    Scenarios whose first rule is an equality on the most common target/prop are bucketed by
+    the expected value. A request looks up its actual value once and only evaluates the
+    scenarios of that bucket, merged in their original order with the scenarios that are not
+    indexed. Indexed scenarios of other buckets cannot match, since their first rule fails,
+    so first-match semantics are unchanged.
+    """
+
+    __slots__ = ("_buckets", "_path", "_target", "_unindexed")
+
+    def __init__(
+        self,
+        unindexed: Sequence[int],
+        target: str | None = None,
+        path: tuple[str, ...] = (),
+        buckets: dict[Any, tuple[int, ...]] | None = None,
+    ):
+        self._unindexed = tuple(unindexed)
+        self._target = target
+        self._path = path
+        self._buckets = buckets or {}
+
+    @classmethod
+    def build(cls, scenario_configs: list[dict]) -> "ScenarioIndex":
+        """
+        Builds the index from the scenario configurations of an endpoint.
+
+        Args:
+            scenario_configs: The raw scenario dicts, in declaration order.
+
+        Returns:
+            A ScenarioIndex; one that simply yields every scenario if nothing is worth indexing.
+        """
+        keys = [_equality_key(sc.get("rules", [])) for sc in scenario_configs]
+        counts = Counter(key[:2] for key in keys if key is not None)
+        if not counts or counts.most_common(1)[0][1] < MIN_INDEXED_SCENARIOS:
+            return cls(range(len(scenario_configs)))
+
+        (target, path), indexed_count = counts.most_common(1)[0]
+        positions: dict[Any, list[int]] = {}
+        unindexed = []
+        for position, key in enumerate(keys):
+            if key is not None and key[:2] == (target, path):
+                positions.setdefault(key[2], []).append(position)
+            else:
+                unindexed.append(position)
+
+        buckets = {value: tuple(sorted(indexed + unindexed)) for value, indexed in positions.items()}
+        logger.debug(
+            "Indexed %d of %d scenarios on %s %s (%d buckets).",
+            indexed_count,
+            len(scenario_configs),
+            target,
+            ".".join(path) or "<whole>",
+            len(buckets),
+        )
+        return cls(unindexed, target, path, buckets)
+
+    def candidates(self, request_data: Mapping[str, Any]) -> Sequence[int]:
+        """
+        Returns the positions of the scenarios that may match, in declaration order.
+        """
+        if self._target is None:
+            return self._unindexed
+        value = _lookup(request_data, self._target, self._path)
+        try:
+            return self._buckets.get(value, self._unindexed)
+        except TypeError:  # unhashable values cannot equal an indexed scalar
+            return self._unindexed
+
+
+def _equality_key(rules: list) -> tuple[str, tuple[str, ...], Any] | None:
+    """
+    Returns (target, path, value) if the first rule is a plain equality on a scalar value.
+    """
+    if not rules or not isinstance(rules[0], dict):
+        return None
+    rule = rules[0]
+    target = rule.get("target")
+    value = rule.get("value")
+    if not isinstance(target, str) or str(rule.get("op", "")).upper() != "EQUALS":
+        return None
+    if not isinstance(value, str | int) or isinstance(value, bool):
+        return None
+    path = simple_path(rule.get("prop") or "")
+    if path is None:
+        return None
+    return target, path, value
+
+
+def _lookup(request_data: Mapping[str, Any], target: str, path: tuple[str, ...]) -> Any:
+    value = request_data.get(target, _MISSING)
+    for key in path:
+        if not isinstance(value, Mapping):
+            return _MISSING
+        value = value.get(key, _MISSING)
+    return value
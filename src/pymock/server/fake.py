@@ -0,0 +1,262 @@
+# src/pymock/server/fake.py
+import json
+import logging
+import os
+import random
+import re
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from pymock.server.exceptions import ConfigError
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 1024
+# Values generated per refill step; the generation lock is released between steps.
+_REFILL_CHUNK = 64
+_FAKE_CALL = re.compile(r"\bfake\.([A-Za-z_][A-Za-z0-9_]*)\(\s*\)")
+
+# Live pools, so their locks and refill threads can be handled around forks.
+_instances: "weakref.WeakSet[FakePool]" = weakref.WeakSet()
+
+
+class FakePool:
+    """
+    Stands in for a Faker instance as the 'fake' global of templates, serving the values of
+    argument-less provider calls, such as fake.name(), from pools of pre-generated values.
+    Faker, with its hundreds of provider modules, is only imported once a provider is used.
+
+    Each pool is topped up to pool_size values by a background thread once it falls below
+    half of that, so a request pops values rather than running Faker providers. Calls with
+    arguments, and empty pools, fall back to calling the provider.
+
+    Each provider draws from its own random generator: with a seed, the values of each
+    provider are the same sequence on every run, however calls and refills interleave.
+    Pools filled before forking are inherited by workers. Seeded workers keep serving them,
+    while unseeded ones drop them and refill with a fresh seed, so workers do not repeat
+    each other's values.
+    """
+
+    _shared: ClassVar["FakePool | None"] = None
+    _shared_lock = threading.Lock()
+    _pool_size = DEFAULT_POOL_SIZE
+    _seed: int | str | None = None
+    _locale: str | None = None
+
+    def __init__(self, *, pool_size: int = DEFAULT_POOL_SIZE, seed: int | str | None = None, locale: str | None = None):
+        if pool_size < 1:
+            msg = f"Invalid fake value pool size: {pool_size}"
+            raise ConfigError(msg)
+        self.pool_size = pool_size
+        self.seed = seed
+        self.locale = locale
+        self._faker_instance: Faker | None = None
+        self._faker_lock = threading.Lock()
+        # Guards the Faker instance, whose random generator is switched per provider.
+        self._lock = threading.Lock()
+        self._direct_random = self._new_random("")
+        self._providers: dict[str, _PooledProvider] = {}
+        self._pending: dict[str, _PooledProvider] = {}
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        _instances.add(self)
+
+    @classmethod
+    def configure(
+        cls, *, pool_size: int = DEFAULT_POOL_SIZE, seed: int | str | None = None, locale: str | None = None
+    ) -> None:
+        """
+        Sets the options of the shared pool. The current shared pool, if any, is replaced.
+
+        Args:
+            pool_size: Number of values kept per provider.
+            seed: Seed for reproducible values, or None for random ones.
+            locale: Faker locale, such as 'fr_FR', or None for Faker's default.
+        """
+        with cls._shared_lock:
+            cls._pool_size = pool_size
+            cls._seed = seed
+            cls._locale = locale
+            cls._shared = None
+
+    @classmethod
+    def shared(cls) -> "FakePool":
+        """Returns the pool shared by all endpoints of the process."""
+        pool = cls._shared
+        if pool is None:
+            with cls._shared_lock:
+                pool = cls._shared
+                if pool is None:
+                    pool = cls._shared = cls(pool_size=cls._pool_size, seed=cls._seed, locale=cls._locale)
+        return pool
+
+    @property
+    def _faker(self) -> "Faker":
+        faker = self._faker_instance
+        if faker is None:
+            with self._faker_lock:
+                faker = self._faker_instance
+                if faker is None:
+                    from faker import Faker  # noqa: PLC0415
+
+                    try:
+                        faker = self._faker_instance = Faker(self.locale)
+                    except AttributeError as e:
+                        msg = f"Invalid Faker locale: {self.locale!r}"
+                        raise ConfigError(msg) from e
+        return faker
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self._faker, name)
+        if not callable(attribute):
+            return attribute
+        with self._lock:
+            provider = self._providers.get(name)
+            if provider is None:
+                provider = self._providers[name] = _PooledProvider(self, name)
+                # Later lookups find the provider as a plain attribute.
+                self.__dict__[name] = provider
+        return provider
+
+    def warm(self, names: Iterable[str]) -> None:
+        """Schedules the pools of the given providers to be filled, ignoring unknown names."""
+        for name in names:
+            try:
+                provider = getattr(self, name)
+            except AttributeError:
+                continue
+            if isinstance(provider, _PooledProvider):
+                provider.request_refill()
+
+    def _schedule(self, provider: "_PooledProvider") -> None:
+        self._pending[provider.name] = provider
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._refill_forever, name="pymock-fake-pool", daemon=True)
+                    self._thread.start()
+        self._wake.set()
+
+    def _refill_forever(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while self._pending:
+                _, provider = self._pending.popitem()
+                self._refill(provider)
+
+    def _refill(self, provider: "_PooledProvider") -> None:
+        try:
+            while len(provider.values) < self.pool_size:
+                with self._lock:
+                    self._use_random(provider.random)
+                    provider.values.extend(provider.generate() for _ in range(_REFILL_CHUNK))
+        except Exception:
+            logger.exception("Failed to pre-generate values for fake.%s()", provider.name)
+            provider.failed = True
+        finally:
+            provider.scheduled = False
+
+    def _call(self, provider: "_PooledProvider", args: tuple, kwargs: dict[str, Any]) -> Any:
+        with self._lock:
+            if args or kwargs:
+                self._use_random(self._direct_random)
+                return provider.generate(*args, **kwargs)
+            # The pool is empty: take the next value of the provider's own sequence.
+            self._use_random(provider.random)
+            if provider.values:
+                return provider.values.popleft()
+            return provider.generate()
+
+    def _use_random(self, rng: random.Random) -> None:
+        """Makes the Faker providers draw from rng; called with the lock held."""
+        # Faker's stub omits the random property of its proxy.
+        self._faker.random = rng  # type: ignore[attr-defined]
+
+    def _new_random(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}:{name}" if self.seed is not None else None)  # noqa: S311
+
+    def _after_fork_in_child(self) -> None:
+        self._lock = threading.Lock()
+        self._faker_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pending = {}
+        if self.seed is None:
+            self._direct_random = self._new_random("")
+        for provider in self._providers.values():
+            provider.scheduled = False
+            if self.seed is None:
+                provider.values.clear()
+                provider.random = self._new_random(provider.name)
+            provider.request_refill()
+
+
+class _PooledProvider:
+    """A Faker provider method, answered from its pool of values when called without arguments."""
+
+    __slots__ = ("failed", "generate", "name", "owner", "random", "scheduled", "values")
+
+    def __init__(self, owner: FakePool, name: str):
+        self.owner = owner
+        self.name = name
+        self.generate = getattr(owner._faker, name)
+        self.random = owner._new_random(name)
+        self.values: deque[Any] = deque()
+        self.scheduled = False
+        # Set when pre-generating failed, typically because the method needs arguments.
+        self.failed = False
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if not args and not kwargs:
+            values = self.values
+            try:
+                value = values.popleft()
+            except IndexError:
+                self.request_refill()
+            else:
+                if len(values) < self.owner.pool_size // 2:
+                    self.request_refill()
+                return value
+        return self.owner._call(self, args, kwargs)
+
+    def request_refill(self) -> None:
+        if not self.scheduled and not self.failed:
+            self.scheduled = True
+            self.owner._schedule(self)
+
+    def __repr__(self) -> str:
+        return f"<pooled fake.{self.name}>"
+
+
+def fake_providers_in(data: Any) -> set[str]:
+    """Returns the names of the providers called without arguments, as fake.name(), in response data."""
+    return set(_FAKE_CALL.findall(json.dumps(data, default=str)))
+
+
+def _lock_all() -> None:
+    for pool in list(_instances):
+        pool._lock.acquire()
+
+
+def _unlock_all() -> None:
+    for pool in list(_instances):
+        pool._lock.release()
+
+
+def _restart_in_child() -> None:
+    for pool in list(_instances):
+        pool._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    # Forking while a refill holds a lock would leave it locked forever in the child.
+    os.register_at_fork(before=_lock_all, after_in_parent=_unlock_all, after_in_child=_restart_in_child)
@@ -0,0 +1,106 @@
+# src/pymock/server/files.py
+import logging
+import mimetypes
+import mmap
+import os
+from collections.abc import Iterator
+from http import HTTPStatus
+
+from flask import Response as Flask_Response
+from werkzeug.http import http_date, parse_etags, parse_range_header
+from werkzeug.wrappers import Request as WerkzeugRequest
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied out of the memory map per write, which bounds the memory a download takes.
+CHUNK_SIZE = 1024 * 1024
+CONDITIONAL_METHODS = frozenset({"GET", "HEAD"})
+
+
+class FileResponse:
+    """
+    A response whose body is a file, memory-mapped once and shared by all requests.
+
+    The mapping is made when the endpoint is compiled, before any worker is forked, so threads
+    and worker processes read the same pages of the OS page cache. Each request streams its
+    bytes in CHUNK_SIZE pieces, so concurrent downloads of a large file cost a chunk of memory
+    each rather than the whole file. Single byte ranges are answered with 206 and unsatisfiable
+    ones with 416; requests for several ranges, or in other units, get the whole file. The ETag
+    is derived from the file's size and modification time, so large files are not hashed.
+
+    The file is read where it was mapped: replace it (e.g. by renaming a new file over it)
+    rather than truncating it in place while the server runs.
+    """
+
+    __slots__ = ("_buffer", "content_type", "etag", "headers", "path", "size", "status_code")
+
+    def __init__(self, path: str, status_code: int = 200, content_type: str | None = None):
+        try:
+            with open(path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                # Empty files cannot be mapped.
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        except OSError as e:
+            msg = f"Cannot serve response file '{path}': {e.strerror or e}"
+            raise ConfigError(msg) from e
+
+        self.path = path
+        self.status_code = status_code
+        self.content_type = content_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.size = stat.st_size
+        self.etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        self.headers = [
+            ("Content-Type", self.content_type),
+            ("Accept-Ranges", "bytes"),
+            ("ETag", self.etag),
+            ("Last-Modified", http_date(stat.st_mtime)),
+        ]
+        logger.debug("Mapped response file '%s' (%d bytes)", path, self.size)
+
+    def to_flask_response(self, source: WerkzeugRequest) -> Flask_Response:
+        """Builds the response to a request, honoring If-None-Match, Range and If-Range."""
+        conditional = self.status_code == HTTPStatus.OK and source.method in CONDITIONAL_METHODS
+        if not conditional:
+            return self._stream(self.status_code, 0, self.size)
+
+        if_none_match = source.headers.get("If-None-Match")
+        if if_none_match and parse_etags(if_none_match).contains_weak(self.etag[1:-1]):
+            return Flask_Response(status=HTTPStatus.NOT_MODIFIED, headers=[("ETag", self.etag)])
+
+        byte_range = parse_range_header(source.headers.get("Range"))
+        if_range = source.headers.get("If-Range")
+        if (
+            byte_range is None
+            or byte_range.units != "bytes"
+            or len(byte_range.ranges) != 1
+            or (if_range is not None and if_range != self.etag)
+        ):
+            return self._stream(HTTPStatus.OK, 0, self.size)
+
+        bounds = byte_range.range_for_length(self.size)
+        if bounds is None:
+            return Flask_Response(
+                status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers=[("Content-Range", f"bytes */{self.size}"), ("ETag", self.etag)],
+            )
+        start, stop = bounds
+        response = self._stream(HTTPStatus.PARTIAL_CONTENT, start, stop)
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{self.size}"
+        return response
+
+    def _stream(self, status_code: int, start: int, stop: int) -> Flask_Response:
+        response = Flask_Response(
+            _iter_chunks(self._buffer, start, stop),
+            status=status_code,
+            headers=self.headers,
+            direct_passthrough=True,
+        )
+        response.content_length = stop - start
+        return response
+
+
+def _iter_chunks(buffer: mmap.mmap | bytes, start: int, stop: int) -> Iterator[bytes]:
+    for offset in range(start, stop, CHUNK_SIZE):
+        yield buffer[offset : min(offset + CHUNK_SIZE, stop)]
@@ -0,0 +1,181 @@
+# src/pymock/server/latency.py
+import bisect
+import logging
+import math
+import random
+import re
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+# WSGI environ key under which a route handler records the delay, in seconds, of its response.
+# The serving engine holds the response until that much time has passed since it was received.
+DELAY_ENVIRON_KEY = "pymock.delay"
+
+_PERCENTILE = re.compile(r"^p(\d+(?:\.\d+)?)$")
+
+
+class Delay:
+    """
+    Latency added to a scenario's response, sampled per request from a distribution.
+
+    All values are milliseconds. The 'delay' response setting accepts:
+      - a number, or {"fixed": ms}
+      - {"uniform": [min, max]}
+      - {"normal": {"mean": ms, "stddev": ms}}
+      - {"lognormal": {"median": ms, "sigma": shape}}
+      - a percentile table such as {"p50": 80, "p95": 300, "p99": 900}, interpolated linearly
+        between the given percentiles (from 0 ms at p0 up to the highest one)
+    Distributions may be capped with a "max" entry; samples are never negative.
+    """
+
+    __slots__ = ("_sampler", "max_ms", "spec")
+
+    def __init__(self, sampler: Callable[[], float], spec: Any, max_ms: float | None = None):
+        self._sampler = sampler
+        self.spec = spec
+        self.max_ms = max_ms
+
+    @classmethod
+    def from_config(cls, spec: Any) -> "Delay | None":
+        """
+        Builds a delay from a 'delay' response setting.
+
+        Args:
+            spec: The setting; None disables the delay.
+
+        Returns:
+            The Delay, or None when no delay is configured.
+
+        Raises:
+            ConfigError: If the setting is malformed.
+        """
+        if spec is None:
+            return None
+        if _is_number(spec):
+            return cls(_fixed(spec), spec)
+        if not isinstance(spec, dict) or not spec:
+            msg = f"Invalid delay {spec!r}: expected milliseconds or a distribution mapping"
+            raise ConfigError(msg)
+
+        settings = dict(spec)
+        max_ms = settings.pop("max", None)
+        if max_ms is not None and not _is_number(max_ms):
+            msg = f"Invalid delay max {max_ms!r}: expected milliseconds"
+            raise ConfigError(msg)
+
+        if settings and all(_PERCENTILE.match(str(key)) for key in settings):
+            return cls(_percentiles(settings), spec, max_ms)
+        if len(settings) != 1:  # e.g. only 'max', or a distribution mixed with percentiles
+            msg = f"Invalid delay {spec!r}: expected exactly one of {', '.join(_DISTRIBUTIONS)} or percentiles"
+            raise ConfigError(msg)
+        ((name, params),) = settings.items()
+        factory = _DISTRIBUTIONS.get(name)
+        if factory is None:
+            msg = f"Unknown delay distribution {name!r}: expected one of {', '.join(_DISTRIBUTIONS)} or percentiles"
+            raise ConfigError(msg)
+        return cls(factory(params), spec, max_ms)
+
+    def sample(self) -> float:
+        """Returns a delay in seconds."""
+        value = max(0.0, self._sampler())
+        if self.max_ms is not None:
+            value = min(value, self.max_ms)
+        return value / 1000
+
+
+def remaining_delay(environ: Mapping[str, Any], started: float) -> float:
+    """
+    Returns how many more seconds the response of a request must be held.
+
+    Args:
+        environ: The WSGI environ of the request, possibly holding DELAY_ENVIRON_KEY.
+        started: time.monotonic() when the request was received, so that the time spent
+            handling it counts towards the delay.
+    """
+    delay = environ.get(DELAY_ENVIRON_KEY)
+    if not delay:
+        return 0.0
+    return max(0.0, delay - (time.monotonic() - started))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool) and math.isfinite(value) and value >= 0
+
+
+def _require_numbers(name: str, params: Any, keys: tuple[str, ...]) -> list[Any]:
+    values = [params.get(key) for key in keys] if isinstance(params, dict) else [None]
+    if not all(_is_number(value) for value in values):
+        msg = f"Invalid {name} delay {params!r}: expected non-negative {', '.join(keys)}"
+        raise ConfigError(msg)
+    return values
+
+
+def _fixed(params: Any) -> Callable[[], float]:
+    if not _is_number(params):
+        msg = f"Invalid fixed delay {params!r}: expected milliseconds"
+        raise ConfigError(msg)
+    return lambda: params
+
+
+def _uniform(params: Any) -> Callable[[], float]:
+    bounds = params if isinstance(params, list) and all(map(_is_number, params)) else []
+    if len(bounds) != 2 or bounds[0] > bounds[1]:  # noqa: PLR2004
+        msg = f"Invalid uniform delay {params!r}: expected [min, max]"
+        raise ConfigError(msg)
+    low, high = bounds
+    return lambda: random.uniform(low, high)  # noqa: S311
+
+
+def _normal(params: Any) -> Callable[[], float]:
+    mean, stddev = _require_numbers("normal", params, ("mean", "stddev"))
+    return lambda: random.gauss(mean, stddev)
+
+
+def _lognormal(params: Any) -> Callable[[], float]:
+    median, sigma = _require_numbers("lognormal", params, ("median", "sigma"))
+    if median <= 0:
+        msg = f"Invalid lognormal delay {params!r}: the median must be positive"
+        raise ConfigError(msg)
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+def _percentiles(table: dict[str, Any]) -> Callable[[], float]:
+    points = []
+    for key, value in table.items():
+        match = _PERCENTILE.match(str(key))
+        if match is None:
+            msg = f"Invalid delay percentile {key!r}: expected a key from p0 to p100, such as 'p99'"
+            raise ConfigError(msg)
+        points.append((float(match.group(1)) / 100, value))
+    points.sort()
+    values = [value for _, value in points]
+    if not all(map(_is_number, values)) or values != sorted(values) or points[-1][0] > 1:
+        msg = f"Invalid delay percentiles {table!r}: expected non-decreasing milliseconds for p0 to p100"
+        raise ConfigError(msg)
+    if points[0][0] > 0:
+        points.insert(0, (0.0, 0.0))
+    if points[-1][0] < 1:
+        points.append((1.0, points[-1][1]))
+    quantiles = [quantile for quantile, _ in points]
+
+    def sample() -> float:
+        u = random.random()  # noqa: S311
+        i = min(bisect.bisect_right(quantiles, u), len(points) - 1)
+        (q0, v0), (q1, v1) = points[i - 1], points[i]
+        return v0 + (v1 - v0) * (u - q0) / (q1 - q0) if q1 > q0 else v1
+
+    return sample
+
+
+_DISTRIBUTIONS: dict[str, Callable[[Any], Callable[[], float]]] = {
+    "fixed": _fixed,
+    "uniform": _uniform,
+    "normal": _normal,
+    "lognormal": _lognormal,
+}
@@ -0,0 +1,167 @@
+# src/pymock/server/matchers.py
+import logging
+import re
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from jsonpath_ng import parse as parse_jsonpath
+
+logger = logging.getLogger(__name__)
+
+Matcher = Callable[[Mapping[str, Any]], bool]
+
+_KEY = r"[A-Za-z_@][A-Za-z0-9_@-]*"
+_SIMPLE_PATH = re.compile(rf"^(?:\$(?:\.{_KEY})*|{_KEY}(?:\.{_KEY})*)$")
+
+
+def compile_matcher(rules: list, fallback: Callable[[Any], Matcher]) -> Matcher:
+    """
+    Compiles the rules of a scenario into a single callable evaluated against request data.
+
+    Every rule must match. Rules whose operator cannot be compiled are delegated to the
+    callable returned by fallback(rule), which interprets them the way Scenario.evaluate does.
+    Only operators whose semantics are unambiguous are compiled: the regex operators (anchoring,
+    non-string values) and VALID_JSON_SCHEMA (draft selection, format checks) are always
+    interpreted, so they keep exactly the behaviour of ruleenginex.
+
+    Args:
+        rules: The scenario's rule dicts.
+        fallback: Factory returning an interpreted matcher for a single rule.
+
+    Returns:
+        A callable taking the request data and returning whether all rules match.
+    """
+    checks = []
+    for rule in rules:
+        check = compile_rule(rule)
+        if check is None:
+            logger.debug("Rule %s is not compilable; it will be interpreted.", rule)
+            check = fallback(rule)
+        checks.append(check)
+
+    if not checks:
+        return _always
+    if len(checks) == 1:
+        return checks[0]
+
+    def matcher(request_data: Mapping[str, Any]) -> bool:
+        for check in checks:
+            if not check(request_data):
+                return False
+        return True
+
+    return matcher
+
+
+def compile_rule(rule: Any) -> Matcher | None:
+    """
+    Compiles a single target/prop/op/value rule, or returns None if it cannot be compiled.
+    """
+    if not isinstance(rule, dict) or not isinstance(rule.get("target"), str):
+        return None
+    predicate_factory = _OPERATORS.get(str(rule.get("op", "")).upper())
+    if predicate_factory is None:
+        return None
+    try:
+        accessor = compile_accessor(rule.get("prop") or "")
+        predicate = predicate_factory(rule.get("value"))
+    except Exception as e:  # invalid paths, patterns or schemas are left to the interpreter
+        logger.debug("Failed to compile rule %s: %s", rule, e)
+        return None
+
+    target = rule["target"]
+
+    def check(request_data: Mapping[str, Any]) -> bool:
+        return predicate(accessor(request_data.get(target)))
+
+    return check
+
+
+def compile_accessor(prop: str) -> Callable[[Any], Any]:
+    """
+    Compiles a dot-notation or JSONPath prop into a callable reading it from a target value.
+
+    Simple paths become direct dict lookups; other JSONPaths are parsed once. Missing values
+    read as None, a single match as the value itself and several matches as a list.
+    """
+    path = simple_path(prop)
+    if path is None:
+        expression = _parse_jsonpath(prop if prop.startswith("$") else f"$.{prop}")
+
+        def find(value: Any) -> Any:
+            if value is None:
+                return None
+            matches = [match.value for match in expression.find(value)]
+            if not matches:
+                return None
+            return matches[0] if len(matches) == 1 else matches
+
+        return find
+
+    if not path:
+        return _identity
+    if len(path) == 1:
+        (key,) = path
+        return lambda value: value.get(key) if isinstance(value, Mapping) else None
+
+    def lookup(value: Any) -> Any:
+        for key in path:
+            if not isinstance(value, Mapping):
+                return None
+            value = value.get(key)
+        return value
+
+    return lookup
+
+
+def simple_path(prop: str) -> tuple[str, ...] | None:
+    """
+    Splits a dot-notation or plain '$.a.b' JSONPath prop into its keys.
+
+    Returns:
+        The keys to look up in order (empty for the whole target), or None if the prop uses
+        any other JSONPath feature.
+    """
+    if not prop:
+        return ()
+    if _SIMPLE_PATH.match(prop) is None:
+        return None
+    return tuple(key for key in prop.split(".") if key != "$")
+
+
+@lru_cache(maxsize=1024)
+def _parse_jsonpath(prop: str):
+    return parse_jsonpath(prop)
+
+
+def _always(_request_data: Mapping[str, Any]) -> bool:
+    return True
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _equals(expected: Any) -> Callable[[Any], bool]:
+    return lambda actual: actual == expected
+
+
+def _null(_expected: Any) -> Callable[[Any], bool]:
+    return lambda actual: actual is None
+
+
+def _empty_array(_expected: Any) -> Callable[[Any], bool]:
+    return lambda actual: isinstance(actual, list) and not actual
+
+
+def _array_includes(expected: Any) -> Callable[[Any], bool]:
+    return lambda actual: isinstance(actual, list) and expected in actual
+
+
+_OPERATORS: dict[str, Callable[[Any], Callable[[Any], bool]]] = {
+    "EQUALS": _equals,
+    "NULL": _null,
+    "EMPTY_ARRAY": _empty_array,
+    "ARRAY_INCLUDES": _array_includes,
+}
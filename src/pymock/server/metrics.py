@@ -0,0 +1,184 @@
+# src/pymock/server/metrics.py
+import logging
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Parts of a request timed separately in pymock_stage_duration_seconds.
+STAGES = ("validation", "rules", "store", "jinja", "template", "serialization")
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (type, help) of each exposed metric.
+_METRICS = {
+    "pymock_requests_total": ("counter", "Requests answered by a scenario, per endpoint and scenario."),
+    "pymock_unmatched_requests_total": ("counter", "Requests to an endpoint that matched none of its scenarios."),
+    "pymock_rejected_requests_total": (
+        "counter",
+        "Requests to an endpoint rejected by its request schema or body size limit.",
+    ),
+    "pymock_request_duration_seconds": ("histogram", "Time spent handling requests, excluding injected delays."),
+    "pymock_stage_duration_seconds": ("histogram", "Time spent in each stage of handling requests."),
+}
+
+# A metric name and its labels, as a tuple of (label, value) pairs.
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+
+
+class _Shard:
+    """The metrics recorded by one thread, which only that thread writes to."""
+
+    __slots__ = ("counters", "histograms", "thread")
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = thread
+        self.counters: dict[MetricKey, int] = {}
+        self.histograms: dict[MetricKey, _Histogram] = {}
+
+    def merge_into(self, counters: dict[MetricKey, int], histograms: dict[MetricKey, _Histogram]) -> None:
+        for key, value in self.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, histogram in self.histograms.copy().items():
+            merged = histograms.get(key)
+            if merged is None:
+                merged = histograms[key] = _Histogram()
+            merged.buckets = [a + b for a, b in zip(merged.buckets, histogram.buckets, strict=True)]
+            merged.sum += histogram.sum
+
+
+class Metrics:
+    """
+    Counters and latency histograms, exposed in the Prometheus text format.
+
+    Every thread records into its own shard, so recording takes no lock and threads never
+    contend on a counter: the shards are only merged when the metrics are scraped. The shards
+    of finished threads are folded into one, so servers starting a thread per connection do
+    not accumulate them.
+
+    Metrics are kept per process: with several workers, a scrape reports the worker that
+    answered it.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._retired = _Shard(threading.current_thread())
+        self._lock = threading.Lock()
+
+    def increment(self, key: MetricKey) -> None:
+        """Adds one to a counter."""
+        counters = self._shard().counters
+        counters[key] = counters.get(key, 0) + 1
+
+    def observe(self, key: MetricKey, seconds: float) -> None:
+        """Records a duration in a histogram."""
+        histograms = self._shard().histograms
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram()
+        histogram.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram.sum += seconds
+
+    def collect(self) -> tuple[dict[MetricKey, int], dict[MetricKey, _Histogram]]:
+        """Returns the counters and histograms of all threads, merged."""
+        counters: dict[MetricKey, int] = {}
+        histograms: dict[MetricKey, _Histogram] = {}
+        with self._lock:
+            self._retire_finished()
+            for shard in [self._retired, *self._shards]:
+                shard.merge_into(counters, histograms)
+        return counters, histograms
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        counters, histograms = self.collect()
+        lines = []
+        for name, (metric_type, description) in _METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == "counter":
+                for (_, labels), value in sorted(item for item in counters.items() if item[0][0] == name):
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            for (_, labels), histogram in sorted(
+                (item for item in histograms.items() if item[0][0] == name), key=lambda item: item[0]
+            ):
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram.buckets, strict=True):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels((*labels, ('le', str(bound))))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._retire_finished()
+                self._shards.append(shard)
+            return shard
+
+    def _retire_finished(self) -> None:
+        """Folds the shards of finished threads, which are never written again, into one."""
+        finished = [shard for shard in self._shards if not shard.thread.is_alive()]
+        if not finished:
+            return
+        for shard in finished:
+            shard.merge_into(self._retired.counters, self._retired.histograms)
+        self._shards = [shard for shard in self._shards if shard.thread.is_alive()]
+
+
+class EndpointMetrics:
+    """The metric keys of one endpoint, built once when it is compiled."""
+
+    __slots__ = ("duration", "invalid", "metrics", "scenarios", "stages", "unmatched")
+
+    def __init__(self, metrics: Metrics, method: str, path: str, scenario_names: Iterable[str]):
+        labels = (("method", method), ("path", path))
+        self.metrics = metrics
+        self.scenarios = [("pymock_requests_total", (*labels, ("scenario", name))) for name in scenario_names]
+        self.unmatched = ("pymock_unmatched_requests_total", labels)
+        self.invalid = ("pymock_rejected_requests_total", labels)
+        self.duration = ("pymock_request_duration_seconds", labels)
+        self.stages = {stage: ("pymock_stage_duration_seconds", (*labels, ("stage", stage))) for stage in STAGES}
+
+    def matched(self, position: int) -> None:
+        """Counts a request answered by the scenario at position."""
+        self.metrics.increment(self.scenarios[position])
+
+    def missed(self) -> None:
+        """Counts a request matching none of the scenarios."""
+        self.metrics.increment(self.unmatched)
+
+    def rejected(self) -> None:
+        """Counts a request rejected by the endpoint's request schema or body size limit."""
+        self.metrics.increment(self.invalid)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.metrics.observe(self.stages[stage], seconds)
+
+    def observe_request(self, seconds: float) -> None:
+        self.metrics.observe(self.duration, seconds)
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,277 @@
+# src/pymock/server/prefork.py
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+from werkzeug.wsgi import ClosingIterator
+
+from pymock.server.exceptions import ConfigError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKLOG = 2048
+DEFAULT_KEEPALIVE = 5.0
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
+
+_POLL_INTERVAL = 0.2
+
+
+class PreforkServer:
+    """
+    Serves a WSGI application from several pre-forked worker processes.
+
+    The application is created once in the master process before forking, so workers share its
+    memory copy-on-write. Workers accept connections from one listening socket inherited from
+    the master or, with reuse_port, from their own SO_REUSEPORT sockets balanced by the kernel.
+    Each worker runs a threaded server.
+
+    The master restarts workers that exit, for instance after serving max_requests requests.
+    SIGHUP replaces all workers gracefully; the new workers are forked from the same, already
+    built application, so configuration and endpoints are not reloaded. SIGTERM and SIGINT stop
+    the server, letting in-flight requests finish within graceful_timeout seconds. Workers also
+    stop by themselves if the master dies.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        host: str,
+        port: int,
+        *,
+        workers: int = 2,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        keepalive: float = DEFAULT_KEEPALIVE,
+        backlog: int = DEFAULT_BACKLOG,
+        reuse_port: bool = False,
+        graceful_timeout: float = DEFAULT_GRACEFUL_TIMEOUT,
+    ):
+        if not hasattr(os, "fork"):
+            msg = "Multiple workers require a platform supporting os.fork"
+            raise ConfigError(msg)
+        if workers < 1:
+            msg = f"Invalid number of workers: {workers}"
+            raise ConfigError(msg)
+        if reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+            msg = "reuse_port requires a platform supporting SO_REUSEPORT"
+            raise ConfigError(msg)
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.keepalive = keepalive
+        self.backlog = backlog
+        self.reuse_port = reuse_port
+        self.graceful_timeout = graceful_timeout
+
+        self._socket: socket.socket | None = None
+        self._children: dict[int, int] = {}  # pid -> generation
+        self._generation = 0
+        self._stopping = False
+        self._restart_requested = False
+
+    def bind(self) -> None:
+        """
+        Binds the listening socket, resolving port 0 to the port actually used.
+
+        With reuse_port the master only reserves the port; workers bind and listen themselves.
+        """
+        if self._socket is not None:
+            return
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.host, self.port))
+        if not self.reuse_port:
+            sock.listen(self.backlog)
+        self.port = sock.getsockname()[1]
+        self._socket = sock
+        logger.info(
+            "Listening on %s:%d (backlog=%d, reuse_port=%s)", self.host, self.port, self.backlog, self.reuse_port
+        )
+
+    def run(self) -> None:
+        """Starts the workers and supervises them until the server is stopped."""
+        self.bind()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+
+        logger.info("Starting %d workers", self.workers)
+        try:
+            while not self._stopping:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._restart_workers()
+                self._reap_workers()
+                self._spawn_missing_workers()
+                time.sleep(_POLL_INTERVAL)
+        finally:
+            self._stop_workers()
+            if self._socket is not None:
+                self._socket.close()
+
+    def _handle_stop(self, _signum: int, _frame: Any) -> None:
+        self._stopping = True
+
+    def _handle_restart(self, _signum: int, _frame: Any) -> None:
+        self._restart_requested = True
+
+    def _spawn_missing_workers(self) -> None:
+        current = [pid for pid, generation in self._children.items() if generation == self._generation]
+        for _ in range(self.workers - len(current)):
+            self._spawn_worker()
+
+    def _spawn_worker(self) -> None:
+        master_pid = os.getpid()
+        pid = os.fork()
+        if pid == 0:  # no cov
+            exit_code = 0
+            try:
+                self._run_worker(master_pid)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self._children[pid] = self._generation
+        logger.info("Started worker %d", pid)
+
+    def _reap_workers(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            if self._children.pop(pid, None) is not None:
+                logger.info("Worker %d exited with status %d", pid, os.waitstatus_to_exitcode(status))
+
+    def _restart_workers(self) -> None:
+        """Starts a new generation of workers, then gracefully stops the previous one."""
+        old_workers = list(self._children)
+        self._generation += 1
+        logger.info("Restarting workers (generation %d)", self._generation)
+        self._spawn_missing_workers()
+        for pid in old_workers:
+            _kill(pid, signal.SIGTERM)
+
+    def _stop_workers(self) -> None:
+        for pid in self._children:
+            _kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap_workers()
+            time.sleep(_POLL_INTERVAL / 4)
+        for pid in self._children:
+            logger.warning("Worker %d did not stop in time; killing it", pid)
+            _kill(pid, signal.SIGKILL)
+        self._reap_workers()
+
+    def _run_worker(self, master_pid: int) -> None:  # no cov
+        """Worker process body: serves requests until stopped, recycled or orphaned."""
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+        sock = self._socket
+        assert sock is not None  # noqa: S101
+        if self.reuse_port:
+            sock = socket.socket(sock.family, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind((self.host, self.port))
+            sock.listen(self.backlog)
+
+        max_requests = self.max_requests
+        if max_requests and self.max_requests_jitter:
+            max_requests += random.randint(0, self.max_requests_jitter)  # noqa: S311
+
+        stop = threading.Event()
+        tracker = _RequestTracker(self.app, max_requests, stop)
+        server = make_server(
+            self.host,
+            self.port,
+            tracker,
+            threaded=True,
+            request_handler=_request_handler(self.keepalive),
+            fd=sock.fileno(),
+        )
+        # Workers sharing a socket are all woken by a new connection: the ones that lose the
+        # race must get an error from accept, rather than block and miss their shutdown.
+        server.socket.setblocking(False)
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: stop.set())
+        threading.Thread(target=_shutdown_when_set, args=(server, stop, master_pid), daemon=True).start()
+
+        server.serve_forever(poll_interval=_POLL_INTERVAL)
+        tracker.wait_idle(self.graceful_timeout)
+        logger.info("Worker %d stopped after %d requests", os.getpid(), tracker.count)
+
+
+class _RequestTracker:
+    """WSGI middleware counting served and in-flight requests of a worker."""
+
+    def __init__(self, app: Callable, max_requests: int, stop: threading.Event):
+        self.app = app
+        self.max_requests = max_requests
+        self.stop = stop
+        self.count = 0
+        self.active = 0
+        self._lock = threading.Condition()
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        with self._lock:
+            self.count += 1
+            self.active += 1
+            if self.max_requests and self.count >= self.max_requests:
+                self.stop.set()
+        try:
+            return ClosingIterator(self.app(environ, start_response), self._finished)
+        except BaseException:
+            self._finished()
+            raise
+
+    def _finished(self) -> None:
+        with self._lock:
+            self.active -= 1
+            self._lock.notify_all()
+
+    def wait_idle(self, timeout: float) -> None:
+        with self._lock:
+            self._lock.wait_for(lambda: self.active == 0, timeout)
+
+
+def _request_handler(keepalive: float) -> type[WSGIRequestHandler]:
+    """Returns a request handler closing idle keep-alive connections after keepalive seconds."""
+    attributes: dict[str, Any] = {"timeout": keepalive or None}
+    attributes["protocol_version"] = "HTTP/1.1" if keepalive else "HTTP/1.0"
+    return type("PreforkRequestHandler", (WSGIRequestHandler,), attributes)
+
+
+def _shutdown_when_set(server: BaseWSGIServer, stop: threading.Event, master_pid: int) -> None:
+    """Shuts the server down once stop is set or the master process is gone."""
+    while not stop.wait(_POLL_INTERVAL):
+        if os.getppid() != master_pid:
+            logger.warning("Master %d is gone; stopping worker %d", master_pid, os.getpid())
+            stop.set()
+    server.shutdown()
+
+
+def _kill(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
@@ -0,0 +1,151 @@
+# src/pymock/server/proxy.py
+import http.client
+import logging
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlsplit
+
+from flask import Response
+from werkzeug.wrappers import Request as WerkzeugRequest
+
+from pymock.server.capture import CapturedResponse, CaptureKey, CaptureStore, CaptureWriter
+from pymock.server.exceptions import ConfigError
+from pymock.server.response import json_response
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("off", "record", "replay")
+DEFAULT_CAPTURE_FILE = "pymock.capture"
+DEFAULT_UPSTREAM_TIMEOUT = 30.0
+
+# Serves a request no scenario matched, or returns None to answer with the usual 404.
+Fallback = Callable[[WerkzeugRequest], Response | None]
+
+# Headers describing a single connection, which a proxy must not forward (RFC 9110, 7.6.1).
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+
+class RecordingProxy:
+    """
+    Forwards the requests no scenario matched to an upstream server, and records each request
+    and response pair in a capture file for replay.
+
+    Redirects are not followed, so clients see the upstream's responses as they are. Responses
+    are recorded whatever their status; requests the upstream could not be reached for get a
+    502 and are not recorded.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        writer: CaptureWriter,
+        key: CaptureKey,
+        *,
+        timeout: float = DEFAULT_UPSTREAM_TIMEOUT,
+    ):
+        parts = urlsplit(upstream)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            msg = f"Invalid upstream URL {upstream!r}: expected http(s)://host[:port][/prefix]"
+            raise ConfigError(msg)
+        self.upstream = upstream
+        self.writer = writer
+        self.key = key
+        self.timeout = timeout
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+
+    def __call__(self, source: WerkzeugRequest) -> Response:
+        body = source.get_data()
+        path = source.full_path if source.query_string else source.path
+        target = f"{self._prefix}{path}"
+        headers = {name: value for name, value in source.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS}
+        headers.pop("Host", None)
+
+        connection = self._connection_class(self._host, self._port, timeout=self.timeout)
+        try:
+            connection.request(source.method, target, body=body or None, headers=headers)
+            upstream_response = connection.getresponse()
+            response_body = upstream_response.read()
+            status = upstream_response.status
+            response_headers = [
+                (name, value)
+                for name, value in upstream_response.getheaders()
+                if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != "content-length"
+            ]
+        except (OSError, http.client.HTTPException) as e:
+            logger.warning("Upstream %s failed for %s %s: %s", self.upstream, source.method, target, e)
+            return json_response({"error": f"Upstream request failed: {e}"}, 502)
+        finally:
+            connection.close()
+
+        captured = CapturedResponse(source.method, path, status, response_headers, response_body)
+        self.writer.append(
+            self.key(source.method, source.path, source.query_string.decode("latin-1"), source.headers, body),
+            captured,
+        )
+        logger.debug("Recorded %s %s -> %d", source.method, target, status)
+        return _to_response(captured)
+
+
+class Replayer:
+    """Answers the requests no scenario matched with the responses recorded for them."""
+
+    def __init__(self, store: CaptureStore, key: CaptureKey):
+        self.store = store
+        self.key = key
+
+    def __call__(self, source: WerkzeugRequest) -> Response | None:
+        key = self.key(
+            source.method, source.path, source.query_string.decode("latin-1"), source.headers, source.get_data()
+        )
+        captured = self.store.get(key)
+        if captured is None:
+            logger.debug("No recording for %s %s", source.method, source.full_path)
+            return None
+        return _to_response(captured)
+
+
+def create_capture_fallback(capture_conf: dict[str, Any]) -> Fallback | None:
+    """
+    Builds the fallback for the 'capture' config section, or None when capture is off.
+
+    Raises:
+        ConfigError: If the section is inconsistent or the capture file cannot be used.
+    """
+    mode = capture_conf.get("mode", "off")
+    if mode == "off":
+        return None
+    if mode not in CAPTURE_MODES:
+        msg = f"Unknown capture mode {mode!r}: expected one of {', '.join(CAPTURE_MODES)}"
+        raise ConfigError(msg)
+
+    path = capture_conf.get("file", DEFAULT_CAPTURE_FILE)
+    key = CaptureKey(capture_conf.get("key_headers", ()), match_body=capture_conf.get("match_body", True))
+    if mode == "replay":
+        return Replayer(CaptureStore(path), key)
+
+    upstream = capture_conf.get("upstream")
+    if not upstream:
+        msg = "Capture mode 'record' requires an upstream URL"
+        raise ConfigError(msg)
+    logger.info("Recording unmatched requests from %s into '%s'", upstream, path)
+    return RecordingProxy(
+        upstream, CaptureWriter(path), key, timeout=capture_conf.get("timeout", DEFAULT_UPSTREAM_TIMEOUT)
+    )
+
+
+def _to_response(captured: CapturedResponse) -> Response:
+    return Response(captured.body, status=captured.status, headers=captured.headers)
@@ -0,0 +1,202 @@
+# src/pymock/server/reload.py
+import logging
+import threading
+import time
+from typing import Any
+
+from pymock.config.loader import ConfigLoader
+from pymock.config.snapshot import EndpointFileResult
+from pymock.server.cache import ResponseCache
+from pymock.server.create_endpoint_blueprint import create_endpoint_routes
+from pymock.server.metrics import Metrics
+from pymock.server.proxy import Fallback
+from pymock.server.router import create_route_table
+from pymock.server.routes import EndpointRoute, LiveRouteTable, RouteMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_INTERVAL = 1.0
+# Editors often write a file in several steps; changes arriving this close together are
+# reloaded at once.
+_DEBOUNCE_INTERVAL = 0.1
+
+
+class EndpointReloader:
+    """
+    Keeps the served endpoints in sync with the endpoint files, without restarting the server.
+
+    Changes are detected with inotify (through watchdog, when installed) or else by polling the
+    files' modification times every interval seconds. Only files whose content changed are
+    parsed and compiled again; the routes of the other files are reused. The new route table
+    then replaces the served one at once, so requests already started finish on the previous
+    version of their endpoint. A file that fails to parse or compile keeps its previous routes.
+
+    Only endpoint files are watched: changes to the main config still require a restart.
+    """
+
+    def __init__(
+        self,
+        endpoint_dirs: list[str],
+        response_cache: ResponseCache,
+        *,
+        loader_conf: dict[str, Any] | None = None,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        router: str = "werkzeug",
+        fallback: Fallback | None = None,
+        metrics: Metrics | None = None,
+    ):
+        self.endpoint_dirs = list(endpoint_dirs)
+        self.response_cache = response_cache
+        self.loader_conf = loader_conf or {}
+        self.interval = interval
+        self.router = router
+        self.fallback = fallback
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        self._files: dict[str, EndpointFileResult] = {}
+        self._routes: dict[str, list[EndpointRoute]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._observer: Any = None
+
+        self._update()
+        self.live_routes = LiveRouteTable(self._build_table())
+
+    def reload(self) -> bool:
+        """
+        Re-reads the endpoint files that changed and swaps in a new route table if needed.
+
+        Returns:
+            True if the served routes changed.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            updated = self._update()
+            if not updated:
+                return False
+            self.live_routes.swap(self._build_table())
+            cleared = self.response_cache.clear()
+        logger.info(
+            "Reloaded %d endpoint files in %.1f ms (%d cached responses cleared)",
+            updated,
+            (time.perf_counter() - started) * 1000,
+            cleared,
+        )
+        return True
+
+    def _update(self) -> int:
+        """Scans the endpoint files, recompiles the changed ones, and returns how many changed."""
+        results = ConfigLoader.scan_endpoint_files(
+            self.endpoint_dirs, self.loader_conf, previous=list(self._files.values())
+        )
+        changed = [result for result in results if _has_changed(self._files.get(result.path), result)]
+        removed = self._files.keys() - {result.path for result in results}
+        self._files = {result.path: result for result in results}
+
+        for path in removed:
+            self._routes.pop(path, None)
+            logger.info("Endpoint file '%s' removed", path)
+        for result in changed:
+            if result.error is not None:
+                logger.error("Failed to parse endpoint file '%s': %s", result.path, result.error)
+        self._routes.update(self._compile([result for result in changed if result.error is None]))
+        return len(changed) + len(removed)
+
+    def start(self) -> None:
+        """Starts watching the endpoint directories from a background thread."""
+        if self._thread is not None:
+            return
+        self._observer = self._start_observer()
+        mode = "inotify" if self._observer is not None else f"polling every {self.interval:g}s"
+        logger.info("Watching %s for endpoint changes (%s)", ", ".join(self.endpoint_dirs), mode)
+        self._thread = threading.Thread(target=self._watch, name="pymock-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops watching; the current routes stay in place."""
+        self._stopping = True
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stopping:
+            self._changed.wait(None if self._observer is not None else self.interval)
+            if self._stopping:
+                return
+            if self._changed.is_set():
+                time.sleep(_DEBOUNCE_INTERVAL)
+                self._changed.clear()
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Failed to reload endpoint files")
+
+    def _start_observer(self) -> Any:
+        """Subscribes to file system events with watchdog, an optional dependency."""
+        try:
+            from watchdog.events import FileSystemEventHandler  # noqa: PLC0415
+            from watchdog.observers import Observer  # noqa: PLC0415
+        except ImportError:
+            return None
+
+        changed = self._changed
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, _event: Any) -> None:
+                changed.set()
+
+        observer = Observer()
+        observer.daemon = True
+        try:
+            for dir_path in self.endpoint_dirs:
+                observer.schedule(_Handler(), dir_path, recursive=True)
+            observer.start()
+        except OSError as e:
+            logger.warning("Cannot watch the endpoint directories (%s); polling instead", e)
+            return None
+        return observer
+
+    def _compile(self, results: list[EndpointFileResult]) -> dict[str, list[EndpointRoute]]:
+        """
+        Compiles the endpoints of several files in one go, so they share one template
+        environment, and splits the routes back by file.
+        """
+        if not results:
+            return {}
+        try:
+            routes = create_endpoint_routes(
+                [endpoint for result in results for endpoint in result.endpoints],
+                self.response_cache,
+                self.fallback,
+                self.metrics,
+            )
+        except Exception:
+            if len(results) == 1:
+                logger.exception("Failed to compile endpoint file '%s'; keeping its previous version", results[0].path)
+                return {}
+            # Compile the files one by one to keep the valid ones.
+            return {path: file_routes for result in results for path, file_routes in self._compile([result]).items()}
+
+        by_file: dict[str, list[EndpointRoute]] = {}
+        position = 0
+        for result in results:
+            by_file[result.path] = routes[position : position + len(result.endpoints)]
+            position += len(result.endpoints)
+        return by_file
+
+    def _build_table(self) -> RouteMatcher:
+        # Files are scanned in a deterministic order, which decides between duplicate routes.
+        return create_route_table([route for path in self._files for route in self._routes.get(path, [])], self.router)
+
+
+def _has_changed(previous: EndpointFileResult | None, result: EndpointFileResult) -> bool:
+    if previous is None:
+        return True
+    return (previous.digest, previous.error) != (result.digest, result.error)
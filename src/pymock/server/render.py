@@ -0,0 +1,123 @@
+# src/pymock/server/render.py
+import ast
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPlan:
+    """
+    Precompiled rendering plan for the 'data' portion of a scenario response.
+
+    The data is walked once, including nested dicts and lists. Every string leaf holding a
+    Jinja2 expression is compiled into a Template, and only the containers on the path to
+    such a leaf are copied at render time. Static subtrees are shared between requests.
+    """
+
+    __slots__ = ("_root", "data")
+
+    def __init__(self, data: Any, root: Any):
+        self.data = data
+        self._root = root
+
+    @classmethod
+    def compile(
+        cls, data: Any, jinja_env: Environment, template_cache: dict[str, Template] | None = None
+    ) -> "RenderPlan":
+        """
+        Builds a render plan for the given data.
+
+        Args:
+            data: The scenario response data (any JSON-like value).
+            jinja_env: Environment used to compile the Jinja2 expressions.
+            template_cache: Optional mapping of source -> Template shared between plans,
+                so identical expressions are only compiled once.
+
+        Returns:
+            The compiled RenderPlan.
+        """
+        if template_cache is None:
+            template_cache = {}
+        root = _compile_node(data, jinja_env, template_cache)
+        logger.debug("Compiled render plan (dynamic=%s)", root is not None)
+        return cls(data, root)
+
+    @property
+    def is_static(self) -> bool:
+        """True when the data holds no Jinja2 expression and can be returned as-is."""
+        return self._root is None
+
+    def render(self, context: dict[str, Any]) -> Any:
+        """
+        Renders the dynamic leaves with the given context on top of the static skeleton.
+
+        Args:
+            context: Per-request variables passed to every template (e.g. 'request').
+
+        Returns:
+            The rendered data. The original data is never mutated.
+        """
+        if self._root is None:
+            return self.data
+        return _render_node(self._root, context)
+
+
+def _compile_node(value: Any, jinja_env: Environment, template_cache: dict[str, Template]) -> Any:
+    """
+    Returns a plan node for the value, or None if the value is fully static.
+
+    A node is either a Template (dynamic leaf) or a tuple of (container, {key: child_node})
+    holding only the children that need rendering.
+    """
+    if isinstance(value, str):
+        if "{{" not in value:
+            return None
+        template = template_cache.get(value)
+        if template is None:
+            template = jinja_env.from_string(value)
+            template_cache[value] = template
+        return template
+
+    items: Iterable[tuple[Any, Any]]
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return None
+
+    children = {}
+    for key, child in items:
+        node = _compile_node(child, jinja_env, template_cache)
+        if node is not None:
+            children[key] = node
+    if not children:
+        return None
+    return value, children
+
+
+def _render_node(node: Any, context: dict[str, Any]) -> Any:
+    if isinstance(node, Template):
+        return _parse_rendered_value(node.render(context))
+
+    container, children = node
+    rendered = container.copy()
+    for key, child in children.items():
+        rendered[key] = _render_node(child, context)
+    return rendered
+
+
+def _parse_rendered_value(rendered_value: str) -> Any:
+    """
+    Converts a rendered value to a list if it looks like one, otherwise returns it unchanged.
+    """
+    if rendered_value.startswith("[") and rendered_value.endswith("]"):
+        try:
+            return ast.literal_eval(rendered_value)
+        except (ValueError, SyntaxError) as e:
+            logger.debug("Failed to parse rendered value as a list: %s", e)
+    return rendered_value
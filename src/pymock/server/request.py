@@ -1,48 +1,216 @@
 # src/pymock/server/request.py
 import logging
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
 from flask import request
 
+if TYPE_CHECKING:
+    from pymock.server.body import BodyPolicy
+
 logger = logging.getLogger(__name__)
 
+REQUEST_TARGETS = ("method", "url", "path", "headers", "params", "body", "cookies", "remote_addr", "content_type")
+
+# Targets backed by a multi-dict that can be captured key by key.
+_KEYED_TARGETS = frozenset({"headers", "params", "cookies"})
+# Targets whose top-level keys are planned: the keyed ones, and JSON bodies, which are parsed
+# for those keys only if the endpoint streams its bodies.
+_PLANNED_TARGETS = _KEYED_TARGETS | {"body"}
+
+_TOP_LEVEL_KEY = re.compile(r"^(?:\$\.)?([A-Za-z0-9_@-]+)(?:[.\[]|$)|^\$\[['\"]([^'\"]+)['\"]\]")
+
 
 class Request:
-    """Extracts and stores details from an incoming Flask request."""
-
-    def __init__(self):
-        self.method = request.method
-        self.url = request.url
-        self.path = request.path
-        self.headers = dict(request.headers)
-        self.params = dict(request.args)
-        self.body = self._get_body()
-        self.cookies = dict(request.cookies)
-        self.remote_addr = request.remote_addr
-        self.content_type = request.content_type
-        logger.debug("Captured Request: method=%s, path=%s, query_params=%s", self.method, self.path, self.params)
+    """
+    Extracts details from an incoming Flask or werkzeug request, each on first access.
+
+    Given a BodyPolicy that streams, JSON bodies captured for a set of keys are parsed from the
+    input stream for those keys only.
+    """
+
+    def __init__(self, source: Any = None, body_policy: "BodyPolicy | None" = None):
+        self._source = source if source is not None else request
+        self._body_policy = body_policy
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Captured Request: method=%s, path=%s", self.method, self.path)
+
+    @cached_property
+    def method(self) -> str:
+        return self._source.method
+
+    @cached_property
+    def url(self) -> str:
+        return self._source.url
+
+    @cached_property
+    def path(self) -> str:
+        return self._source.path
+
+    @cached_property
+    def headers(self) -> dict[str, str]:
+        return dict(self._source.headers)
+
+    @cached_property
+    def params(self) -> dict[str, str]:
+        return dict(self._source.args)
+
+    @cached_property
+    def body(self) -> Any:
+        return self._get_body()
+
+    @cached_property
+    def cookies(self) -> dict[str, str]:
+        return dict(self._source.cookies)
+
+    @cached_property
+    def remote_addr(self) -> str | None:
+        return self._source.remote_addr
+
+    @cached_property
+    def content_type(self) -> str | None:
+        return self._source.content_type
 
     def _get_body(self):
-        if request.is_json:
-            return request.get_json()
-        elif request.form:
-            return dict(request.form)
-        elif request.data:
-            return request.data.decode("utf-8")
+        source = self._source
+        if source.is_json:
+            return source.get_json()
+        elif source.form:
+            return dict(source.form)
+        elif source.data:
+            return source.data.decode("utf-8")
         return None
 
-    def to_dict(self):
-        data = {
-            "method": self.method,
-            "url": self.url,
-            "path": self.path,
-            "headers": self.headers,
-            "params": self.params,
-            "body": self.body,
-            "cookies": self.cookies,
-            "remote_addr": self.remote_addr,
-            "content_type": self.content_type,
-        }
-
-        logger.debug("Request.to_dict => %s", data)
+    def capture(self, target: str, keys: frozenset[str] | None = None) -> Any:
+        """
+        Returns a single request target, optionally restricted to the given top-level keys.
+
+        Args:
+            target: One of REQUEST_TARGETS.
+            keys: For headers, params and cookies, the only keys to copy; for a streamed JSON
+                body, the only top-level keys to parse. None captures the whole target.
+
+        Returns:
+            The captured value, shaped like the matching entry of to_dict().
+        """
+        if target == "body" and keys is not None and self._streams_body():
+            return self._body_policy.read_keys(self._source.stream, keys)  # type: ignore[union-attr]
+        if keys is None or target not in _KEYED_TARGETS:
+            return getattr(self, target)
+        if target == "headers":
+            headers = self._source.headers
+            # dict(headers) exposes names title-cased, so only those spellings can match.
+            return {key: headers[key] for key in keys if key == key.title() and key in headers}
+        source = self._source.args if target == "params" else self._source.cookies
+        return {key: source[key] for key in keys if key in source}
 
+    def _streams_body(self) -> bool:
+        policy = self._body_policy
+        return policy is not None and policy.stream and "body" not in self.__dict__ and self._source.is_json
+
+    def to_dict(self):
+        data = {target: getattr(self, target) for target in REQUEST_TARGETS}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request.to_dict => %s", data)
         return data
+
+
+class RequestCapturePlan:
+    """
+    Describes which request targets, and which keys within them, the rules of an endpoint use.
+
+    A target mapped to None is captured whole; a target mapped to a set of keys only copies
+    those keys. Targets not referenced by any rule are never captured.
+    """
+
+    __slots__ = ("targets",)
+
+    def __init__(self, targets: dict[str, frozenset[str] | None] | None):
+        self.targets = targets
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[Any], extra_targets: Iterable[str] = ()) -> "RequestCapturePlan":
+        """
+        Builds a capture plan from the rules of all scenarios of an endpoint.
+
+        Rules on the extra targets, which a RequestView resolves itself, capture nothing. Other
+        rules that are not plain target/prop dicts make the plan capture everything.
+        """
+        extra_targets = frozenset(extra_targets)
+        keys_by_target: dict[str, set[str] | None] = {}
+        for rule in rules:
+            if isinstance(rule, dict) and rule.get("target") in extra_targets:
+                continue
+            if not isinstance(rule, dict) or rule.get("target") not in REQUEST_TARGETS:
+                logger.debug("Rule %s cannot be planned; capturing the whole request.", rule)
+                return cls(None)
+            target = rule["target"]
+            key = _top_level_key(rule.get("prop") or "")
+            if key is None or target not in _PLANNED_TARGETS:
+                keys_by_target[target] = None
+            elif target not in keys_by_target:
+                keys_by_target[target] = {key}
+            elif (known := keys_by_target[target]) is not None:
+                known.add(key)
+        return cls({target: None if keys is None else frozenset(keys) for target, keys in keys_by_target.items()})
+
+
+class RequestView(Mapping):
+    """
+    Read-only mapping over a Request that captures targets lazily, following a capture plan.
+
+    It exposes the same keys as Request.to_dict(), so it can be handed to Scenario.evaluate,
+    along with the extra targets of its resolvers, which compute them from the view. Each
+    target is captured at most once per request.
+    """
+
+    __slots__ = ("_captured", "_plan", "_request", "_resolvers")
+
+    def __init__(
+        self,
+        request_obj: Request,
+        plan: RequestCapturePlan,
+        resolvers: Mapping[str, Callable[["RequestView"], Any]] | None = None,
+    ):
+        self._request = request_obj
+        self._plan = plan
+        self._resolvers = resolvers or {}
+        self._captured: dict[str, Any] = {}
+
+    def __getitem__(self, target: str) -> Any:
+        try:
+            return self._captured[target]
+        except KeyError:
+            if target not in REQUEST_TARGETS:
+                resolve = self._resolvers[target]
+                value = self._captured[target] = resolve(self)
+                return value
+        targets = self._plan.targets
+        keys = targets.get(target) if targets is not None else None
+        value = self._captured[target] = self._request.capture(target, keys)
+        return value
+
+    def __contains__(self, target: object) -> bool:
+        return target in REQUEST_TARGETS or target in self._resolvers
+
+    def __iter__(self) -> Iterator[str]:
+        yield from REQUEST_TARGETS
+        yield from self._resolvers
+
+    def __len__(self) -> int:
+        return len(REQUEST_TARGETS) + len(self._resolvers)
+
+    def __repr__(self) -> str:
+        return f"RequestView(captured={self._captured!r})"
+
+
+def _top_level_key(prop: str) -> str | None:
+    """
+    Returns the first key a dot-notation or JSONPath prop reads, or None if it needs the whole target.
+    """
+    match = _TOP_LEVEL_KEY.match(prop)
+    if match is None:
+        return None
+    return match.group(1) or match.group(2)
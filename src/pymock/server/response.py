@@ -1,5 +1,15 @@
+import dataclasses
+import decimal
+import hashlib
+import json
+import uuid
+from datetime import date
+from http import HTTPStatus
+from typing import Any
+
 from flask import Response as Flask_Response
 from flask import jsonify, make_response
+from werkzeug.http import http_date, parse_etags
 
 
 class Response:
@@ -17,3 +27,69 @@ class Response:
         for key, value in self.headers.items():
             response.headers[key] = value
         return response
+
+
+class StaticResponse:
+    """
+    A response whose body never changes, encoded once with its Content-Length and a strong ETag.
+
+    Conditional GETs carrying a matching If-None-Match header are answered with 304.
+    """
+
+    __slots__ = ("body", "content_type", "etag", "headers", "status_code")
+
+    def __init__(self, status_code: int, body: bytes, content_type: str = "application/json"):
+        self.status_code = status_code
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.headers = [
+            ("Content-Type", content_type),
+            ("Content-Length", str(len(body))),
+            ("ETag", self.etag),
+        ]
+
+    @classmethod
+    def from_data(cls, status_code: int, data: Any) -> "StaticResponse":
+        """Pre-encodes JSON data the way jsonify would."""
+        return cls(status_code, dumps_json(data))
+
+    def is_not_modified(self, if_none_match: str | None) -> bool:
+        """Returns True if the If-None-Match header value matches this response's ETag."""
+        if not if_none_match or self.status_code != HTTPStatus.OK:
+            return False
+        return parse_etags(if_none_match).contains_weak(self.etag[1:-1])
+
+    def to_flask_response(self, if_none_match: str | None = None) -> Flask_Response:
+        """Builds a Flask Response, or a 304 if the client already holds this body."""
+        if self.is_not_modified(if_none_match):
+            return Flask_Response(status=304, headers=[("ETag", self.etag)])
+        return Flask_Response(self.body, status=self.status_code, headers=self.headers)
+
+
+def json_response(data: Any, status_code: int = 200) -> Flask_Response:
+    """
+    Builds a JSON response without requiring a Flask application context, unlike jsonify.
+    """
+    return Flask_Response(dumps_json(data), status=status_code, mimetype="application/json")
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serializes data to JSON bytes with the same output as Flask's jsonify outside debug mode.
+    """
+    text = json.dumps(data, default=_default, ensure_ascii=True, sort_keys=True, separators=(",", ":"))
+    return f"{text}\n".encode()
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, decimal.Decimal | uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    msg = f"Object of type {type(o).__name__} is not JSON serializable"
+    raise TypeError(msg)
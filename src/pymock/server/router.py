@@ -0,0 +1,255 @@
+# src/pymock/server/router.py
+import logging
+import re
+from functools import lru_cache
+from typing import Any
+
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import Map, RequestRedirect, ValidationError
+from werkzeug.routing.converters import BaseConverter
+from werkzeug.routing.rules import parse_converter_args
+from werkzeug.wsgi import get_current_url, get_path_info
+
+from pymock.server.exceptions import ConfigError
+from pymock.server.routes import EndpointHandler, EndpointRoute, RouteTable
+
+logger = logging.getLogger(__name__)
+
+# Values of the 'server.router' setting.
+ROUTERS = ("werkzeug", "trie")
+
+# Same syntax as werkzeug rules: '<name>', '<converter:name>' or '<converter(args):name>'.
+_VARIABLE = re.compile(
+    r"<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*)(?:\((?P<arguments>.*?)\))?:)?(?P<variable>[a-zA-Z_][a-zA-Z0-9_]*)>"
+)
+# Converters are looked up and instantiated the way werkzeug does, so that path variables are
+# validated and converted exactly as with the werkzeug router.
+_CONVERTER_MAP = Map()
+
+
+class _Pattern:
+    """
+    A rule part with variables, e.g. '<int:user_id>' or 'report-<day>.csv', matched as a whole.
+    """
+
+    __slots__ = ("converters", "regex", "source", "weight")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.converters: dict[str, BaseConverter] = {}
+        regex_parts = []
+        static_weights: list[tuple[int, int]] = []
+        position = 0
+        for match in [*_VARIABLE.finditer(source), None]:
+            static = source[position : match.start() if match is not None else len(source)]
+            regex_parts.append(re.escape(static))
+            static_weights.extend((len(static_weights), -len(piece)) for piece in static.split("/") if piece)
+            if match is None:
+                break
+            name = match.group("variable")
+            converter = _create_converter(match.group("converter") or "default", match.group("arguments"))
+            self.converters[name] = converter
+            regex_parts.append(f"(?P<{name}>{converter.regex})")
+            position = match.end()
+        self.regex = re.compile("".join(regex_parts))
+        argument_weights = [converter.weight for converter in self.converters.values()]
+        # Sorts like werkzeug's rule parts: more static text first, then lighter converters.
+        self.weight = (-len(static_weights), static_weights, -len(argument_weights), argument_weights)
+
+    @property
+    def isolated(self) -> bool:
+        """True if the variables cannot match a '/', so the pattern matches one path segment."""
+        return all(converter.part_isolating for converter in self.converters.values())
+
+    def match(self, text: str) -> dict[str, Any] | None:
+        match = self.regex.fullmatch(text)
+        if match is None:
+            return None
+        try:
+            return {name: converter.to_python(match.group(name)) for name, converter in self.converters.items()}
+        except ValidationError:
+            return None
+
+
+class _Node:
+    """A trie node: one path segment deeper than its parent."""
+
+    __slots__ = ("dynamic", "handlers", "static", "tails")
+
+    def __init__(self):
+        self.static: dict[str, _Node] = {}
+        self.dynamic: list[tuple[_Pattern, _Node]] = []
+        # Patterns matching all the remaining segments at once, for variables such as '<path:rest>'.
+        self.tails: list[tuple[_Pattern, dict[str, EndpointHandler]]] = []
+        self.handlers: dict[str, EndpointHandler] = {}
+
+
+class TrieRouteTable:
+    """
+    An immutable set of routes, matched by (method, path) with a segment trie.
+
+    Static paths are looked up in a dict. Other paths are walked segment by segment: static
+    segments are dict lookups, and only the variable segments registered at that position are
+    tried, so the cost of a lookup depends on the depth of the path rather than on the number
+    of routes. Rules use werkzeug's syntax and converters, and match with the same precedence:
+    static segments first, then variables by converter weight, then variables spanning several
+    segments. As with werkzeug, GET routes also answer HEAD, and a path missing only its
+    trailing slash is redirected.
+
+    When several routes share a method and path, the first one wins, as with Flask.
+    """
+
+    def __init__(self, routes: list[EndpointRoute]):
+        self.routes = routes
+        self.inline_handlers = frozenset(route.handler for route in routes if not route.blocking)
+        self._static: dict[str, dict[str, EndpointHandler]] = {}
+        self._root = _Node()
+        for route in routes:
+            if "<" not in route.path:
+                self._static.setdefault(route.path, {}).setdefault(route.method, route.handler)
+            self._insert(route)
+        for node in _walk(self._root):
+            node.dynamic.sort(key=lambda entry: entry[0].weight)
+            node.tails.sort(key=lambda entry: entry[0].weight)
+        logger.debug("Built route trie for %d routes (%d static paths)", len(routes), len(self._static))
+
+    def match(self, environ: dict[str, Any]) -> tuple[EndpointHandler, dict[str, Any]]:
+        """
+        Returns the handler of the route matching a request, and the variables of its path.
+
+        Raises:
+            NotFound: If no route matches the path.
+            MethodNotAllowed: If routes match the path, but not the method.
+            RequestRedirect: If the path only matches with a trailing slash added.
+        """
+        method = environ["REQUEST_METHOD"]
+        path = get_path_info(environ) or "/"
+        handlers = self._static.get(path)
+        if handlers is not None and (handler := _select(handlers, method)) is not None:
+            return handler, {}
+
+        allowed: set[str] = set()
+        found = self._find(path, method, allowed)
+        if found is not None:
+            return found
+        if allowed:
+            raise MethodNotAllowed(valid_methods=sorted(allowed))
+        if not path.endswith("/") and self._find(f"{path}/", method, set()) is not None:
+            url = f"{get_current_url(environ, strip_querystring=True)}/"
+            if query := environ.get("QUERY_STRING"):
+                url = f"{url}?{query}"
+            raise RequestRedirect(url)
+        raise NotFound
+
+    def _find(self, path: str, method: str, allowed: set[str]) -> tuple[EndpointHandler, dict[str, Any]] | None:
+        """
+        Searches the trie depth-first, backtracking when a branch does not lead to a route for
+        method. The methods of routes matching the path are added to allowed.
+        """
+        segments = path.lstrip("/").split("/")
+
+        def search(node: _Node, position: int, params: dict[str, Any]) -> tuple[EndpointHandler, dict] | None:
+            if position == len(segments):
+                if node.handlers:
+                    handler = _select(node.handlers, method)
+                    if handler is not None:
+                        return handler, params
+                    allowed.update(_allowed_methods(node.handlers))
+            else:
+                segment = segments[position]
+                child = node.static.get(segment)
+                if child is not None and (found := search(child, position + 1, params)):
+                    return found
+                for pattern, child in node.dynamic:
+                    values = pattern.match(segment)
+                    if values is not None and (found := search(child, position + 1, {**params, **values})):
+                        return found
+
+            if node.tails:
+                rest = "/".join(segments[position:])
+                for pattern, handlers in node.tails:
+                    values = pattern.match(rest)
+                    if values is None:
+                        continue
+                    handler = _select(handlers, method)
+                    if handler is not None:
+                        return handler, {**params, **values}
+                    allowed.update(_allowed_methods(handlers))
+            return None
+
+        return search(self._root, 0, {})
+
+    def _insert(self, route: EndpointRoute) -> None:
+        node = self._root
+        segments = route.path.lstrip("/").split("/")
+        for position, segment in enumerate(segments):
+            if "<" not in segment:
+                node = node.static.setdefault(segment, _Node())
+                continue
+            pattern = _compile_pattern(segment)
+            if not pattern.isolated:
+                tail = _compile_pattern("/".join(segments[position:]))
+                for existing, handlers in node.tails:
+                    if existing.source == tail.source:
+                        handlers.setdefault(route.method, route.handler)
+                        return
+                node.tails.append((tail, {route.method: route.handler}))
+                return
+            for existing, child in node.dynamic:
+                if existing.source == segment:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.dynamic.append((pattern, child))
+                node = child
+        node.handlers.setdefault(route.method, route.handler)
+
+
+def create_route_table(routes: list[EndpointRoute], router: str = "werkzeug") -> RouteTable | TrieRouteTable:
+    """
+    Builds the route table of the given router, one of ROUTERS.
+
+    Raises:
+        ConfigError: If the router is unknown.
+    """
+    if router == "werkzeug":
+        return RouteTable(routes)
+    if router == "trie":
+        return TrieRouteTable(routes)
+    msg = f"Unknown router {router!r}: expected one of {', '.join(ROUTERS)}"
+    raise ConfigError(msg)
+
+
+def _select(handlers: dict[str, EndpointHandler], method: str) -> EndpointHandler | None:
+    handler = handlers.get(method)
+    if handler is None and method == "HEAD":
+        handler = handlers.get("GET")
+    return handler
+
+
+def _allowed_methods(handlers: dict[str, EndpointHandler]) -> set[str]:
+    return set(handlers) | ({"HEAD"} if "GET" in handlers else set())
+
+
+@lru_cache(maxsize=4096)
+def _compile_pattern(source: str) -> _Pattern:
+    """Patterns are immutable, so the many routes sharing a segment such as '<id>' share one."""
+    return _Pattern(source)
+
+
+def _create_converter(name: str, arguments: str | None) -> BaseConverter:
+    converter_class = _CONVERTER_MAP.converters.get(name)
+    if converter_class is None:
+        msg = f"Unknown converter {name!r} in route"
+        raise ConfigError(msg)
+    args, kwargs = parse_converter_args(arguments) if arguments else ((), {})
+    return converter_class(_CONVERTER_MAP, *args, **kwargs)
+
+
+def _walk(node: _Node):
+    yield node
+    for child in node.static.values():
+        yield from _walk(child)
+    for _, child in node.dynamic:
+        yield from _walk(child)
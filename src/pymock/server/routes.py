@@ -0,0 +1,141 @@
+# src/pymock/server/routes.py
+import logging
+import time
+from collections.abc import Callable
+from typing import Any, NamedTuple, Protocol
+
+from flask import Blueprint, Response, request
+from werkzeug.routing import Map, Rule
+from werkzeug.wrappers import Request as WerkzeugRequest
+
+from pymock.server.latency import remaining_delay
+
+logger = logging.getLogger(__name__)
+
+HTTP_METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+
+# Serves a request given the incoming werkzeug request and the variables of the matched path.
+EndpointHandler = Callable[[WerkzeugRequest, dict[str, Any]], Response]
+
+
+class EndpointRoute(NamedTuple):
+    """
+    A framework-neutral route: a werkzeug path rule, its HTTP method and its handler. A handler
+    that only serves pre-encoded responses is not blocking, so an event loop may run it itself.
+    """
+
+    path: str
+    method: str
+    handler: EndpointHandler
+    blocking: bool = True
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method}-{self.path}"
+
+
+class RouteMatcher(Protocol):
+    """An immutable set of routes that can be served through a LiveRouteTable."""
+
+    routes: list[EndpointRoute]
+    inline_handlers: frozenset[EndpointHandler]
+
+    def match(self, environ: dict[str, Any]) -> tuple[EndpointHandler, dict[str, Any]]: ...
+
+
+class RouteTable:
+    """
+    An immutable set of routes, matched by (method, path) with a werkzeug Map.
+
+    When several routes share a method and path, the first one wins, as with Flask.
+    """
+
+    def __init__(self, routes: list[EndpointRoute]):
+        self.routes = routes
+        self.inline_handlers = frozenset(route.handler for route in routes if not route.blocking)
+        self.handlers: dict[str, EndpointHandler] = {}
+        for route in routes:
+            self.handlers.setdefault(route.endpoint, route.handler)
+        self.url_map = Map([Rule(route.path, endpoint=route.endpoint, methods=[route.method]) for route in routes])
+
+    def match(self, environ: dict[str, Any]) -> tuple[EndpointHandler, dict[str, Any]]:
+        """
+        Returns the handler of the route matching a request, and the variables of its path.
+
+        Raises:
+            NotFound: If no route matches the path.
+            MethodNotAllowed: If routes match the path, but not the method.
+            RequestRedirect: If the path only matches with a trailing slash added.
+        """
+        endpoint, path_params = self.url_map.bind_to_environ(environ).match()
+        # werkzeug builds a new dict of the path variables, typed as a Mapping.
+        return self.handlers[endpoint], path_params  # type: ignore[return-value]
+
+
+class LiveRouteTable:
+    """
+    Holds the route table currently served, which can be swapped while requests are in flight.
+
+    Requests read `current` once, so a request that started on the old table finishes on it.
+    """
+
+    def __init__(self, table: RouteMatcher):
+        self.current = table
+
+    def swap(self, table: RouteMatcher) -> RouteMatcher:
+        """Atomically replaces the served table and returns the previous one."""
+        previous, self.current = self.current, table
+        return previous
+
+
+def register_routes(blueprint: Blueprint, routes: list[EndpointRoute]) -> None:
+    """
+    Adds routes to a Flask Blueprint, handing each handler the current Flask request.
+
+    A WSGI server has no event loop to hand a delayed response to, so response delays block
+    the serving thread here; the ASGI engine holds them without blocking.
+    """
+    for route in routes:
+        blueprint.add_url_rule(
+            route.path,
+            endpoint=route.endpoint,
+            view_func=_create_flask_view(route.handler),
+            methods=[route.method],
+        )
+        logger.debug("Route %s %s registered with blueprint %s.", route.method, route.path, blueprint.name)
+
+
+def register_route_table(blueprint: Blueprint, live_routes: LiveRouteTable) -> None:
+    """
+    Adds a single catch-all view to a Flask Blueprint, serving whichever route table is current.
+    """
+
+    def view(**_kwargs) -> Response:
+        started = time.monotonic()
+        # request is a LocalProxy, which the stubs type as the Request it proxies.
+        source = request._get_current_object()  # type: ignore[attr-defined]
+        handler, path_params = live_routes.current.match(source.environ)
+        # Templates see the variables of the matched route, as with one URL rule per endpoint.
+        source.view_args = path_params
+        response = handler(source, path_params)
+        if delay := remaining_delay(source.environ, started):
+            time.sleep(delay)
+        return response
+
+    for rule in ("/", "/<path:_path>"):
+        blueprint.add_url_rule(
+            rule, endpoint=f"route-table{rule}", view_func=view, methods=HTTP_METHODS, provide_automatic_options=False
+        )
+    logger.debug("Route table registered with blueprint %s.", blueprint.name)
+
+
+def _create_flask_view(handler: EndpointHandler) -> Callable[..., Response]:
+    def view(**kwargs) -> Response:
+        started = time.monotonic()
+        source = request._get_current_object()  # type: ignore[attr-defined]
+        response = handler(source, kwargs)
+        if delay := remaining_delay(source.environ, started):
+            time.sleep(delay)
+        return response
+
+    return view
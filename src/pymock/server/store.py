@@ -0,0 +1,572 @@
+# src/pymock/server/store.py
+import itertools
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections.abc import Callable, Mapping
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, ClassVar
+
+from flask import Response
+
+from pymock.server.exceptions import ConfigError
+from pymock.server.matchers import compile_accessor, simple_path
+from pymock.server.response import StaticResponse, json_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RECORDS = 100_000
+DEFAULT_SHARDS = 16
+DEFAULT_KEY = "$.id"
+STORE_FORMAT_VERSION = 1
+# The rule target reading the record, or for lists the records, a request addresses.
+STORE_TARGET = "store"
+ACTIONS = ("create", "read", "replace", "update", "delete", "list")
+
+RESOURCE_NOT_FOUND = StaticResponse.from_data(404, {"error": "Resource not found"})
+RESOURCE_EXISTS = StaticResponse.from_data(409, {"error": "Resource already exists"})
+OBJECT_EXPECTED = StaticResponse.from_data(400, {"error": "Expected a JSON object body"})
+
+_JSON_LITERALS = {None: "null", True: "true", False: "false"}
+_PATH_VARIABLE = re.compile(r"<(?:[^:<>]+:)?([^<>]+)>")
+_INFERRED_ACTIONS = {
+    ("POST", False): "create",
+    ("POST", True): "create",
+    ("GET", False): "list",
+    ("GET", True): "read",
+    ("PUT", True): "replace",
+    ("PATCH", True): "update",
+    ("DELETE", True): "delete",
+}
+
+
+class ResourceStore:
+    """
+    In-memory store of the resources created through endpoints, so that a mock can answer
+    'GET /orders/<id>' with what 'POST /orders' created.
+
+    Each resource is a Collection, declared by the endpoints bound to it. The store is shared
+    by all endpoints of the process, and can be saved to and restored from a JSON file.
+    """
+
+    _max_records: ClassVar[int] = DEFAULT_MAX_RECORDS
+    _shard_count: ClassVar[int] = DEFAULT_SHARDS
+    _file: ClassVar[str | None] = None
+    _shared: ClassVar["ResourceStore | None"] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, max_records: int = DEFAULT_MAX_RECORDS, shards: int = DEFAULT_SHARDS, file: str | None = None):
+        if max_records < 1 or shards < 1:
+            msg = f"Invalid store options: max_records={max_records}, shards={shards}"
+            raise ConfigError(msg)
+        self.max_records = max_records
+        self.shards = shards
+        self.file = file
+        self._collections: dict[str, Collection] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure(
+        cls, *, max_records: int = DEFAULT_MAX_RECORDS, shards: int = DEFAULT_SHARDS, file: str | None = None
+    ) -> None:
+        """
+        Sets the options of the shared store. The current shared store, if any, is replaced.
+
+        Args:
+            max_records: Number of records kept per resource; the oldest are evicted beyond it.
+            shards: Number of independently locked shards per resource.
+            file: JSON file the store is saved to and restored from.
+        """
+        with cls._shared_lock:
+            cls._max_records = max_records
+            cls._shard_count = shards
+            cls._file = file
+            cls._shared = None
+
+    @classmethod
+    def shared(cls) -> "ResourceStore":
+        """Returns the store shared by all endpoints of the process."""
+        store = cls._shared
+        if store is None:
+            with cls._shared_lock:
+                store = cls._shared
+                if store is None:
+                    store = cls._shared = cls(cls._max_records, cls._shard_count, cls._file)
+        return store
+
+    def collection(self, name: str, key: str | None = None, indexes: tuple[str, ...] = ()) -> "Collection":
+        """
+        Returns the collection of a resource, creating it on first use.
+
+        Args:
+            name: The resource name, e.g. 'orders'.
+            key: Dot-notation or JSONPath of the primary key within records. Endpoints bound to
+                the same resource must agree on it.
+            indexes: Top-level fields to index, added to those of the other endpoints.
+
+        Raises:
+            ConfigError: If the key differs from the one the resource was declared with.
+        """
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = Collection(name, self.max_records, self.shards)
+        collection.declare(key, indexes)
+        return collection
+
+    def __getattr__(self, name: str) -> "Collection":
+        # Lets templates read resources as store.orders.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._collections[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: str) -> "Collection":
+        return self._collections[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._collections
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the record count of each resource, along with the cap."""
+        return {
+            "resources": {name: len(collection) for name, collection in self._collections.items()},
+            "max_records": self.max_records,
+        }
+
+    def clear(self) -> int:
+        """Removes all records and returns how many there were."""
+        count = sum(collection.clear() for collection in list(self._collections.values()))
+        logger.info("Resource store cleared (%d records).", count)
+        return count
+
+    def save(self, path: str | os.PathLike | None = None) -> int:
+        """
+        Writes all records to a JSON file atomically, so a concurrent restore never reads a
+        partial file.
+
+        Args:
+            path: The file; the configured one by default.
+
+        Returns:
+            The number of records written.
+        """
+        target = Path(self._file_path(path))
+        resources = {name: collection.dump() for name, collection in list(self._collections.items())}
+        payload = {"version": STORE_FORMAT_VERSION, "resources": resources}
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(payload, file)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        count = sum(len(records) for records in resources.values())
+        logger.info("Saved %d records to %s.", count, target)
+        return count
+
+    def restore(self, path: str | os.PathLike | None = None) -> int:
+        """
+        Replaces the records of the resources saved in a JSON file with the saved ones.
+
+        Returns:
+            The number of records restored.
+
+        Raises:
+            ConfigError: If the file cannot be read or was not written by save().
+        """
+        source = self._file_path(path)
+        try:
+            with open(source, encoding="utf-8") as file:
+                payload = json.load(file)
+        except (OSError, ValueError) as e:
+            msg = f"Failed to restore the resource store from {source}: {e}"
+            raise ConfigError(msg) from e
+        if not isinstance(payload, dict) or payload.get("version") != STORE_FORMAT_VERSION:
+            msg = f"Failed to restore the resource store from {source}: unsupported format"
+            raise ConfigError(msg)
+        count = 0
+        for name, records in payload.get("resources", {}).items():
+            count += self.collection(name).load(records)
+        logger.info("Restored %d records from %s.", count, source)
+        return count
+
+    def _file_path(self, path: str | os.PathLike | None) -> str | os.PathLike:
+        if path is not None:
+            return path
+        if self.file is None:
+            msg = "No store file is configured"
+            raise ConfigError(msg)
+        return self.file
+
+
+class Collection:
+    """
+    The records of one resource, keyed by primary key.
+
+    Records are spread over shards by key, and each shard has its own lock and its own
+    secondary indexes, so writers to different shards never wait for each other. A lookup
+    by key is a single dict access; a query on indexed fields reads the smallest matching
+    index bucket of each shard instead of scanning. Once a shard holds its share of
+    max_records, its oldest records are evicted.
+    """
+
+    __slots__ = ("_ids", "_key_accessor", "_key_path", "_sequence", "_shard_cap", "_shards", "indexes", "key", "name")
+
+    def __init__(self, name: str, max_records: int = DEFAULT_MAX_RECORDS, shards: int = DEFAULT_SHARDS):
+        self.name = name
+        self.key: str | None = None
+        self.indexes: frozenset[str] = frozenset()
+        self._key_path: tuple[str, ...] = simple_path(DEFAULT_KEY) or ()
+        self._key_accessor: Callable[[Any], Any] = compile_accessor(DEFAULT_KEY)
+        self._shards = [_Shard() for _ in range(shards)]
+        self._shard_cap = -(-max_records // shards)
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+
+    def declare(self, key: str | None, indexes: tuple[str, ...] = ()) -> None:
+        """Sets the key path if it is not set yet, and indexes new fields, existing records included."""
+        if key is not None and key != self.key:
+            if self.key is not None:
+                msg = f"Resource {self.name!r} is keyed by {self.key!r}, not {key!r}"
+                raise ConfigError(msg)
+            path = simple_path(key)
+            if not path:
+                msg = f"Invalid key {key!r} of resource {self.name!r}: expected a path such as '$.id'"
+                raise ConfigError(msg)
+            self.key, self._key_path, self._key_accessor = key, path, compile_accessor(key)
+        new_indexes = set(indexes) - self.indexes
+        if not new_indexes:
+            return
+        for shard in self._shards:
+            with shard.lock:
+                shard.add_indexes(new_indexes)
+        self.indexes = self.indexes | new_indexes
+
+    def key_of(self, record: Any) -> Any:
+        """Returns the primary key a record holds, or None."""
+        return self._key_accessor(record)
+
+    def get(self, key: Any) -> Any:
+        """Returns the record with the given primary key, or None."""
+        normalized = normalize(key)
+        if normalized is None:
+            return None
+        entry = self._shard(normalized).records.get(normalized)
+        return None if entry is None else entry[1]
+
+    def find(self, **fields: Any) -> list[Any]:
+        """Returns the records whose top-level fields equal the given values, oldest first."""
+        return self.query(fields)
+
+    def query(self, fields: Mapping[str, Any]) -> list[Any]:
+        """
+        Returns the records whose top-level fields equal the given values, oldest first.
+        Values are compared in their JSON form, so the string '5' of a query parameter
+        matches the number 5.
+        """
+        wanted = {field: normalize(value) for field, value in fields.items()}
+        indexed = [field for field in wanted if field in self.indexes]
+        entries: list[tuple[int, Any]] = []
+        for shard in self._shards:
+            with shard.lock:
+                if indexed:
+                    keys = min((shard.indexes[field].get(wanted[field], ()) for field in indexed), key=len)
+                    candidates = [shard.records[key] for key in keys]
+                else:
+                    candidates = list(shard.records.values())
+            entries.extend(entry for entry in candidates if _has_fields(entry[1], wanted))
+        entries.sort(key=itemgetter(0))
+        return [record for _, record in entries]
+
+    def create(self, record: dict[str, Any], key: Any = None) -> tuple[str, Any] | None:
+        """
+        Stores a new record under the given key, the one it holds, or a generated integer.
+        A key given or generated is written into the record.
+
+        Returns:
+            The normalized key and the stored record, or None if a record has that key.
+        """
+        if key is None:
+            key = self._key_accessor(record)
+        generated = key is None
+        while True:
+            if generated:
+                key = next(self._ids)
+            normalized = normalize(key)
+            if normalized is None:
+                return None
+            if normalize(self._key_accessor(record)) != normalized:
+                record = _with_value(record, self._key_path, key)
+            shard = self._shard(normalized)
+            with shard.lock:
+                if normalized not in shard.records:
+                    self._store(shard, normalized, record)
+                    return normalized, record
+            if not generated:
+                return None
+
+    def replace(self, key: Any, record: dict[str, Any]) -> Any:
+        """Stores a record under the given key, replacing any record it has; returns the stored record."""
+        normalized = normalize(key)
+        if normalized is None:
+            return None
+        if normalize(self._key_accessor(record)) != normalized:
+            record = _with_value(record, self._key_path, key)
+        shard = self._shard(normalized)
+        with shard.lock:
+            self._store(shard, normalized, record)
+        return record
+
+    def update(self, key: Any, changes: Mapping[str, Any]) -> Any:
+        """Merges the changes into the top-level fields of a record; returns it, or None if it is missing."""
+        normalized = normalize(key)
+        if normalized is None:
+            return None
+        shard = self._shard(normalized)
+        with shard.lock:
+            entry = shard.records.get(normalized)
+            if entry is None:
+                return None
+            # Records are replaced rather than mutated, so readers never see a partial update.
+            record = {**entry[1], **changes}
+            self._store(shard, normalized, record)
+        return record
+
+    def delete(self, key: Any) -> Any:
+        """Removes a record; returns it, or None if it is missing."""
+        normalized = normalize(key)
+        if normalized is None:
+            return None
+        shard = self._shard(normalized)
+        with shard.lock:
+            entry = shard.pop(normalized)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> int:
+        """Removes all records and returns how many there were."""
+        count = 0
+        for shard in self._shards:
+            with shard.lock:
+                count += len(shard.records)
+                shard.clear()
+        return count
+
+    def dump(self) -> dict[str, Any]:
+        """Returns the records by key, oldest first, as saved by ResourceStore.save()."""
+        entries: list[tuple[int, str, Any]] = []
+        for shard in self._shards:
+            with shard.lock:
+                entries.extend((sequence, key, record) for key, (sequence, record) in shard.records.items())
+        entries.sort(key=itemgetter(0))
+        return {key: record for _, key, record in entries}
+
+    def load(self, records: Mapping[str, Any]) -> int:
+        """Replaces all records with the given ones, keyed as dump() returns them; returns their count."""
+        self.clear()
+        for key, record in records.items():
+            shard = self._shard(key)
+            with shard.lock:
+                self._store(shard, key, record)
+        # Generated keys continue after the largest integer key restored.
+        largest = max((int(key) for key in records if key.isdigit()), default=0)
+        self._ids = itertools.count(largest + 1)
+        return len(records)
+
+    def __len__(self) -> int:
+        return sum(len(shard.records) for shard in self._shards)
+
+    def __repr__(self) -> str:
+        return f"Collection({self.name!r}, records={len(self)})"
+
+    def _shard(self, key: str) -> "_Shard":
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _store(self, shard: "_Shard", key: str, record: Any) -> None:
+        """Stores a record in a shard whose lock is held, evicting the oldest records beyond the cap."""
+        previous = shard.records.get(key)
+        sequence = next(self._sequence) if previous is None else previous[0]
+        shard.put(key, (sequence, record))
+        while len(shard.records) > self._shard_cap:
+            # Replaced records keep their place, so the shard's records are in creation order.
+            oldest = next(iter(shard.records))
+            shard.pop(oldest)
+            logger.debug("Evicted %s %s from the resource store.", self.name, oldest)
+
+
+class _Shard:
+    """Records of a collection with the same key hash, and their secondary indexes."""
+
+    __slots__ = ("indexes", "lock", "records")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records: dict[str, tuple[int, Any]] = {}
+        # field -> normalized value -> keys of the records holding it
+        self.indexes: dict[str, dict[str | None, dict[str, None]]] = {}
+
+    def add_indexes(self, fields: set[str]) -> None:
+        for field in fields:
+            index: dict[str | None, dict[str, None]] = {}
+            for key, (_, record) in self.records.items():
+                index.setdefault(_field_value(record, field), {})[key] = None
+            self.indexes[field] = index
+
+    def put(self, key: str, entry: tuple[int, Any]) -> None:
+        previous = self.records.get(key)
+        if previous is not None:
+            self._unindex(key, previous[1])
+        self.records[key] = entry
+        for field, index in self.indexes.items():
+            index.setdefault(_field_value(entry[1], field), {})[key] = None
+
+    def pop(self, key: str) -> tuple[int, Any] | None:
+        entry = self.records.pop(key, None)
+        if entry is not None:
+            self._unindex(key, entry[1])
+        return entry
+
+    def clear(self) -> None:
+        self.records.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+    def _unindex(self, key: str, record: Any) -> None:
+        for field, index in self.indexes.items():
+            value = _field_value(record, field)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+
+
+class ResourceBinding:
+    """
+    Binds an endpoint to a resource of the store, from its 'store' setting: POST creates a
+    record, GET reads one by the last path variable or lists them filtered by the query
+    parameters, PUT replaces, PATCH updates and DELETE removes one.
+
+    Requests the endpoint's scenarios do not answer get the action performed, and the record,
+    or records, as the response. The record a request addresses is also exposed to rules as
+    the 'store' target, before anything is changed.
+    """
+
+    __slots__ = ("action", "collection", "variable")
+
+    def __init__(self, collection: Collection, action: str, variable: str | None = None):
+        self.collection = collection
+        self.action = action
+        self.variable = variable
+
+    @classmethod
+    def from_config(cls, spec: Any, method: str, path: str, store: ResourceStore) -> "ResourceBinding | None":
+        """
+        Builds the binding of a 'store' endpoint setting, e.g. 'orders' or {"resource": "orders",
+        "key": "$.id", "indexes": ["status"]}. The action defaults to the one of the method.
+
+        Returns:
+            The ResourceBinding, or None if the endpoint has no 'store' setting.
+
+        Raises:
+            ConfigError: If the setting is malformed, or no action fits the method and path.
+        """
+        if spec is None:
+            return None
+        if isinstance(spec, str):
+            spec = {"resource": spec}
+        if not isinstance(spec, dict) or not isinstance(spec.get("resource"), str):
+            msg = f"Invalid store setting of {method} {path}: expected a resource name or a mapping with 'resource'"
+            raise ConfigError(msg)
+        variables = _PATH_VARIABLE.findall(path)
+        variable = variables[-1] if variables else None
+        action = spec.get("action") or _INFERRED_ACTIONS.get((method, variable is not None))
+        if action not in ACTIONS or (variable is None and action not in ("create", "list")):
+            msg = f"Invalid store setting of {method} {path}: no {action or method} action without a path variable"
+            raise ConfigError(msg)
+        collection = store.collection(spec["resource"], spec.get("key", DEFAULT_KEY), tuple(spec.get("indexes", ())))
+        return cls(collection, action, variable)
+
+    def capture_rules(self) -> list[dict[str, str]]:
+        """Returns pseudo-rules making a RequestCapturePlan capture what the action reads whole."""
+        if self.action == "list":
+            return [{"target": "params", "prop": ""}]
+        if self.action in ("create", "replace", "update"):
+            return [{"target": "body", "prop": ""}]
+        return []
+
+    def lookup(self, request_data: Mapping[str, Any], path_params: Mapping[str, Any]) -> Any:
+        """Returns what the request addresses: the record with its key, or for lists the matching records."""
+        if self.action == "list":
+            return self.collection.query(request_data["params"])
+        key = path_params.get(self.variable) if self.variable is not None else None
+        if key is None and self.action == "create":
+            body = request_data["body"]
+            key = self.collection.key_of(body) if isinstance(body, dict) else None
+        return None if key is None else self.collection.get(key)
+
+    def perform(self, request_data: Mapping[str, Any], path_params: Mapping[str, Any]) -> Response:
+        """Performs the action and returns its default response."""
+        if self.action == "list":
+            return json_response(self.collection.query(request_data["params"]))
+        key = path_params.get(self.variable) if self.variable is not None else None
+        if self.action in ("read", "delete"):
+            record = self.collection.get(key) if self.action == "read" else self.collection.delete(key)
+            if record is None:
+                return RESOURCE_NOT_FOUND.to_flask_response()
+            return json_response(record) if self.action == "read" else Response(status=204)
+        body = request_data["body"]
+        if not isinstance(body, dict):
+            return OBJECT_EXPECTED.to_flask_response()
+        if self.action == "create":
+            created = self.collection.create(body, key)
+            if created is None:
+                return RESOURCE_EXISTS.to_flask_response()
+            return json_response(created[1], 201)
+        record = self.collection.replace(key, body) if self.action == "replace" else self.collection.update(key, body)
+        if record is None:
+            return RESOURCE_NOT_FOUND.to_flask_response()
+        return json_response(record)
+
+
+def normalize(value: Any) -> str | None:
+    """
+    Returns the form keys and indexed values are compared in: strings as they are and other
+    scalars as JSON, so that '5' and 5 are equal. Objects and arrays give None.
+    """
+    if isinstance(value, str):
+        return value
+    if value is None or isinstance(value, bool):
+        return _JSON_LITERALS[value]
+    if isinstance(value, int | float):
+        return str(value)
+    return None
+
+
+def _field_value(record: Any, field: str) -> str | None:
+    return normalize(record.get(field)) if isinstance(record, Mapping) else None
+
+
+def _has_fields(record: Any, wanted: Mapping[str, str | None]) -> bool:
+    if not isinstance(record, dict):
+        return not wanted
+    for field, value in wanted.items():
+        if normalize(record.get(field)) != value:
+            return False
+    return True
+
+
+def _with_value(record: dict[str, Any], path: tuple[str, ...], value: Any) -> dict[str, Any]:
+    """Returns a copy of the record with the value set at the path, copying the dicts along it."""
+    head, *rest = path
+    if rest:
+        child = record.get(head)
+        value = _with_value(child if isinstance(child, dict) else {}, tuple(rest), value)
+    return {**record, head: value}
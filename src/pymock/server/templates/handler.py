@@ -1,25 +1,87 @@
 # src/pymock/server/templates/handler.py
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+import threading
+from pathlib import Path
+from typing import ClassVar
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
 
 from pymock.server.exceptions import TemplateError, TemplateNotFoundError
 
+DEFAULT_TEMPLATE_CACHE_SIZE = 400
+
 
 class TemplateHandler:
-    """Manages Jinja2 template environment and rendering."""
+    """
+    Manages Jinja2 template environments and rendering.
+
+    One environment is kept per (templates_dir, autoescape) pair, so parsed templates stay in
+    its bounded LRU cache between renders. Compiled templates can additionally be persisted
+    in an on-disk bytecode cache, which survives restarts.
+    """
+
+    _envs: ClassVar[dict[tuple[str, bool], Environment]] = {}
+    _lock = threading.Lock()
+    _cache_size = DEFAULT_TEMPLATE_CACHE_SIZE
+    _auto_reload = True
+    _bytecode_cache: BytecodeCache | None = None
 
-    _env = None
+    @classmethod
+    def configure(
+        cls,
+        *,
+        cache_size: int = DEFAULT_TEMPLATE_CACHE_SIZE,
+        auto_reload: bool = True,
+        bytecode_cache_dir: str | None = None,
+    ) -> None:
+        """
+        Sets the options used for template environments. Existing environments are dropped.
+
+        Args:
+            cache_size: Maximum number of parsed templates kept per environment.
+            auto_reload: Whether to check template files for changes (by mtime) on every render.
+                Useful in development; disable it in production.
+            bytecode_cache_dir: Directory for compiled template bytecode, or None to disable it.
+        """
+        with cls._lock:
+            cls._cache_size = cache_size
+            cls._auto_reload = auto_reload
+            if bytecode_cache_dir:
+                Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+                cls._bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            else:
+                cls._bytecode_cache = None
+            cls._envs = {}
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drops all cached environments and purges the on-disk bytecode cache."""
+        with cls._lock:
+            cls._envs = {}
+            if cls._bytecode_cache is not None:
+                cls._bytecode_cache.clear()
 
     @classmethod
-    def _get_env(cls, templates_dir="templates"):
-        if cls._env is None:
-            cls._env = Environment(loader=FileSystemLoader(templates_dir), autoescape=True)
-        return cls._env
+    def _get_env(cls, templates_dir="templates", *, autoescape=True) -> Environment:
+        key = (str(templates_dir), autoescape)
+        env = cls._envs.get(key)
+        if env is None:
+            with cls._lock:
+                env = cls._envs.get(key)
+                if env is None:
+                    env = Environment(
+                        loader=FileSystemLoader(templates_dir),
+                        autoescape=autoescape,  # noqa: S701
+                        cache_size=cls._cache_size,
+                        auto_reload=cls._auto_reload,
+                        bytecode_cache=cls._bytecode_cache,
+                    )
+                    cls._envs = {**cls._envs, key: env}
+        return env
 
     @classmethod
     def render(cls, template_name: str, data: dict, templates_dir="templates", *, autoescape=True) -> str:
         try:
-            env = Environment(loader=FileSystemLoader(templates_dir), autoescape=autoescape)  # noqa: S701
-            template = env.get_template(template_name)
+            template = cls._get_env(templates_dir, autoescape=autoescape).get_template(template_name)
             return template.render(**data)
         except TemplateNotFound as e:
             msg = f"Failed to render template '{template_name}': {e}"
@@ -0,0 +1,96 @@
+# src/pymock/server/validation.py
+import logging
+from collections.abc import Mapping
+from itertools import islice
+from typing import Any
+
+from flask import Response
+from werkzeug.exceptions import BadRequest
+
+from pymock.config.validator import compile_schema
+from pymock.server.exceptions import ConfigError
+from pymock.server.response import json_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INVALID_STATUS = 400
+# Request targets a request_schema can validate, as captured for rules.
+VALIDATED_TARGETS = ("body", "params", "headers", "cookies")
+# Errors reported per response; validation stops looking for more after these.
+MAX_REPORTED_ERRORS = 10
+
+
+class RequestValidator:
+    """
+    Validates requests against the 'request_schema' of an endpoint, before its scenarios are
+    matched.
+
+    The JSON schema of each target is checked and its validator built once, when the endpoint
+    is compiled. Per request, a valid target costs one is_valid pass, and errors are only
+    collected for invalid ones.
+    """
+
+    __slots__ = ("status", "validators")
+
+    def __init__(self, validators: dict[str, Any], status: int = DEFAULT_INVALID_STATUS):
+        self.validators = validators
+        self.status = status
+
+    @classmethod
+    def from_config(cls, request_schema: dict[str, Any] | None, endpoint: str) -> "RequestValidator | None":
+        """
+        Builds the validator of a 'request_schema' endpoint setting, e.g.
+        {"status": 422, "body": {...}, "params": {...}}.
+
+        Args:
+            request_schema: The setting; None disables validation.
+            endpoint: The endpoint's method and path, for error messages.
+
+        Returns:
+            The RequestValidator, or None if there is nothing to validate.
+
+        Raises:
+            ConfigError: If one of the schemas is invalid.
+        """
+        if not request_schema:
+            return None
+        unknown = set(request_schema) - {"status", *VALIDATED_TARGETS}
+        if unknown:
+            msg = f"Invalid request_schema of {endpoint}: unknown keys {sorted(unknown)}"
+            raise ConfigError(msg)
+        validators = {
+            target: compile_schema(request_schema[target], f"request_schema.{target} of {endpoint}")
+            for target in VALIDATED_TARGETS
+            if target in request_schema
+        }
+        if not validators:
+            return None
+        return cls(validators, request_schema.get("status", DEFAULT_INVALID_STATUS))
+
+    def capture_rules(self) -> list[dict[str, str]]:
+        """Returns pseudo-rules making a RequestCapturePlan capture the validated targets whole."""
+        return [{"target": target, "prop": ""} for target in self.validators]
+
+    def validate(self, request_data: Mapping[str, Any]) -> Response | None:
+        """
+        Returns the error response for an invalid request, or None if it is valid. The response
+        lists the errors found, with the target and JSON path of each.
+        """
+        errors: list[dict[str, str]] = []
+        for target, validator in self.validators.items():
+            try:
+                instance = request_data[target]
+            except BadRequest:
+                errors.append({"target": target, "path": "$", "message": "Malformed JSON body"})
+                continue
+            if validator.is_valid(instance):
+                continue
+            errors.extend(
+                {"target": target, "path": error.json_path, "message": error.message}
+                for error in islice(validator.iter_errors(instance), MAX_REPORTED_ERRORS - len(errors))
+            )
+            if len(errors) >= MAX_REPORTED_ERRORS:
+                break
+        if not errors:
+            return None
+        return json_response({"error": "Invalid request", "details": errors}, self.status)
@@ -0,0 +1,220 @@
+# tests/test_asgi.py
+import asyncio
+import json
+import time
+
+import pytest
+from werkzeug.wrappers import Response
+
+from pymock.asgi import create_asgi_app
+from pymock.server import files
+
+
+@pytest.fixture
+def asgi_app():
+    """Fixture providing an ASGI app with a rule-based and a templated endpoint."""
+    endpoints_config = [
+        {
+            "path": "/hello",
+            "method": "POST",
+            "scenarios": [
+                {
+                    "scenario_name": "name is John",
+                    "rules": [{"target": "body", "prop": "$.name", "op": "equals", "value": "John"}],
+                    "response": {"status": 200, "data": {"greeting": "Hello John!"}},
+                },
+                {"scenario_name": "fallback", "rules": [], "response": {"status": 400, "data": {"error": "Not John"}}},
+            ],
+        },
+        {
+            "path": "/users/<user_id>",
+            "method": "GET",
+            "scenarios": [
+                {
+                    "scenario_name": "user",
+                    "rules": [],
+                    "response": {"data": {"page": "{{ request.args.get('page', '1') }}"}},
+                }
+            ],
+        },
+    ]
+    return create_asgi_app(endpoints_config)
+
+
+def _scope(method, path, *, query_string=b"", headers=()):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+def _call(app, method, path, *, query_string=b"", headers=(), body=b""):
+    """Runs one HTTP request through the ASGI app and returns (status, headers, body)."""
+    scope = _scope(method, path, query_string=query_string, headers=headers)
+    incoming = [
+        {"type": "http.request", "body": body[:3], "more_body": True},
+        {"type": "http.request", "body": body[3:]},
+    ]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, *body_messages = sent
+    return start["status"], dict(start["headers"]), b"".join(message["body"] for message in body_messages)
+
+
+def test_scenarios_match_request_body(asgi_app):
+    """Test that a chunked JSON body reaches the scenario rules."""
+    body = json.dumps({"name": "John"}).encode()
+    status, headers, response_body = _call(
+        asgi_app, "POST", "/hello", headers=[("Content-Type", "application/json")], body=body
+    )
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(response_body) == {"greeting": "Hello John!"}
+
+    status, _, _ = _call(asgi_app, "POST", "/hello", headers=[("Content-Type", "application/json")], body=b"{}")
+    assert status == 400
+
+
+def test_templates_see_query_parameters(asgi_app):
+    """Test that Jinja2 expressions read the request the ASGI scope describes."""
+    status, _, body = _call(asgi_app, "GET", "/users/7", query_string=b"page=3")
+    assert status == 200
+    assert json.loads(body) == {"page": "3"}
+
+
+def test_unknown_routes_and_methods(asgi_app):
+    """Test the 404 and 405 answers of the router."""
+    assert _call(asgi_app, "GET", "/missing")[0] == 404
+    assert _call(asgi_app, "DELETE", "/hello")[0] == 405
+
+
+def test_head_requests_have_no_body(asgi_app):
+    """Test that HEAD is answered by GET routes without a body."""
+    status, _, body = _call(asgi_app, "HEAD", "/users/7")
+    assert status == 200
+    assert body == b""
+
+
+def test_admin_routes(asgi_app):
+    """Test that the admin endpoints are served too."""
+    status, _, body = _call(asgi_app, "GET", "/__pymock/cache")
+    assert status == 200
+    assert json.loads(body)["entries"] == 0
+
+
+def test_delayed_responses_do_not_block_each_other():
+    """Test that many delayed responses are held concurrently on the event loop."""
+    app = create_asgi_app(
+        [
+            {
+                "path": "/slow",
+                "method": "GET",
+                "scenarios": [{"scenario_name": "slow", "rules": [], "response": {"delay": 200, "data": {}}}],
+            }
+        ]
+    )
+
+    async def call():
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        await app(_scope("GET", "/slow"), receive, send)
+        return sent[0]["status"]
+
+    async def call_many(n):
+        return await asyncio.gather(*(call() for _ in range(n)))
+
+    started = time.monotonic()
+    statuses = asyncio.run(call_many(500))
+    elapsed = time.monotonic() - started
+    assert statuses == [200] * 500
+    assert 0.2 <= elapsed < 1.5
+
+
+def test_blocking_handlers_run_off_the_event_loop():
+    """Test that a blocking fallback holds up neither other fallback calls nor static responses."""
+
+    def slow_fallback(source):
+        time.sleep(0.3)
+        return Response(source.path, status=200)
+
+    app = create_asgi_app(
+        [
+            {
+                "path": "/status",
+                "method": "GET",
+                "scenarios": [{"scenario_name": "ok", "rules": [], "response": {"data": {"ok": True}}}],
+            }
+        ],
+        fallback=slow_fallback,
+    )
+    finished = []
+
+    async def call(path):
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                finished.append(path)
+
+        await app(_scope("GET", path), receive, send)
+
+    async def call_all():
+        await asyncio.gather(*(call(f"/missing/{n}") for n in range(4)), call("/status"))
+
+    started = time.monotonic()
+    asyncio.run(call_all())
+    assert time.monotonic() - started < 1.0
+    assert finished[0] == "/status"
+    assert sorted(finished[1:]) == [f"/missing/{n}" for n in range(4)]
+
+
+def test_response_file_is_streamed(tmp_path, monkeypatch):
+    """Test that a response file is sent in chunks, with range support."""
+    monkeypatch.setattr(files, "CHUNK_SIZE", 4)
+    fixture = tmp_path / "export.csv"
+    fixture.write_bytes(b"id,name\n1,a\n2,b\n")
+    app = create_asgi_app(
+        [
+            {
+                "path": "/export",
+                "method": "GET",
+                "scenarios": [{"scenario_name": "file", "rules": [], "response": {"file": str(fixture)}}],
+            }
+        ]
+    )
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(_scope("GET", "/export"), receive, send))
+    assert sent[0]["status"] == 200
+    assert [message["body"] for message in sent[1:]] == [b"id,n", b"ame\n", b"1,a\n", b"2,b\n", b""]
+
+    status, headers, body = _call(app, "GET", "/export", headers=[("Range", "bytes=8-11")])
+    assert (status, headers[b"content-range"], body) == (206, b"bytes 8-11/16", b"1,a\n")
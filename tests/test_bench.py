@@ -0,0 +1,64 @@
+# tests/test_bench.py
+import json
+
+import pytest
+
+from pymock import bench
+from pymock.bench import BenchCase, BenchResult
+from pymock.cli import main
+from pymock.server.exceptions import ConfigError
+
+
+@pytest.mark.parametrize("response", bench.RESPONSE_KINDS)
+def test_every_response_kind_is_answered(response):
+    """Test that the request of each kind of case reaches its last scenario and gets a 200."""
+    result = bench.run_case(BenchCase(3, 4, 4, response, 2048), requests=5)
+    assert result.requests_per_second > 0
+    assert 0 < result.p50_us <= result.p99_us
+    assert result.alloc_kib > 0
+
+
+def test_generated_body_size(tmp_path):
+    """Test that generated responses serialize to about the requested size."""
+    endpoints = bench.generate_endpoints(BenchCase(2, 3, 2, "static", 65536), tmp_path)
+    assert [endpoint["path"] for endpoint in endpoints] == ["/bench/0/orders", "/bench/1/orders"]
+    assert len(endpoints[0]["scenarios"]) == 3
+    size = len(json.dumps(endpoints[0]["scenarios"][0]["response"]["data"]))
+    assert 60000 < size <= 65536
+
+
+def test_invalid_cases_are_rejected(tmp_path):
+    """Test that unknown response kinds and rule counts raise ConfigError."""
+    with pytest.raises(ConfigError, match="Unknown response kind"):
+        bench.generate_endpoints(BenchCase(1, 1, 1, "xml", 10), tmp_path)
+    with pytest.raises(ConfigError, match="1 to 4 rules"):
+        bench.generate_endpoints(BenchCase(1, 1, 5, "static", 10), tmp_path)
+
+
+def test_compare_reports_regressions():
+    """Test that lower throughput, or higher p99 or allocations, beyond the tolerance are reported."""
+    baseline = {"a": BenchResult(1000, 100, 200, 10), "b": BenchResult(1000, 100, 200, 10)}
+    results = {
+        "a": BenchResult(850, 120, 230, 11),
+        "b": BenchResult(700, 100, 300, 20),
+        "new": BenchResult(1, 1, 1, 1),
+    }
+    regressions = bench.compare(results, baseline, tolerance=0.2)
+    assert len(regressions) == 3
+    assert all(regression.startswith("b: ") for regression in regressions)
+
+
+def test_cli_saves_and_compares_baselines(tmp_path, capsys):
+    """Test that 'pymock bench' writes a baseline and fails when a case regressed against it."""
+    baseline_path = tmp_path / "baseline.json"
+    main(["bench", "e10-s3-r1-file", "-n", "5", "--save", str(baseline_path)])
+    baseline = json.loads(baseline_path.read_text())
+    assert list(baseline["cases"]) == ["e10-s3-r1-file-1024b"]
+    assert "e10-s3-r1-file-1024b" in capsys.readouterr().out
+
+    baseline["cases"]["e10-s3-r1-file-1024b"]["requests_per_second"] = 1e9
+    baseline_path.write_text(json.dumps(baseline))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["bench", "e10-s3-r1-file", "-n", "5", "--compare", str(baseline_path)])
+    assert exc_info.value.code == 1
+    assert "Regression: e10-s3-r1-file-1024b" in capsys.readouterr().err
@@ -0,0 +1,140 @@
+# tests/test_body.py
+import io
+import json
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+from pymock.app import create_app
+from pymock.server.body import BodyPolicy, reads_request_body
+from pymock.server.exceptions import ConfigError
+from pymock.server.metrics import Metrics
+
+DOCUMENT = {
+    "items": [{"sku": 'a]"{', "tags": ["x", {"deep": [1, 2.5e3]}]}, "\\", None, True],
+    "customer": {"id": 7, "name": "Zoë"},
+    "total": -12.5e-3,
+}
+
+
+class CountingStream(io.BytesIO):
+    """A body stream recording how many bytes were read from it."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.fixture(autouse=True)
+def reset_body_policy():
+    """Fixture restoring the default body policy after each test."""
+    yield
+    BodyPolicy.configure()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("keys", [{"customer"}, {"total"}, {"items", "total"}, {"missing"}])
+def test_read_keys_across_chunk_boundaries(chunk_size, keys):
+    """Test that the wanted keys are parsed as json.loads would, whatever the chunk size."""
+    raw = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode()
+    policy = BodyPolicy(stream=True, chunk_size=chunk_size)
+    assert policy.read_keys(io.BytesIO(raw), frozenset(keys)) == {k: DOCUMENT[k] for k in keys if k in DOCUMENT}
+
+
+def test_read_keys_stops_once_all_keys_are_found():
+    """Test that the stream is not read past the last wanted key."""
+    raw = json.dumps({"customer": {"tier": "gold"}, "items": ["x" * 1000] * 1000}).encode()
+    stream = CountingStream(raw)
+    assert BodyPolicy(stream=True, chunk_size=1024).read_keys(stream, frozenset({"customer"})) == {
+        "customer": {"tier": "gold"}
+    }
+    assert stream.bytes_read <= 1024
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [(b"[1, 2]", {}), (b' "text"', {}), (b"{}", {}), (b"", BadRequest), (b'{"a": [1, 2}', BadRequest)],
+)
+def test_read_keys_of_other_documents(raw, expected):
+    """Test that documents other than objects give no keys, and malformed ones a 400."""
+    policy = BodyPolicy(stream=True)
+    if expected is BadRequest:
+        with pytest.raises(BadRequest):
+            policy.read_keys(io.BytesIO(raw), frozenset({"a"}))
+    else:
+        assert policy.read_keys(io.BytesIO(raw), frozenset({"a"})) == expected
+
+
+def test_policy_from_config():
+    """Test that endpoint settings override the configured defaults."""
+    assert BodyPolicy.from_config(None) is None
+    BodyPolicy.configure(max_size=100, stream=True)
+    policy = BodyPolicy.from_config({"stream": False})
+    assert (policy.max_size, policy.stream) == (100, False)
+    assert BodyPolicy.from_config({"max_size": None, "stream": False}) is None
+    assert reads_request_body({"echo": "{{ request.json.id }}"})
+    assert not reads_request_body({"id": "{{ request.view_args.id }}"})
+    with pytest.raises(ConfigError, match="max_size"):
+        BodyPolicy(-1)
+
+
+def make_endpoint(request_body, data=None):
+    """Builds an order endpoint with the given request_body setting and a rule on the body."""
+    return {
+        "path": "/orders",
+        "method": "POST",
+        "request_body": request_body,
+        "scenarios": [
+            {
+                "scenario_name": "gold",
+                "rules": [{"target": "body", "prop": "$.customer.tier", "op": "equals", "value": "gold"}],
+                "response": {"status": 201, "data": data or {"tier": "gold"}},
+            },
+            {"scenario_name": "other", "rules": [], "response": {"data": {"tier": "other"}}},
+        ],
+    }
+
+
+def test_streamed_bodies_are_matched_on_the_keys_rules_use():
+    """Test that rules match a streamed body, which is read no further than their keys."""
+    client = create_app([make_endpoint({"stream": True})]).test_client()
+    raw = json.dumps({"customer": {"tier": "gold"}, "items": ["x" * 1000] * 1000}).encode()
+    stream = CountingStream(raw)
+    response = client.post("/orders", input_stream=stream, content_type="application/json", content_length=len(raw))
+    assert (response.status_code, response.get_json()) == (201, {"tier": "gold"})
+    assert stream.bytes_read < len(raw)
+    assert client.post("/orders", json={"items": [], "customer": {"tier": "silver"}}).get_json() == {"tier": "other"}
+
+
+def test_bodies_read_by_templates_are_not_streamed():
+    """Test that response data reading request.json still sees the whole body."""
+    endpoint = make_endpoint({"stream": True}, data={"count": "{{ request.json['items'] | length }}"})
+    client = create_app([endpoint]).test_client()
+    response = client.post("/orders", json={"customer": {"tier": "gold"}, "items": [1, 2, 3]})
+    assert response.get_json() == {"count": "3"}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_bodies_over_the_limit_are_rejected(stream):
+    """Test that a declared or chunked body over max_size gets a 413, counted as rejected."""
+    metrics = Metrics()
+    client = create_app([make_endpoint({"max_size": 64, "stream": stream})], metrics=metrics).test_client()
+    assert client.post("/orders", json={"customer": {"tier": "gold"}}).status_code == 201
+
+    response = client.post("/orders", json={"customer": {"tier": "gold"}, "note": "x" * 64})
+    assert (response.status_code, response.get_json()) == (413, {"error": "Request body too large"})
+    chunked = client.post(
+        "/orders",
+        input_stream=io.BytesIO(json.dumps({"note": "x" * 64, "customer": {"tier": "gold"}}).encode()),
+        content_type="application/json",
+        headers={"Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},
+    )
+    assert chunked.status_code == 413
+    labels = (("method", "POST"), ("path", "/orders"))
+    assert metrics.collect()[0][("pymock_rejected_requests_total", labels)] == 2
@@ -0,0 +1,104 @@
+# tests/test_cache.py
+import pytest
+
+from pymock.server.cache import CachedResponse, CachePolicy, ResponseCache
+from pymock.server.exceptions import ConfigError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(body=b"{}"):
+    return CachedResponse(200, [("Content-Type", "application/json")], body)
+
+
+def test_entries_expire_after_ttl():
+    """Test TTL expiry."""
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.set("key", _response(), ttl=30)
+    assert cache.get("key") == _response()
+
+    clock.now = 30
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    """Test LRU eviction by entry count and by total size."""
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", _response(b"1234"), ttl=60)
+    cache.set("b", _response(b"1234"), ttl=60)
+    cache.get("a")
+    cache.set("c", _response(b"1234"), ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    cache.set("d", _response(b"12345678"), ttl=60)
+    assert cache.stats() == {"entries": 1, "bytes": 8, "max_entries": 2, "max_bytes": 10}
+
+    cache.set("huge", _response(b"x" * 11), ttl=60)
+    assert cache.get("huge") is None
+
+
+def test_clear():
+    """Test flushing the cache."""
+    cache = ResponseCache()
+    cache.set("a", _response(), ttl=60)
+    assert cache.clear() == 1
+    assert cache.get("a") is None
+
+
+def test_policy_keys_on_declared_parts():
+    """Test that keys are built from the declared request parts."""
+    policy = CachePolicy.from_config({"ttl": 30, "key": ["params.id", "headers.X-Tenant", "body.$.items"]}, "scope")
+    request_data = {"params": {"id": "1", "page": "2"}, "headers": {"X-Tenant": "t1"}, "body": {"items": [1, 2]}}
+    assert policy.key(request_data) == ("scope", "1", "t1", (1, 2))
+    assert policy.key_rules()[0] == {"target": "params", "prop": "id"}
+
+
+def test_policy_header_parts_are_case_insensitive():
+    """Test that header key parts in any spelling read the title-cased captured headers."""
+    policy = CachePolicy.from_config({"ttl": 30, "key": ["headers.x-tenant", "headers.X-API-Key"]}, "scope")
+    assert policy.key_rules() == [{"target": "headers", "prop": "X-Tenant"}, {"target": "headers", "prop": "X-Api-Key"}]
+    assert policy.key({"headers": {"X-Tenant": "a", "X-Api-Key": "k"}}) == ("scope", "a", "k")
+
+
+def test_policy_default_key():
+    """Test the default key of path and query parameters."""
+    policy = CachePolicy.from_config({"ttl": 1}, "scope")
+    assert policy.key({"path": "/a", "params": {"b": "1", "a": "2"}}) == ("scope", "/a", (("a", "2"), ("b", "1")))
+
+
+def test_policy_keys_on_path_params():
+    """Test keys built from the variables of the URL rule, which are not captured from the request."""
+    policy = CachePolicy.from_config({"ttl": 30, "key": ["path_params.oid"]}, "scope")
+    assert policy.key({}, {"oid": "1"}) != policy.key({}, {"oid": "2"})
+    assert policy.key_rules() == []
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "yes",
+        {"ttl": 0},
+        {"ttl": True},
+        {"ttl": 5, "key": "params.id"},
+        {"ttl": 5, "key": ["oid"]},
+        {"ttl": 5, "key": ["param.id"]},
+    ],
+)
+def test_invalid_policy(spec):
+    """Test that malformed cache settings are rejected."""
+    with pytest.raises(ConfigError):
+        CachePolicy.from_config(spec, "scope")
+
+
+def test_disabled_policy():
+    """Test that a missing setting disables caching."""
+    assert CachePolicy.from_config(None, "scope") is None
@@ -0,0 +1,165 @@
+# tests/test_capture.py
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from werkzeug.datastructures import Headers
+
+from pymock.app import create_app
+from pymock.server.capture import INDEX_SUFFIX, CapturedResponse, CaptureKey, CaptureStore, CaptureWriter
+from pymock.server.exceptions import ConfigError
+from pymock.server.proxy import create_capture_fallback
+
+ENDPOINTS = [
+    {
+        "path": "/users",
+        "method": "GET",
+        "scenarios": [
+            {
+                "scenario_name": "admins",
+                "rules": [{"target": "params", "prop": "role", "op": "equals", "value": "admin"}],
+                "response": {"data": {"source": "mock"}},
+            }
+        ],
+    }
+]
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = f'{{"upstream": "{self.path}"}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Upstream", "yes")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    """Fixture running a small HTTP server to record from."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UpstreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _record(path, key, *responses):
+    writer = CaptureWriter(path)
+    for url, body in responses:
+        writer.append(key, CapturedResponse("GET", url, 200, [("Content-Type", "text/plain")], body))
+    writer.close()
+
+
+def test_store_reads_back_latest_recording(tmp_path):
+    """Test that recordings are found by key and the latest one of a key wins."""
+    path = tmp_path / "api.capture"
+    _record(path, b"a" * 16, ("/a", b"first"), ("/a", b"second"))
+    _record(path, b"b" * 16, ("/b", b"other"))
+
+    store = CaptureStore(path)
+    assert len(store) == 2
+    assert store.get(b"a" * 16).body == b"second"
+    assert store.get(b"b" * 16) == CapturedResponse("GET", "/b", 200, [("Content-Type", "text/plain")], b"other")
+    assert store.get(b"c" * 16) is None
+
+
+def test_short_writes_do_not_truncate_records(tmp_path, monkeypatch):
+    """Test that a record is completed when the file takes only part of it per write."""
+    write = os.write
+    monkeypatch.setattr(os, "write", lambda fd, data: write(fd, bytes(data[:7])))
+    path = tmp_path / "api.capture"
+    _record(path, b"a" * 16, ("/a", b"x" * 100), ("/b", b"y" * 50))
+    monkeypatch.undo()
+    assert CaptureStore(path).get(b"a" * 16) == CapturedResponse(
+        "GET", "/b", 200, [("Content-Type", "text/plain")], b"y" * 50
+    )
+
+
+def test_index_is_extended_and_rebuilt(tmp_path):
+    """Test that the index covers records appended after it was written, and is rebuilt if lost."""
+    path = tmp_path / "api.capture"
+    _record(path, b"a" * 16, ("/a", b"1"))
+    assert len(CaptureStore(path)) == 1
+
+    _record(path, b"b" * 16, ("/b", b"2"))
+    assert CaptureStore(path).get(b"b" * 16).body == b"2"
+
+    (tmp_path / f"api.capture{INDEX_SUFFIX}").unlink()
+    store = CaptureStore(path)
+    assert len(store) == 2
+    assert store.get(b"a" * 16).body == b"1"
+
+
+def test_rejects_files_that_are_not_captures(tmp_path):
+    """Test that a foreign file is reported as ConfigError rather than misread."""
+    path = tmp_path / "notes.txt"
+    path.write_text("hello")
+    with pytest.raises(ConfigError, match="not a PyMock capture file"):
+        CaptureStore(path)
+    with pytest.raises(ConfigError, match="Cannot open capture file"):
+        CaptureStore(tmp_path / "missing.capture")
+
+
+def test_key_normalizes_query_and_selects_headers():
+    """Test that the key ignores query order and unselected headers, but not the body."""
+    key = CaptureKey(["X-Tenant"])
+    base = key("get", "/users", "b=2&a=1", Headers({"X-Tenant": "t1", "X-Trace": "1"}), b"")
+    assert key("GET", "/users", "a=1&b=2", Headers({"x-tenant": "t1"}), b"") == base
+    assert key("GET", "/users", "a=1&b=2", Headers({"X-Tenant": "t2"}), b"") != base
+    assert key("GET", "/users", "a=1&b=2", Headers({"X-Tenant": "t1"}), b"{}") != base
+    assert CaptureKey(match_body=False)("POST", "/", "", Headers(), b"1") == CaptureKey(match_body=False)(
+        "POST", "/", "", Headers(), b"2"
+    )
+
+
+def test_record_then_replay(tmp_path, upstream):
+    """Test that unmatched requests are proxied and recorded, then replayed without the upstream."""
+    capture_file = str(tmp_path / "api.capture")
+    recording = create_app(
+        ENDPOINTS,
+        fallback=create_capture_fallback({"mode": "record", "file": capture_file, "upstream": upstream}),
+    ).test_client()
+    assert recording.get("/users?role=admin").json == {"source": "mock"}
+    response = recording.get("/users?role=guest")
+    assert response.json == {"upstream": "/users?role=guest"}
+    assert response.headers["X-Upstream"] == "yes"
+    assert recording.get("/orders/7").json == {"upstream": "/orders/7"}
+
+    for router in ("werkzeug", "trie"):
+        replaying = create_app(
+            ENDPOINTS,
+            router=router,
+            fallback=create_capture_fallback({"mode": "replay", "file": capture_file}),
+        ).test_client()
+        assert replaying.get("/users?role=guest").json == {"upstream": "/users?role=guest"}
+        assert replaying.get("/orders/7").json == {"upstream": "/orders/7"}
+        assert replaying.get("/users?role=admin").json == {"source": "mock"}
+        assert replaying.get("/orders/8").status_code == 404
+
+
+def test_unreachable_upstream_is_not_recorded(tmp_path):
+    """Test that a failed upstream request answers 502 and leaves the capture empty."""
+    capture_file = tmp_path / "api.capture"
+    fallback = create_capture_fallback({"mode": "record", "file": str(capture_file), "upstream": "http://127.0.0.1:9"})
+    response = create_app(ENDPOINTS, fallback=fallback).test_client().get("/orders/7")
+    assert response.status_code == 502
+    assert len(CaptureStore(capture_file)) == 0
+
+
+def test_capture_config_errors(tmp_path):
+    """Test that inconsistent capture settings are reported as ConfigError."""
+    assert create_capture_fallback({}) is None
+    with pytest.raises(ConfigError, match="requires an upstream"):
+        create_capture_fallback({"mode": "record", "file": str(tmp_path / "a.capture")})
+    with pytest.raises(ConfigError, match="Invalid upstream"):
+        create_capture_fallback({"mode": "record", "file": str(tmp_path / "a.capture"), "upstream": "localhost"})
+    with pytest.raises(ConfigError, match="Unknown capture mode"):
+        create_capture_fallback({"mode": "tee"})
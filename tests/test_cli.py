@@ -0,0 +1,137 @@
+# tests/test_cli.py
+import pytest
+from flask import Flask
+
+from pymock import cli, serve
+from pymock.asgi import AsgiApp
+from pymock.config.loader import get_config
+from pymock.server import prefork, proxy, reload, router
+
+
+@pytest.fixture
+def config(monkeypatch):
+    """Fixture replacing the loaded config with a minimal one."""
+    config = {"server": {"host": "127.0.0.1", "port": 5000}, "endpoints": []}
+    monkeypatch.setattr(serve, "get_config", lambda _path: config)
+    return config
+
+
+@pytest.fixture
+def app_runs(monkeypatch):
+    """Fixture recording the arguments of Flask.run instead of starting a server."""
+    calls = []
+    monkeypatch.setattr(Flask, "run", lambda _self, **kwargs: calls.append(kwargs))
+    return calls
+
+
+@pytest.fixture
+def prefork_servers(monkeypatch):
+    """Fixture recording PreforkServer instances instead of forking workers."""
+    servers = []
+
+    class FakePreforkServer:
+        def __init__(self, app, host, port, **kwargs):
+            self.app, self.host, self.port, self.kwargs = app, host, port, kwargs
+            self.ran = False
+            servers.append(self)
+
+        def run(self):
+            self.ran = True
+
+    monkeypatch.setattr(serve, "PreforkServer", FakePreforkServer)
+    return servers
+
+
+def test_legacy_invocation_runs_serve(config, app_runs, prefork_servers):
+    """Test that 'pymock config.yaml' still starts the single-process server."""
+    cli.main(["config.yaml"])
+    assert app_runs == [{"host": "127.0.0.1", "port": 5000, "debug": False, "threaded": True}]
+    assert prefork_servers == []
+
+
+def test_workers_flag_starts_prefork_server(config, app_runs, prefork_servers):
+    """Test that command-line flags override the server config and select the prefork server."""
+    config["server"].update({"workers": 2, "max_requests": 100, "keepalive": 2})
+    cli.main(["serve", "config.yaml", "--workers", "3", "--max-requests-jitter", "10", "--reuse-port"])
+
+    assert app_runs == []
+    [server] = prefork_servers
+    assert isinstance(server.app, Flask)
+    assert (server.host, server.port) == ("127.0.0.1", 5000)
+    assert server.ran
+    assert server.kwargs == {
+        "workers": 3,
+        "max_requests": 100,
+        "max_requests_jitter": 10,
+        "keepalive": 2,
+        "backlog": cli.DEFAULT_BACKLOG,
+        "reuse_port": True,
+        "graceful_timeout": cli.DEFAULT_GRACEFUL_TIMEOUT,
+    }
+
+
+def test_single_worker_keeps_threaded_server(config, app_runs, prefork_servers):
+    """Test that --workers 1 does not fork."""
+    config["server"]["workers"] = 4
+    cli.main(["config.yaml", "--workers", "1"])
+    assert len(app_runs) == 1
+    assert prefork_servers == []
+
+
+def test_asgi_engine(config, app_runs, prefork_servers, monkeypatch):
+    """Test that --engine asgi serves the ASGI app instead of Flask."""
+    served = []
+    monkeypatch.setattr(serve, "_run_asgi", lambda app, host, port, _server_conf: served.append((app, host, port)))
+    cli.main(["serve", "config.yaml", "--engine", "asgi"])
+    [(app, host, port)] = served
+    assert isinstance(app, AsgiApp)
+    assert (host, port) == ("127.0.0.1", 5000)
+    assert app_runs == []
+    assert prefork_servers == []
+
+
+def test_compile_command(tmp_path, capsys):
+    """Test that 'pymock compile' writes a snapshot that 'serve' accepts."""
+    (tmp_path / "endpoints").mkdir()
+    (tmp_path / "endpoints" / "a.yaml").write_text("path: /a\nmethod: GET\n", encoding="utf-8")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f"server: {{port: 8080}}\nendpoints_path: ['{tmp_path / 'endpoints'}']\n", encoding="utf-8")
+    snapshot_path = tmp_path / "out.snapshot"
+
+    cli.main(["compile", str(config_file), "-o", str(snapshot_path)])
+    assert "Compiled 1 endpoints from 1 files" in capsys.readouterr().out
+    assert get_config(str(snapshot_path))["endpoints"] == [{"path": "/a", "method": "GET"}]
+
+
+def test_watch_serves_reloaded_routes(config, app_runs, monkeypatch):
+    """Test that --watch starts a reloader and serves its live route table."""
+    started = []
+
+    def record_start(reloader):
+        started.append(reloader)
+
+    monkeypatch.setattr(serve.EndpointReloader, "start", record_start)
+    cli.main(["serve", "config.yaml", "--watch", "--watch-interval", "0.5"])
+    [reloader] = started
+    assert reloader.interval == 0.5
+    assert len(app_runs) == 1
+
+
+def test_watch_rejects_multiple_workers(config, app_runs, prefork_servers, capsys):
+    """Test that watch mode cannot be combined with pre-forked workers."""
+    with pytest.raises(SystemExit):
+        cli.main(["serve", "config.yaml", "--watch", "--workers", "2"])
+    assert "cannot be combined with multiple workers" in capsys.readouterr().err
+    assert prefork_servers == []
+
+
+def test_help_choices_and_defaults_match_the_server():
+    """Test that the choices and defaults the CLI repeats agree with the server modules."""
+    assert cli.ROUTERS == router.ROUTERS
+    assert cli.CAPTURE_MODES == proxy.CAPTURE_MODES
+    assert cli.DEFAULT_WATCH_INTERVAL == reload.DEFAULT_WATCH_INTERVAL
+    assert (cli.DEFAULT_KEEPALIVE, cli.DEFAULT_BACKLOG, cli.DEFAULT_GRACEFUL_TIMEOUT) == (
+        prefork.DEFAULT_KEEPALIVE,
+        prefork.DEFAULT_BACKLOG,
+        prefork.DEFAULT_GRACEFUL_TIMEOUT,
+    )
@@ -107,3 +107,57 @@ def test_invalid_schema(temp_config):
         yaml.dump({"invalid_key": "value"}, f)
     with pytest.raises(ConfigError, match="Configuration error"):
         get_config(temp_config)
+
+
+def _write_endpoints(endpoints_dir, count):
+    endpoints_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (endpoints_dir / f"e{i:03}.yml").write_text(f"path: /e{i}\nmethod: GET\n", encoding="utf-8")
+
+
+def test_multi_document_and_list_files(tmp_path):
+    """Test .yml files, multi-document files and lists of endpoints, in a stable order."""
+    endpoints_dir = tmp_path / "endpoints"
+    (endpoints_dir / "b").mkdir(parents=True)
+    (endpoints_dir / "b" / "one.yml").write_text("path: /b\nmethod: GET\n", encoding="utf-8")
+    (endpoints_dir / "a.yaml").write_text(
+        "path: /a1\nmethod: GET\n---\n- path: /a2\n  method: GET\n- path: /a3\n  method: POST\n---\n",
+        encoding="utf-8",
+    )
+    (endpoints_dir / "notes.txt").write_text("path: /ignored\n", encoding="utf-8")
+
+    endpoints = ConfigLoader._scan_endpoint_dirs([str(endpoints_dir)])
+    assert [endpoint["path"] for endpoint in endpoints] == ["/a1", "/a2", "/a3", "/b"]
+
+
+def test_process_pool_keeps_file_order(tmp_path, monkeypatch, caplog):
+    """Test that parsing in worker processes returns endpoints in file order and reports bad files."""
+    monkeypatch.setattr("pymock.config.loader.MIN_FILES_FOR_PROCESS_POOL", 2)
+    endpoints_dir = tmp_path / "endpoints"
+    _write_endpoints(endpoints_dir, 40)
+    (endpoints_dir / "e020.yml").write_text("invalid: yaml: content", encoding="utf-8")
+
+    endpoints = ConfigLoader._scan_endpoint_dirs([str(endpoints_dir)], {"workers": 2, "chunk_size": 3})
+    assert [endpoint["path"] for endpoint in endpoints] == [f"/e{i}" for i in range(40) if i != 20]
+    assert "e020.yml" in caplog.text
+
+
+def test_slow_files_are_reported(tmp_path, caplog):
+    """Test that files slower than slow_file_ms are logged."""
+    endpoints_dir = tmp_path / "endpoints"
+    _write_endpoints(endpoints_dir, 1)
+    ConfigLoader._scan_endpoint_dirs([str(endpoints_dir)], {"slow_file_ms": 0})
+    assert "took" in caplog.text
+
+
+def test_invalid_endpoints_are_reported(tmp_path, caplog):
+    """Test that endpoint files are validated, and files with an invalid endpoint reported and skipped."""
+    endpoints_dir = tmp_path / "endpoints"
+    _write_endpoints(endpoints_dir, 2)
+    (endpoints_dir / "e001.yml").write_text(
+        "path: /bad\nmethod: GET\nscenarios:\n  - response: {status: '200'}\n", encoding="utf-8"
+    )
+
+    endpoints = ConfigLoader._scan_endpoint_dirs([str(endpoints_dir)])
+    assert [endpoint["path"] for endpoint in endpoints] == ["/e0"]
+    assert "Invalid endpoint GET /bad: '200' is not of type 'integer' at $.scenarios[0].response.status" in caplog.text
@@ -0,0 +1,41 @@
+# tests/test_dispatch.py
+import pytest
+
+from pymock.server.dispatch import ScenarioIndex
+
+
+def _account_scenario(account_id):
+    return {"rules": [{"target": "body", "prop": "$.accountId", "op": "equals", "value": account_id}]}
+
+
+@pytest.fixture
+def scenario_configs():
+    return [
+        _account_scenario("a1"),
+        _account_scenario("a2"),
+        {"rules": [{"target": "params", "prop": "debug", "op": "equals", "value": "1"}]},
+        _account_scenario("a3"),
+        _account_scenario("a1"),
+        {"rules": []},
+    ]
+
+
+def test_candidates_keep_declaration_order(scenario_configs):
+    """Test that a bucket is merged in order with the scenarios that are not indexed."""
+    index = ScenarioIndex.build(scenario_configs)
+    assert list(index.candidates({"body": {"accountId": "a1"}})) == [0, 2, 4, 5]
+    assert list(index.candidates({"body": {"accountId": "a3"}})) == [2, 3, 5]
+
+
+def test_unknown_or_missing_values_fall_back_to_unindexed(scenario_configs):
+    """Test lookups that cannot hit a bucket."""
+    index = ScenarioIndex.build(scenario_configs)
+    assert list(index.candidates({"body": {"accountId": "zz"}})) == [2, 5]
+    assert list(index.candidates({"body": "not json"})) == [2, 5]
+    assert list(index.candidates({"body": {"accountId": ["a1"]}})) == [2, 5]
+
+
+def test_few_scenarios_are_not_indexed():
+    """Test that small endpoints keep a plain linear scan."""
+    index = ScenarioIndex.build([_account_scenario("a1"), {"rules": []}])
+    assert list(index.candidates({"body": {"accountId": "other"}})) == [0, 1]
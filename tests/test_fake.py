@@ -0,0 +1,95 @@
+# tests/test_fake.py
+import time
+
+import pytest
+
+from pymock.app import create_app
+from pymock.server.exceptions import ConfigError
+from pymock.server.fake import FakePool, fake_providers_in
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_pool():
+    """Fixture restoring the default options of the shared pool after each test."""
+    yield
+    FakePool.configure()
+
+
+def wait_for_pool(pool, name, size):
+    """Waits until the pool of a provider holds at least size values."""
+    deadline = time.monotonic() + 10
+    while len(getattr(pool, name).values) < size:
+        assert time.monotonic() < deadline, f"fake.{name}() was not refilled"
+        time.sleep(0.01)
+
+
+def test_values_are_served_from_pools_filled_in_the_background():
+    """Test that warmed pools are filled up to their size, and that calls pop from them."""
+    pool = FakePool(pool_size=100)
+    pool.warm(["name", "no_such_provider"])
+    wait_for_pool(pool, "name", 100)
+
+    expected = pool.name.values[0]
+    assert pool.name() == expected
+    assert len(pool.name.values) >= 99
+
+
+def test_seeded_pools_are_reproducible():
+    """Test that a seed gives each provider the same values, whether or not its pool was warmed."""
+    warmed = FakePool(pool_size=10, seed=42)
+    warmed.warm(["name"])
+    wait_for_pool(warmed, "name", 10)
+    cold = FakePool(pool_size=10, seed=42)
+
+    names = [cold.name() for _ in range(25)]
+    cold.email()
+    assert [warmed.name() for _ in range(25)] == names
+    assert FakePool(pool_size=10, seed=43).name() != names[0]
+
+
+def test_calls_with_arguments_and_attributes_bypass_pools():
+    """Test that provider calls with arguments and non-callable attributes go to Faker."""
+    pool = FakePool(pool_size=10, seed=1)
+    assert 5 <= pool.pyint(min_value=5, max_value=6) <= 6
+    assert not pool.pyint.values
+    assert pool.locales == ["en_US"]
+    with pytest.raises(AttributeError):
+        _ = pool.no_such_provider
+
+
+def test_forked_children_refill_unseeded_pools():
+    """Test that after forking, unseeded pools drop the inherited values and seeded ones keep them."""
+    unseeded, seeded = FakePool(pool_size=10), FakePool(pool_size=10, seed=7)
+    for pool in (unseeded, seeded):
+        pool.warm(["name"])
+        wait_for_pool(pool, "name", 10)
+    inherited_unseeded, inherited_seeded = list(unseeded.name.values), list(seeded.name.values)
+
+    for pool in (unseeded, seeded):
+        pool._after_fork_in_child()
+    assert seeded.name() == inherited_seeded[0]
+    wait_for_pool(unseeded, "name", 10)
+    assert list(unseeded.name.values)[:10] != inherited_unseeded
+
+
+def test_templates_use_the_configured_pool():
+    """Test that the 'fake' global of templates is the shared pool, warmed from response data."""
+    data = {"name": "{{ fake.name() }}", "city": "{{ fake.city() }}", "n": "{{ fake.pyint(max_value=3) }}"}
+    assert fake_providers_in(data) == {"name", "city"}
+
+    FakePool.configure(pool_size=10, seed="demo")
+    endpoints = [{"path": "/people", "method": "GET", "scenarios": [{"rules": [], "response": {"data": data}}]}]
+    first = create_app(endpoints).test_client().get("/people").get_json()
+    FakePool.configure(pool_size=10, seed="demo")
+    second = create_app(endpoints).test_client().get("/people").get_json()
+    assert first["name"] == second["name"] == FakePool(seed="demo").name()
+    assert first["city"] == second["city"]
+
+
+def test_invalid_options():
+    """Test that invalid pool sizes are rejected, and invalid locales once Faker is loaded."""
+    with pytest.raises(ConfigError, match="pool size"):
+        FakePool(pool_size=0)
+    pool = FakePool(locale="xx_YY")
+    with pytest.raises(ConfigError, match="locale"):
+        pool.name()
@@ -0,0 +1,99 @@
+# tests/test_files.py
+import os
+
+import pytest
+from werkzeug.test import EnvironBuilder
+
+from pymock.server import files
+from pymock.server.exceptions import ConfigError
+from pymock.server.files import FileResponse
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    """Fixture writing a 10 KiB binary file."""
+    path = tmp_path / "export.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def _get(file_response, method="GET", **headers):
+    response = file_response.to_flask_response(EnvironBuilder(method=method, headers=headers).get_request())
+    return response, b"".join(response.iter_encoded()) if method != "HEAD" else b""
+
+
+def test_serves_whole_file_in_chunks(fixture_file, monkeypatch):
+    """Test that the body is streamed from the mapping in CHUNK_SIZE pieces."""
+    monkeypatch.setattr(files, "CHUNK_SIZE", 4096)
+    response, body = _get(FileResponse(str(fixture_file)))
+    assert response.status_code == 200
+    assert body == CONTENT
+    assert response.headers["Content-Length"] == str(len(CONTENT))
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Content-Type"] == "application/octet-stream"
+    assert [len(chunk) for chunk in files._iter_chunks(CONTENT, 0, len(CONTENT))] == [4096, 4096, 2048]
+
+
+@pytest.mark.parametrize(
+    ("range_header", "expected_status", "expected_body", "content_range"),
+    [
+        ("bytes=0-9", 206, CONTENT[:10], "bytes 0-9/10240"),
+        ("bytes=10000-", 206, CONTENT[10000:], "bytes 10000-10239/10240"),
+        ("bytes=-16", 206, CONTENT[-16:], "bytes 10224-10239/10240"),
+        ("bytes=0-1,5-6", 200, CONTENT, None),
+        ("bytes=20000-", 416, b"", "bytes */10240"),
+        ("items=0-1", 200, CONTENT, None),
+    ],
+    ids=["first-bytes", "open-ended", "suffix", "several", "unsatisfiable", "other-unit"],
+)
+def test_range_requests(fixture_file, range_header, expected_status, expected_body, content_range):
+    """Test single, suffix, multiple, unsatisfiable and unknown-unit ranges."""
+    response, body = _get(FileResponse(str(fixture_file)), Range=range_header)
+    assert response.status_code == expected_status
+    assert body == expected_body
+    assert response.headers.get("Content-Range") == content_range
+
+
+def test_if_range_and_if_none_match(fixture_file):
+    """Test that ranges only apply to the current version, and 304 for a cached copy."""
+    file_response = FileResponse(str(fixture_file))
+    response, body = _get(file_response, Range="bytes=0-9", **{"If-Range": '"stale"'})
+    assert (response.status_code, body) == (200, CONTENT)
+
+    response, _ = _get(file_response, Range="bytes=0-9", **{"If-Range": file_response.etag})
+    assert response.status_code == 206
+
+    response, body = _get(file_response, **{"If-None-Match": file_response.etag})
+    assert (response.status_code, body) == (304, b"")
+
+
+def test_non_ok_status_ignores_conditional_headers(fixture_file):
+    """Test that a configured error status is always returned with the whole file."""
+    response, body = _get(FileResponse(str(fixture_file), 503), Range="bytes=0-9")
+    assert (response.status_code, body) == (503, CONTENT)
+
+
+def test_content_type_and_empty_file(tmp_path):
+    """Test content type guessing, overrides, and files too small to map."""
+    json_file = tmp_path / "fixture.json"
+    json_file.write_bytes(b"")
+    assert FileResponse(str(json_file)).content_type == "application/json"
+    assert FileResponse(str(json_file), content_type="text/plain").content_type == "text/plain"
+    response, body = _get(FileResponse(str(json_file)))
+    assert (response.status_code, body, response.headers["Content-Length"]) == (200, b"", "0")
+
+
+def test_missing_file_is_a_config_error(tmp_path):
+    """Test that a missing file is reported when the endpoint is compiled."""
+    with pytest.raises(ConfigError, match="Cannot serve response file"):
+        FileResponse(str(tmp_path / "missing.bin"))
+
+
+def test_etag_follows_file_version(fixture_file):
+    """Test that the ETag changes with the file's modification time."""
+    first = FileResponse(str(fixture_file)).etag
+    stat = fixture_file.stat()
+    os.utime(fixture_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert FileResponse(str(fixture_file)).etag != first
@@ -0,0 +1,48 @@
+# tests/test_imports.py
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time allowed for the CLI, in seconds: far above what the standard library
+# takes, and far below what Flask, Jinja2 and Faker take together.
+CLI_IMPORT_BUDGET = 0.25
+
+
+def import_times(module):
+    """Imports a module in a fresh interpreter and returns the cumulative import time of each module."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def slowest(times, count=10):
+    """Formats the slowest imports, as a hint of what to make lazy."""
+    return ", ".join(
+        f"{name} {seconds * 1000:.0f}ms" for name, seconds in sorted(times.items(), key=lambda item: -item[1])[:count]
+    )
+
+
+def test_cli_imports_no_heavy_dependencies():
+    """Test that importing the CLI, as 'pymock --version' does, stays fast and light."""
+    times = import_times("pymock.cli")
+    heavy = {"flask", "jinja2", "faker", "jsonschema", "yaml", "ruleenginex"} & set(times)
+    assert not heavy, f"pymock.cli imports {sorted(heavy)}; slowest imports: {slowest(times)}"
+    assert times["pymock.cli"] < CLI_IMPORT_BUDGET, f"Slowest imports: {slowest(times)}"
+
+
+@pytest.mark.parametrize("module", ["pymock.app", "pymock.server.create_endpoint_blueprint"])
+def test_faker_and_jsonschema_load_on_first_use(module):
+    """Test that creating apps does not import Faker and jsonschema until they are needed."""
+    times = import_times(module)
+    assert not {"faker", "jsonschema"} & set(times), f"Slowest imports: {slowest(times)}"
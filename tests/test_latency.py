@@ -0,0 +1,74 @@
+# tests/test_latency.py
+import random
+import statistics
+
+import pytest
+
+from pymock.server.exceptions import ConfigError
+from pymock.server.latency import DELAY_ENVIRON_KEY, Delay, remaining_delay
+
+
+@pytest.fixture(autouse=True)
+def _seed():
+    random.seed(1234)
+
+
+def _samples(spec, n=20_000):
+    delay = Delay.from_config(spec)
+    return sorted(delay.sample() * 1000 for _ in range(n))
+
+
+def test_fixed_delay():
+    """Test that plain numbers and 'fixed' are milliseconds."""
+    assert Delay.from_config(250).sample() == 0.25
+    assert Delay.from_config({"fixed": 10}).sample() == 0.01
+    assert Delay.from_config(None) is None
+
+
+def test_distributions_respect_their_parameters():
+    """Test the uniform, normal and log-normal samplers."""
+    uniform = _samples({"uniform": [100, 200]})
+    assert 100 <= uniform[0] and uniform[-1] <= 200
+
+    normal = _samples({"normal": {"mean": 100, "stddev": 10}})
+    assert statistics.mean(normal) == pytest.approx(100, rel=0.02)
+
+    lognormal = _samples({"lognormal": {"median": 50, "sigma": 0.5}, "max": 120})
+    assert statistics.median(lognormal) == pytest.approx(50, rel=0.05)
+    assert lognormal[-1] == 120
+
+
+def test_percentile_table_reproduces_tail_latencies():
+    """Test that the sampled percentiles match the configured table."""
+    samples = _samples({"p50": 100, "p95": 400, "p99": 1000})
+    assert samples[len(samples) // 2] == pytest.approx(100, rel=0.05)
+    assert samples[int(len(samples) * 0.95)] == pytest.approx(400, rel=0.05)
+    assert samples[int(len(samples) * 0.99)] == pytest.approx(1000, rel=0.05)
+    assert samples[-1] <= 1000
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        -1,
+        "100ms",
+        {},
+        {"max": 10},
+        {"gamma": 1},
+        {"uniform": [5, 1]},
+        {"normal": {"mean": 10}},
+        {"lognormal": {"median": 0, "sigma": 1}},
+        {"p50": 100, "p99": 50},
+        {"p50": 100, "fixed": 5},
+    ],
+)
+def test_invalid_delay(spec):
+    """Test that malformed delay settings are rejected."""
+    with pytest.raises(ConfigError):
+        Delay.from_config(spec)
+
+
+def test_remaining_delay_deducts_handling_time():
+    """Test that time spent handling the request counts towards the delay."""
+    assert remaining_delay({}, 0.0) == 0.0
+    assert remaining_delay({DELAY_ENVIRON_KEY: 0.5}, float("-inf")) == 0.0
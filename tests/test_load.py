@@ -0,0 +1,130 @@
+# tests/test_load.py
+import json
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from pymock import load
+from pymock.app import create_app
+from pymock.cli import main
+from pymock.server.exceptions import ConfigError
+
+ENDPOINTS = [
+    {
+        "path": "/users/<int:user_id>",
+        "method": "GET",
+        "scenarios": [
+            {
+                "scenario_name": "admin",
+                "rules": [{"target": "params", "prop": "role", "op": "equals", "value": "admin"}],
+                "response": {"data": {"role": "admin"}},
+            },
+            {
+                "scenario_name": "tenant",
+                "rules": [{"target": "headers", "prop": "X-Tenant", "op": "equals", "value": "acme"}],
+                "response": {"data": {"tenant": "acme"}},
+            },
+        ],
+    },
+    {
+        "path": "/orders",
+        "method": "POST",
+        "scenarios": [
+            {
+                "scenario_name": "vip",
+                "rules": [{"target": "body", "prop": "$.customer.tier", "op": "equals", "value": "vip"}],
+                "response": {"status": 201, "data": {"vip": True}},
+            }
+        ],
+    },
+]
+
+
+@pytest.fixture
+def server():
+    """Fixture serving ENDPOINTS on a free local port."""
+    httpd = make_server("127.0.0.1", 0, create_app(ENDPOINTS), threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def config(monkeypatch):
+    """Fixture replacing the loaded config with ENDPOINTS."""
+    monkeypatch.setattr(load, "get_config", lambda _path: {"endpoints": ENDPOINTS})
+
+
+def test_requests_from_config_satisfy_rules(config):
+    """Test that one request is built per scenario, matching its equals rules."""
+    requests = load.requests_from_config("config.yaml")
+    assert [(request.method, request.path, request.endpoint) for request in requests] == [
+        ("GET", "/users/1?role=admin", "GET /users/<int:user_id>"),
+        ("GET", "/users/1", "GET /users/<int:user_id>"),
+        ("POST", "/orders", "POST /orders"),
+    ]
+    assert requests[1].headers == {"X-Tenant": "acme"}
+    assert json.loads(requests[2].body) == {"customer": {"tier": "vip"}}
+    assert requests[2].headers["Content-Type"] == "application/json"
+
+
+def test_read_corpus(tmp_path):
+    """Test that corpus lines are parsed, and invalid ones reported with their line number."""
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text(
+        '{"method": "post", "path": "/orders", "body": {"id": 1}}\n\n{"path": "users?x=1", "endpoint": "users"}\n'
+    )
+    first, second = load.read_corpus(corpus)
+    assert (first.method, first.path, first.endpoint, first.body) == ("POST", "/orders", "POST /orders", b'{"id": 1}')
+    assert (second.method, second.path, second.endpoint) == ("GET", "/users?x=1", "users")
+
+    corpus.write_text('{"path": "/a"}\n{"method": "GET"}\n')
+    with pytest.raises(ConfigError, match="line 2"):
+        load.read_corpus(corpus)
+
+
+def test_closed_loop_reports_per_endpoint(config, server):
+    """Test that a closed-loop run hits every endpoint and gets its scenarios' responses."""
+    plan = load.LoadPlan(server, load.requests_from_config("config.yaml"), 0.5, 2, None, 5.0)
+    summary = load.summarize(load.run_load(plan), plan.duration)
+    users = summary["endpoints"]["GET /users/<int:user_id>"]
+    orders = summary["endpoints"]["POST /orders"]
+    assert users["requests"] > 0
+    assert set(users["statuses"]) == {"200"}
+    assert set(orders["statuses"]) == {"201"}
+    assert summary["total"]["requests"] == users["requests"] + orders["requests"]
+    assert summary["total"]["errors"] == 0
+    assert 0 < summary["total"]["p50_ms"] <= summary["total"]["p99_ms"] <= summary["total"]["max_ms"]
+
+
+def test_open_loop_holds_the_rate(config, server):
+    """Test that an open-loop run sends about rate x duration requests."""
+    plan = load.LoadPlan(server, load.requests_from_config("config.yaml"), 1.0, 2, 40.0, 5.0)
+    summary = load.summarize(load.run_load(plan), plan.duration)
+    assert 35 <= summary["total"]["requests"] <= 41
+
+
+def test_cli_load_with_several_processes(server, tmp_path, capsys):
+    """Test that 'pymock load' spreads a corpus over processes and writes a JSON summary."""
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text('{"path": "/users/1?role=admin"}\n{"method": "POST", "path": "/orders", "body": {}}\n')
+    output = tmp_path / "summary.json"
+    main(
+        ["load", "--corpus", str(corpus), "--target", server, "-d", "0.5", "-c", "2", "-p", "2", "--json", str(output)]
+    )
+
+    summary = json.loads(output.read_text())
+    assert set(summary["endpoints"]) == {"GET /users/1", "POST /orders"}
+    assert summary["endpoints"]["POST /orders"]["statuses"] == {"404": summary["endpoints"]["POST /orders"]["requests"]}
+    assert "total" in capsys.readouterr().out
+
+
+def test_unreachable_target_counts_errors():
+    """Test that connection failures are counted rather than raised."""
+    requests = [load.LoadRequest("GET", "/", {}, b"", "GET /")]
+    stats = load.run_load(load.LoadPlan("http://127.0.0.1:9", requests, 0.2, 1, 20.0, 1.0))
+    assert stats["GET /"].errors > 0
+    with pytest.raises(ConfigError, match="Invalid target"):
+        load.run_load(load.LoadPlan("localhost:8085", requests, 0.2, 1, None, 1.0))
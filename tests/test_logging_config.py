@@ -0,0 +1,114 @@
+# tests/test_logging_config.py
+import json
+import logging
+import queue
+
+import pytest
+
+from pymock import logging_config
+from pymock.app import create_app
+from pymock.logging_config import DroppingQueueHandler, setup_logging, stop_logging
+from pymock.server import access_log
+from pymock.server.access_log import ACCESS_LOGGER_NAME, AccessLog
+from pymock.server.exceptions import ConfigError
+
+ENDPOINTS = [
+    {
+        "path": "/users",
+        "method": "GET",
+        "scenarios": [{"scenario_name": "all users", "rules": [], "response": {"data": [{"id": 1}]}}],
+    }
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """Fixture restoring the handlers and levels of the root and access loggers."""
+    root, access = logging.getLogger(), logging.getLogger(ACCESS_LOGGER_NAME)
+    saved = [(logger, logger.handlers[:], logger.level, logger.propagate) for logger in (root, access)]
+    yield
+    stop_logging()
+    for logger, handlers, level, propagate in saved:
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+            if handler not in handlers:
+                handler.close()
+        for handler in handlers:
+            logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def test_queue_mode_writes_from_a_background_thread(tmp_path):
+    """Test that in queue mode loggers only enqueue, and records are written out on stop."""
+    log_file = tmp_path / "pymock.log"
+    setup_logging({"level": "debug", "file": str(log_file), "queue": True})
+    assert [type(handler) for handler in logging.getLogger().handlers] == [DroppingQueueHandler]
+
+    logging.getLogger("pymock.test").debug("queued %s", "message")
+    stop_logging()
+    assert "[DEBUG] pymock.test - queued message" in log_file.read_text()
+
+    # Afterwards, records are written synchronously.
+    logging.getLogger("pymock.test").info("after stop")
+    assert "after stop" in log_file.read_text()
+
+
+def test_full_queue_drops_records():
+    """Test that records are dropped and counted, rather than blocking, when the queue is full."""
+    handler = DroppingQueueHandler(queue.Queue(1))
+    logger = logging.getLogger("pymock.test.drop")
+    logger.addHandler(handler)
+    try:
+        for number in range(3):
+            logger.warning("record %d", number)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().getMessage() == "record 0"
+
+
+def test_queue_restarts_in_forked_children(tmp_path):
+    """Test that a forked worker gets a queue and writer thread of its own."""
+    log_file = tmp_path / "pymock.log"
+    setup_logging({"file": str(log_file), "queue": True})
+    previous_queue = logging_config._queue_handler.queue
+
+    logging_config._restart_queue_in_child()
+    assert logging_config._queue_handler.queue is not previous_queue
+    logging.getLogger("pymock.test").warning("from the child")
+    stop_logging()
+    assert "from the child" in log_file.read_text()
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_access_log_lines(tmp_path, queued):
+    """Test that each request is written to the access log as a JSON line, apart from app logs."""
+    access_file = tmp_path / "access.log"
+    app_file = tmp_path / "pymock.log"
+    logging_conf = {"file": str(app_file), "queue": queued, "access_log": {"file": str(access_file)}}
+    setup_logging(logging_conf)
+    client = create_app(ENDPOINTS, access_log=AccessLog.from_config(logging_conf["access_log"])).test_client()
+    body = client.get("/users").get_data()
+    client.get("/missing")
+    stop_logging()
+
+    first, second = [json.loads(line) for line in access_file.read_text().splitlines()]
+    assert (first["method"], first["path"], first["status"], first["scenario"]) == ("GET", "/users", 200, "all users")
+    assert first["bytes"] == len(body)
+    assert first["duration_ms"] >= 0
+    assert (second["path"], second["status"], second["scenario"]) == ("/missing", 404, None)
+    assert "/users" not in app_file.read_text()
+
+
+def test_access_log_sampling(monkeypatch):
+    """Test that only the sampled share of requests is logged, and invalid rates are rejected."""
+    log = AccessLog(0.25)
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.3)
+    assert not log.sampled()
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.2)
+    assert log.sampled()
+    assert AccessLog.from_config({"enabled": False}) is None
+    assert AccessLog.from_config(None) is None
+    with pytest.raises(ConfigError, match="sample_rate"):
+        AccessLog(0)
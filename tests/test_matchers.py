@@ -0,0 +1,112 @@
+# tests/test_matchers.py
+import pytest
+
+from pymock.server.matchers import compile_accessor, compile_matcher, compile_rule, simple_path
+
+
+def _rule(op, value=None, target="body", prop="$.name"):
+    return {"target": target, "prop": prop, "op": op, "value": value}
+
+
+def _no_fallback(rule):
+    pytest.fail(f"Unexpected fallback for {rule}")
+
+
+@pytest.mark.parametrize(
+    ("rule", "body", "expected"),
+    [
+        (_rule("equals", "John"), {"name": "John"}, True),
+        (_rule("EQUALS", "John"), {"name": "Jane"}, False),
+        (_rule("NULL"), {}, True),
+        (_rule("NULL"), {"name": "John"}, False),
+        (_rule("EMPTY_ARRAY", prop="$.tags"), {"tags": []}, True),
+        (_rule("ARRAY_INCLUDES", "a", prop="$.tags"), {"tags": ["a", "b"]}, True),
+        (_rule("ARRAY_INCLUDES", "c", prop="$.tags"), {"tags": ["a", "b"]}, False),
+    ],
+)
+def test_compiled_operators(rule, body, expected):
+    """Test the compiled operator semantics."""
+    check = compile_rule(rule)
+    assert check is not None
+    assert check({"body": body}) is expected
+
+
+@pytest.mark.parametrize("op", ["REGEX", "regex_case_insensitive", "VALID_JSON_SCHEMA", "SOMETHING_NEW"])
+def test_ambiguous_operators_are_not_compiled(op):
+    """Test that operators whose semantics belong to ruleenginex are left to the interpreter."""
+    assert compile_rule(_rule(op, "^J")) is None
+
+
+_PARITY_DATA = [
+    {"body": {"name": "John", "age": 1, "flag": True, "score": 1.0, "tags": ["a", "1"], "empty": [], "none": None}},
+    {"body": {"name": "1", "age": "1", "flag": 1, "score": 1, "tags": [], "empty": {}, "none": ""}},
+    {"body": {"users": [{"id": 1}, {"id": 2}], "tags": "abc", "empty": "", "none": 0}},
+    {"body": "not json", "params": {"id": "1"}},
+    {"body": None, "params": {}},
+]
+
+_PARITY_RULES = [
+    *(
+        _rule(op, value, prop=prop)
+        for op, value in [("EQUALS", "John"), ("equals", 1), ("EQUALS", "1"), ("EQUALS", True), ("EQUALS", None)]
+        for prop in ["$.name", "age", "$.flag", "$.score", "$.missing", ""]
+    ),
+    _rule("EQUALS", [1, 2], prop="$.users[*].id"),
+    _rule("EQUALS", "1", target="params", prop="id"),
+    *(_rule("NULL", prop=prop) for prop in ["$.none", "$.missing", "", "$.name"]),
+    *(_rule("EMPTY_ARRAY", prop=prop) for prop in ["$.empty", "$.tags", "$.missing"]),
+    *(_rule("ARRAY_INCLUDES", value, prop="$.tags") for value in ["a", "1", 1, "b"]),
+]
+
+
+@pytest.mark.parametrize("rule", _PARITY_RULES)
+def test_compiled_rules_match_ruleenginex(rule):
+    """Test that every compiled rule agrees with Scenario.evaluate on edge values."""
+    scenario_module = pytest.importorskip("ruleenginex.scenario")
+    check = compile_rule(rule)
+    assert check is not None
+    scenario = scenario_module.Scenario(scenario_name="parity", rules=[rule], response={})
+    for data in _PARITY_DATA:
+        assert check(data) == scenario.evaluate(data), data
+
+
+def test_accessor_paths():
+    """Test simple lookups and parsed JSONPath expressions."""
+    data = {"user": {"name": "John"}, "users": [{"id": 1}, {"id": 2}]}
+    assert compile_accessor("")(data) is data
+    assert compile_accessor("$.user.name")(data) == "John"
+    assert compile_accessor("user.name")(data) == "John"
+    assert compile_accessor("$.user.missing")(data) is None
+    assert compile_accessor("$.users[0].id")(data) == 1
+    assert compile_accessor("$.users[*].id")(data) == [1, 2]
+    assert compile_accessor("$.users[*].missing")(data) is None
+    assert compile_accessor("$.user.name")("not a dict") is None
+
+
+def test_uncompilable_rules_use_fallback():
+    """Test that unknown operators and invalid paths are interpreted."""
+    interpreted = []
+
+    def fallback(rule):
+        interpreted.append(rule["op"])
+        return lambda _request_data: True
+
+    matcher = compile_matcher([_rule("equals", "John"), _rule("SOMETHING_NEW"), _rule("EQUALS", prop="$[")], fallback)
+    assert interpreted == ["SOMETHING_NEW", "EQUALS"]
+    assert matcher({"body": {"name": "John"}})
+    assert not matcher({"body": {"name": "Jane"}})
+
+
+def test_empty_rules_always_match():
+    """Test that a scenario without rules matches everything."""
+    assert compile_matcher([], _no_fallback)({})
+
+
+def test_simple_path():
+    """Test splitting of simple props."""
+    assert simple_path("") == ()
+    assert simple_path("$") == ()
+    assert simple_path("$.user.name") == ("user", "name")
+    assert simple_path("X-Tenant") == ("X-Tenant",)
+    assert simple_path("$.users[*].id") is None
+    assert simple_path("$..id") is None
@@ -0,0 +1,98 @@
+# tests/test_metrics.py
+import threading
+
+from pymock.app import create_app
+from pymock.server.metrics import LATENCY_BUCKETS, Metrics
+
+ENDPOINTS = [
+    {
+        "path": "/users",
+        "method": "GET",
+        "scenarios": [
+            {
+                "scenario_name": "admins",
+                "rules": [{"target": "params", "prop": "role", "op": "equals", "value": "admin"}],
+                "response": {"data": {"name": "{{ fake.name() }}"}},
+            },
+            {
+                "scenario_name": "guests",
+                "rules": [{"target": "params", "prop": "role", "op": "equals", "value": "guest"}],
+                "response": {"data": {"role": "guest"}},
+            },
+        ],
+    }
+]
+
+COUNTER = ("pymock_requests_total", (("method", "GET"), ("path", "/x"), ("scenario", "s")))
+HISTOGRAM = ("pymock_request_duration_seconds", (("method", "GET"), ("path", "/x")))
+
+
+def _sample(text, line_start):
+    """Returns the value of the first sample line starting with line_start."""
+    return next(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(line_start))
+
+
+def test_shards_of_all_threads_are_merged():
+    """Test that counts recorded by many threads, finished or not, add up on collection."""
+    metrics = Metrics()
+
+    def record():
+        for _ in range(1000):
+            metrics.increment(COUNTER)
+            metrics.observe(HISTOGRAM, 0.002)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record()
+
+    counters, histograms = metrics.collect()
+    assert counters[COUNTER] == 9000
+    assert sum(histograms[HISTOGRAM].buckets) == 9000
+    assert histograms[HISTOGRAM].buckets[LATENCY_BUCKETS.index(0.0025)] == 9000
+    # Only the shard of the live thread is kept; the others were folded into one.
+    assert len(metrics._shards) == 1
+
+
+def test_prometheus_format():
+    """Test that histograms are rendered with cumulative buckets, and label values escaped."""
+    metrics = Metrics()
+    metrics.observe(HISTOGRAM, 0.00001)
+    metrics.observe(HISTOGRAM, 0.3)
+    metrics.observe(HISTOGRAM, 5)
+    metrics.increment(("pymock_requests_total", (("method", "GET"), ("path", "/x"), ("scenario", 'say "hi"'))))
+
+    text = metrics.render_prometheus()
+    assert "# TYPE pymock_request_duration_seconds histogram" in text
+    assert 'pymock_requests_total{method="GET",path="/x",scenario="say \\"hi\\""} 1' in text
+    labels = 'method="GET",path="/x"'
+    assert _sample(text, f'pymock_request_duration_seconds_bucket{{{labels},le="5e-05"}}') == 1
+    assert _sample(text, f'pymock_request_duration_seconds_bucket{{{labels},le="0.5"}}') == 2
+    assert _sample(text, f'pymock_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 3
+    assert _sample(text, f"pymock_request_duration_seconds_count{{{labels}}}") == 3
+    assert _sample(text, f"pymock_request_duration_seconds_sum{{{labels}}}") == 5.30001
+
+
+def test_metrics_endpoint_counts_scenarios_and_misses():
+    """Test that /__pymock/metrics reports requests per scenario, misses and stage timings."""
+    client = create_app(ENDPOINTS).test_client()
+    client.get("/users?role=admin")
+    client.get("/users?role=guest")
+    client.get("/users?role=guest")
+    client.get("/users?role=nobody")
+
+    response = client.get("/__pymock/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    labels = 'method="GET",path="/users"'
+    assert _sample(text, f'pymock_requests_total{{{labels},scenario="admins"}}') == 1
+    assert _sample(text, f'pymock_requests_total{{{labels},scenario="guests"}}') == 2
+    assert _sample(text, f"pymock_unmatched_requests_total{{{labels}}}") == 1
+    assert _sample(text, f"pymock_request_duration_seconds_count{{{labels}}}") == 4
+    assert _sample(text, f'pymock_stage_duration_seconds_count{{{labels},stage="rules"}}') == 4
+    # Only the admin scenario renders Jinja2; the guest one is served pre-encoded.
+    assert _sample(text, f'pymock_stage_duration_seconds_count{{{labels},stage="jinja"}}') == 1
+    assert _sample(text, f'pymock_stage_duration_seconds_count{{{labels},stage="serialization"}}') == 1
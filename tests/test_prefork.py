@@ -0,0 +1,105 @@
+# tests/test_prefork.py
+import http.client
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+from pymock.server.prefork import PreforkServer
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork") or sys.platform == "darwin", reason="requires os.fork")
+
+
+def pid_app(environ, start_response):
+    """WSGI app answering with the pid of the worker serving the request."""
+    body = str(os.getpid()).encode()
+    start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+def _run_in_own_group(server):
+    os.setpgid(0, 0)
+    server.run()
+
+
+def _get_pid(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", "/")
+        return int(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def start_server():
+    processes = []
+
+    def start(**kwargs):
+        server = PreforkServer(pid_app, "127.0.0.1", 0, **kwargs)
+        server.bind()
+        process = multiprocessing.get_context("fork").Process(target=_run_in_own_group, args=(server,))
+        process.start()
+        processes.append(process)
+        return server, process
+
+    yield start
+
+    for process in processes:
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+            process.join(timeout=10)
+        if process.is_alive():
+            os.killpg(process.pid, signal.SIGKILL)
+            process.join()
+
+
+def test_requests_are_served_by_workers(start_server):
+    """Test that requests are answered by worker processes, not the master."""
+    server, process = start_server(workers=2)
+    pids = {_get_pid(server.port) for _ in range(6)}
+    assert pids
+    assert process.pid not in pids
+    assert os.getpid() not in pids
+
+
+def test_workers_are_recycled_after_max_requests(start_server):
+    """Test that a worker exits after max_requests and is replaced."""
+    server, _ = start_server(workers=1, max_requests=2)
+    first = _get_pid(server.port)
+    assert _get_pid(server.port) == first
+    # The old worker may still accept a connection queued while it was shutting down.
+    for _ in range(20):
+        if _get_pid(server.port) != first:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("worker was not replaced")
+
+
+def test_sigterm_stops_master_and_workers(start_server):
+    """Test graceful shutdown."""
+    server, process = start_server(workers=2, graceful_timeout=5)
+    _get_pid(server.port)
+    os.kill(process.pid, signal.SIGTERM)
+    process.join(timeout=10)
+    assert process.exitcode == 0
+
+
+def test_workers_stop_when_master_dies(start_server):
+    """Test that workers do not outlive a killed master."""
+    server, process = start_server(workers=1)
+    worker = _get_pid(server.port)
+    os.kill(process.pid, signal.SIGKILL)
+    process.join()
+    for _ in range(50):
+        try:
+            os.kill(worker, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("worker outlived its master")
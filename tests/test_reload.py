@@ -0,0 +1,166 @@
+# tests/test_reload.py
+import os
+import time
+
+import pytest
+import yaml
+from werkzeug.test import EnvironBuilder
+
+from pymock.app import create_app
+from pymock.asgi import create_asgi_app
+from pymock.server.cache import CachedResponse, ResponseCache
+from pymock.server.reload import EndpointReloader
+
+
+def _endpoint(path, message, method="GET"):
+    return {
+        "path": path,
+        "method": method,
+        "scenarios": [{"scenario_name": "default", "rules": [], "response": {"data": {"message": message}}}],
+    }
+
+
+def _write(file_path, *endpoints):
+    file_path.write_text(yaml.safe_dump_all(endpoints), encoding="utf-8")
+    # Make sure the change is seen even on file systems with a coarse modification time.
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def endpoints_dir(tmp_path):
+    """Fixture creating an endpoints directory with two files."""
+    endpoints_dir = tmp_path / "endpoints"
+    endpoints_dir.mkdir()
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a1"))
+    _write(endpoints_dir / "b.yaml", _endpoint("/b", "b1"), _endpoint("/b/<item_id>", "item1"))
+    return endpoints_dir
+
+
+@pytest.fixture
+def reloader(endpoints_dir):
+    """Fixture providing a reloader over the endpoints directory, without a watch thread."""
+    return EndpointReloader([str(endpoints_dir)], ResponseCache())
+
+
+@pytest.fixture
+def client(reloader):
+    """Fixture providing a Flask test client serving the reloader's routes."""
+    return create_app([], reloader.response_cache, live_routes=reloader.live_routes).test_client()
+
+
+def test_serves_initial_endpoints(client):
+    """Test that the endpoint files are served through the live route table."""
+    assert client.get("/a").json == {"message": "a1"}
+    assert client.get("/b/42").json == {"message": "item1"}
+    assert client.get("/missing").status_code == 404
+    assert client.post("/a").status_code == 405
+    assert client.get("/__pymock/cache").status_code == 200
+
+
+def test_reload_recompiles_only_changed_files(endpoints_dir, reloader, client, monkeypatch):
+    """Test that only the changed file is compiled again and the table is swapped."""
+    compiled = []
+    original = EndpointReloader._compile
+
+    def compile_and_record(self, results):
+        compiled.extend(result.path for result in results)
+        return original(self, results)
+
+    monkeypatch.setattr(EndpointReloader, "_compile", compile_and_record)
+    old_table = reloader.live_routes.current
+    assert reloader.reload() is False
+    assert reloader.live_routes.current is old_table
+
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+    assert reloader.reload() is True
+    assert compiled == [str(endpoints_dir / "a.yaml")]
+    assert reloader.live_routes.current is not old_table
+    assert client.get("/a").json == {"message": "a2"}
+    assert client.get("/b").json == {"message": "b1"}
+
+
+def test_reload_handles_added_and_removed_files(endpoints_dir, reloader, client):
+    """Test that new files are served and routes of deleted files disappear."""
+    _write(endpoints_dir / "c.yml", _endpoint("/c", "c1"))
+    (endpoints_dir / "b.yaml").unlink()
+    assert reloader.reload() is True
+    assert client.get("/c").json == {"message": "c1"}
+    assert client.get("/b").status_code == 404
+    assert client.get("/a").json == {"message": "a1"}
+
+
+def test_broken_file_keeps_previous_routes(endpoints_dir, reloader, client):
+    """Test that a file that fails to parse or compile keeps serving its previous version."""
+    (endpoints_dir / "a.yaml").write_text("path: /a\nmethod: [GET\n", encoding="utf-8")
+    reloader.reload()
+    assert client.get("/a").json == {"message": "a1"}
+
+    broken = _endpoint("/a", "a2")
+    broken["scenarios"][0]["response"]["delay"] = {"unknown": 1}
+    _write(endpoints_dir / "a.yaml", broken)
+    reloader.reload()
+    assert client.get("/a").json == {"message": "a1"}
+
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a3"))
+    assert reloader.reload() is True
+    assert client.get("/a").json == {"message": "a3"}
+
+
+def test_in_flight_request_finishes_on_previous_table(endpoints_dir, reloader):
+    """Test that a request which matched before a swap is answered by the old handler."""
+    handler, path_params = reloader.live_routes.current.match(EnvironBuilder(path="/a").get_environ())
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+    reloader.reload()
+
+    response = handler(EnvironBuilder(path="/a").get_request(), path_params)
+    assert response.get_json() == {"message": "a1"}
+
+
+def test_reload_clears_response_cache(endpoints_dir, reloader):
+    """Test that cached responses of the previous routes are dropped on reload."""
+    reloader.response_cache.set("key", CachedResponse(200, [], b"{}"), ttl=60)
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+    reloader.reload()
+    assert reloader.response_cache.stats()["entries"] == 0
+
+
+def test_asgi_app_serves_live_routes(endpoints_dir, reloader):
+    """Test that the ASGI app falls through to the live route table."""
+    app = create_asgi_app([], reloader.response_cache, live_routes=reloader.live_routes)
+    _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+    reloader.reload()
+    assert app.dispatch(EnvironBuilder(path="/a").get_environ()).get_json() == {"message": "a2"}
+    assert app.dispatch(EnvironBuilder(path="/__pymock/cache").get_environ()).status_code == 200
+    assert app.dispatch(EnvironBuilder(path="/missing").get_environ()).status_code == 404
+
+
+def test_watch_thread_picks_up_changes(endpoints_dir, client, reloader, monkeypatch):
+    """Test that the background watcher reloads a changed file by polling."""
+    monkeypatch.setattr(EndpointReloader, "_start_observer", lambda _self: None)
+    reloader.interval = 0.05
+    reloader.start()
+    try:
+        _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+        deadline = time.monotonic() + 5
+        while client.get("/a").json != {"message": "a2"} and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert client.get("/a").json == {"message": "a2"}
+    finally:
+        reloader.stop()
+
+
+def test_watch_thread_uses_inotify(endpoints_dir, client, reloader):
+    """Test that the watcher reloads on file system events when watchdog is installed."""
+    pytest.importorskip("watchdog")
+    reloader.interval = 60  # A reload within the test can only come from an event.
+    reloader.start()
+    try:
+        assert reloader._observer is not None
+        _write(endpoints_dir / "a.yaml", _endpoint("/a", "a2"))
+        deadline = time.monotonic() + 5
+        while client.get("/a").json != {"message": "a2"} and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert client.get("/a").json == {"message": "a2"}
+    finally:
+        reloader.stop()
@@ -0,0 +1,50 @@
+# tests/test_render.py
+from jinja2 import Environment
+
+from pymock.server.render import RenderPlan
+
+
+def test_static_data_is_returned_as_is():
+    """Test that data without Jinja2 expressions is not copied."""
+    data = {"message": "OK", "items": [{"id": 1}]}
+    plan = RenderPlan.compile(data, Environment(autoescape=True))
+    assert plan.is_static
+    assert plan.render({}) is data
+
+
+def test_nested_expressions_are_rendered():
+    """Test rendering of expressions nested in dicts and lists."""
+    data = {"user": {"name": "{{ name }}", "tags": ["static", "{{ name | upper }}"]}, "count": 3}
+    plan = RenderPlan.compile(data, Environment(autoescape=True))
+    assert not plan.is_static
+    assert plan.render({"name": "john"}) == {"user": {"name": "john", "tags": ["static", "JOHN"]}, "count": 3}
+
+
+def test_render_does_not_mutate_skeleton():
+    """Test that rendering copies only the dynamic path and shares static subtrees."""
+    static_part = {"id": 1}
+    data = {"dynamic": {"value": "{{ value }}"}, "static": static_part}
+    plan = RenderPlan.compile(data, Environment(autoescape=True))
+
+    first = plan.render({"value": "a"})
+    second = plan.render({"value": "b"})
+
+    assert first["dynamic"]["value"] == "a"
+    assert second["dynamic"]["value"] == "b"
+    assert data["dynamic"]["value"] == "{{ value }}"
+    assert first["static"] is static_part
+
+
+def test_list_like_values_are_parsed():
+    """Test that rendered values that look like lists are converted."""
+    plan = RenderPlan.compile({"ids": "{{ ids }}", "broken": "[{{ word }}]"}, Environment(autoescape=True))
+    assert plan.render({"ids": [1, 2], "word": "x"}) == {"ids": [1, 2], "broken": "[x]"}
+
+
+def test_identical_expressions_share_templates():
+    """Test that the template cache compiles each expression source once."""
+    cache = {}
+    env = Environment(autoescape=True)
+    RenderPlan.compile({"a": "{{ x }}"}, env, cache)
+    RenderPlan.compile(["{{ x }}", "{{ y }}"], env, cache)
+    assert set(cache) == {"{{ x }}", "{{ y }}"}
@@ -0,0 +1,58 @@
+# tests/test_request.py
+import pytest
+from flask import Flask
+
+from pymock.server.request import Request, RequestCapturePlan, RequestView
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_to_dict_captures_everything(app):
+    """Test that to_dict still exposes the full request."""
+    with app.test_request_context("/items?type=a", method="POST", json={"name": "John"}, headers={"X-Tenant": "t1"}):
+        data = Request().to_dict()
+    assert data["method"] == "POST"
+    assert data["params"] == {"type": "a"}
+    assert data["body"] == {"name": "John"}
+    assert data["headers"]["X-Tenant"] == "t1"
+
+
+def test_capture_plan_from_rules():
+    """Test that the plan records only the targets and top-level keys used by rules."""
+    plan = RequestCapturePlan.from_rules(
+        [
+            {"target": "params", "prop": "type", "op": "equals", "value": "a"},
+            {"target": "headers", "prop": "$.X-Tenant", "op": "equals", "value": "t1"},
+            {"target": "headers", "prop": "$['X-Region']", "op": "equals", "value": "eu"},
+            {"target": "body", "prop": "$.name", "op": "equals", "value": "John"},
+            {"target": "cookies", "prop": "$..session", "op": "null"},
+        ]
+    )
+    assert plan.targets == {
+        "params": frozenset({"type"}),
+        "headers": frozenset({"X-Tenant", "X-Region"}),
+        "body": frozenset({"name"}),
+        "cookies": None,
+    }
+
+
+def test_unplannable_rule_captures_everything():
+    """Test that unknown rule shapes fall back to capturing the whole request."""
+    assert RequestCapturePlan.from_rules([{"any": []}]).targets is None
+
+
+def test_view_captures_only_planned_keys(app):
+    """Test that the view copies only the planned keys, lazily and once."""
+    plan = RequestCapturePlan({"headers": frozenset({"X-Tenant", "x-region"}), "params": frozenset({"type"})})
+    with app.test_request_context("/items?type=a&page=2", headers={"X-Tenant": "t1", "X-Region": "eu"}):
+        view = RequestView(Request(), plan)
+        assert repr(view) == "RequestView(captured={})"
+        assert view["headers"] == {"X-Tenant": "t1"}
+        assert view.get("params") == {"type": "a"}
+        assert view["headers"] is view["headers"]
+        assert "body" in view
+        assert "unknown" not in view
+        assert view.get("unknown") is None
@@ -0,0 +1,43 @@
+# tests/test_response.py
+import datetime as dt
+import uuid
+
+import pytest
+from flask import Flask, jsonify
+
+from pymock.server.response import StaticResponse, dumps_json
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"b": 1, "a": [1, "two", None, True]},
+        {"when": dt.date(2025, 1, 2), "id": uuid.UUID(int=1), "text": "héllo"},
+        [],
+    ],
+)
+def test_dumps_json_matches_jsonify(data):
+    """Test that pre-encoded bodies are byte-identical to jsonify output."""
+    app = Flask(__name__)
+    with app.app_context():
+        assert dumps_json(data) == jsonify(data).get_data()
+
+
+def test_static_response_headers():
+    """Test the precomputed headers."""
+    response = StaticResponse.from_data(201, {"id": 1}).to_flask_response()
+    assert response.status_code == 201
+    assert response.get_data() == b'{"id":1}\n'
+    assert response.headers["Content-Length"] == "9"
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.headers["ETag"].startswith('"')
+
+
+def test_if_none_match_returns_not_modified():
+    """Test conditional requests against the strong ETag."""
+    static = StaticResponse.from_data(200, {"id": 1})
+    assert static.to_flask_response(static.etag).status_code == 304
+    assert static.to_flask_response(f'"other", W/{static.etag}').status_code == 304
+    assert static.to_flask_response("*").status_code == 304
+    assert static.to_flask_response('"other"').status_code == 200
+    assert StaticResponse.from_data(404, {}).to_flask_response("*").status_code == 404
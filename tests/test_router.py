@@ -0,0 +1,133 @@
+# tests/test_router.py
+import pytest
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import RequestRedirect
+from werkzeug.test import EnvironBuilder
+
+from pymock.app import create_app
+from pymock.server.exceptions import ConfigError
+from pymock.server.router import TrieRouteTable, create_route_table
+from pymock.server.routes import EndpointRoute, RouteTable
+
+_RULES = [
+    ("/", "GET"),
+    ("/users", "GET"),
+    ("/users", "POST"),
+    ("/users/", "PUT"),
+    ("/users/me", "GET"),
+    ("/users/<user_id>", "GET"),
+    ("/users/<int:user_id>", "GET"),
+    ("/users/<user_id>/orders/<int(min=1):order_id>", "GET"),
+    ("/users/<user_id>/orders/<uuid:order_id>", "DELETE"),
+    ("/reports/report-<day>.csv", "GET"),
+    ("/prices/<float:amount>", "GET"),
+    ("/codes/<string(length=3):code>", "GET"),
+    ("/files/<path:file_path>", "GET"),
+    ("/files/<path:file_path>/meta", "GET"),
+    ("/files/readme", "GET"),
+    ("/colors/<any(red, green):color>", "GET"),
+    ("/docs/", "GET"),
+]
+
+_PATHS = [
+    ("GET", "/"),
+    ("GET", "/users"),
+    ("POST", "/users"),
+    ("PUT", "/users/"),
+    ("DELETE", "/users"),
+    ("HEAD", "/users"),
+    ("GET", "/users/me"),
+    ("GET", "/users/42"),
+    ("GET", "/users/bob"),
+    ("GET", "/users/bob/orders/7"),
+    ("GET", "/users/bob/orders/0"),
+    ("DELETE", "/users/bob/orders/1b4e28ba-2fa1-11d2-883f-0016d3cca427"),
+    ("GET", "/users/bob/orders/1b4e28ba-2fa1-11d2-883f-0016d3cca427"),
+    ("GET", "/reports/report-monday.csv"),
+    ("GET", "/reports/monday.csv"),
+    ("GET", "/prices/9.99"),
+    ("GET", "/prices/9"),
+    ("GET", "/codes/abc"),
+    ("GET", "/codes/abcd"),
+    ("GET", "/files/a/b/c.txt"),
+    ("GET", "/files/a/b/meta"),
+    ("GET", "/files/readme"),
+    ("GET", "/files/"),
+    ("GET", "/colors/red"),
+    ("GET", "/colors/blue"),
+    ("GET", "/docs"),
+    ("GET", "/docs/"),
+    ("GET", "/missing"),
+    ("GET", "/users/bob/unknown"),
+]
+
+
+def _routes(rules):
+    return [EndpointRoute(path, method, lambda _source, _params, rule=(method, path): rule) for path, method in rules]
+
+
+def _resolve(table, method, path):
+    """Returns (rule, path params) of the matched route, or the type of the raised error."""
+    try:
+        handler, path_params = table.match(EnvironBuilder(path=path, method=method).get_environ())
+    except (NotFound, MethodNotAllowed) as e:
+        return type(e).__name__, sorted(getattr(e, "valid_methods", None) or [])
+    except RequestRedirect as e:
+        return "redirect", e.new_url
+    return handler(None, None), path_params
+
+
+@pytest.mark.parametrize(("method", "path"), _PATHS)
+def test_trie_matches_like_werkzeug(method, path):
+    """Test that the trie router resolves requests exactly like the werkzeug Map."""
+    routes = _routes(_RULES)
+    assert _resolve(TrieRouteTable(routes), method, path) == _resolve(RouteTable(routes), method, path)
+
+
+def test_static_segments_win_over_variables():
+    """Test that static routes take precedence regardless of registration order."""
+    table = TrieRouteTable(_routes([("/items/<item_id>", "GET"), ("/items/new", "GET")]))
+    assert _resolve(table, "GET", "/items/new") == (("GET", "/items/new"), {})
+    assert _resolve(table, "GET", "/items/7") == (("GET", "/items/<item_id>"), {"item_id": "7"})
+
+
+def test_backtracks_to_other_variable_branches():
+    """Test that a variable branch that dead-ends lets the next one match."""
+    table = TrieRouteTable(_routes([("/a/<int:x>/b", "GET"), ("/a/<y>/c", "GET")]))
+    assert _resolve(table, "GET", "/a/1/c") == (("GET", "/a/<y>/c"), {"y": "1"})
+
+
+def test_first_duplicate_route_wins():
+    """Test that the first of two identical routes is served, as with Flask."""
+    routes = [EndpointRoute("/dup", "GET", lambda *_: "first"), EndpointRoute("/dup", "GET", lambda *_: "second")]
+    routes += [EndpointRoute("/dup/<x>", "GET", lambda *_: "first"), EndpointRoute("/dup/<x>", "GET", lambda *_: "2nd")]
+    table = TrieRouteTable(routes)
+    for path in ("/dup", "/dup/1"):
+        handler, _ = table.match(EnvironBuilder(path=path).get_environ())
+        assert handler(None, None) == "first"
+
+
+def test_unknown_router_and_converter_are_rejected():
+    """Test that configuration mistakes are reported as ConfigError."""
+    with pytest.raises(ConfigError, match="Unknown router"):
+        create_route_table([], "radix")
+    with pytest.raises(ConfigError, match="Unknown converter"):
+        TrieRouteTable(_routes([("/x/<money:amount>", "GET")]))
+
+
+def test_app_with_trie_router():
+    """Test that the Flask app serves endpoints and admin routes with the trie router."""
+    endpoints = [
+        {
+            "path": "/users/<user_id>",
+            "method": "GET",
+            "scenarios": [
+                {"scenario_name": "s", "rules": [], "response": {"data": {"id": "{{ request.view_args.user_id }}"}}}
+            ],
+        }
+    ]
+    client = create_app(endpoints, router="trie").test_client()
+    assert client.get("/users/7").json == {"id": "7"}
+    assert client.post("/users/7").status_code == 405
+    assert client.get("/nope").status_code == 404
+    assert client.get("/__pymock/cache").status_code == 200
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from pymock.app import create_app
@@ -53,3 +55,141 @@ def test_scenario_not_john_body(client):
     assert resp.status_code == 400
     data = resp.get_json()
     assert data["error"] == "Not John"
+
+
+@pytest.fixture
+def cached_client():
+    """Fixture providing a client for an endpoint whose response is cached."""
+    endpoints_config = [
+        {
+            "path": "/orders/<order_id>",
+            "method": "GET",
+            "scenarios": [
+                {
+                    "scenario_name": "cached",
+                    "rules": [],
+                    "response": {
+                        "status": 200,
+                        "data": {"token": "{{ uuid4() }}"},
+                        "cache": {"ttl": 60, "key": ["path", "headers.X-Tenant"]},
+                    },
+                }
+            ],
+        }
+    ]
+    app = create_app(endpoints_config)
+    with app.test_client() as c:
+        yield c
+
+
+def test_cached_scenario_is_rendered_once_per_key(cached_client):
+    """Test that a cached response is reused only for requests with the same key."""
+    first = cached_client.get("/orders/1", headers={"X-Tenant": "a"}).get_json()
+    assert cached_client.get("/orders/1", headers={"X-Tenant": "a"}).get_json() == first
+    assert cached_client.get("/orders/1", headers={"X-Tenant": "b"}).get_json() != first
+    assert cached_client.get("/orders/2", headers={"X-Tenant": "a"}).get_json() != first
+
+
+def test_cache_key_on_a_lowercase_header():
+    """Test that a header key part spelled in lowercase still keeps tenants apart."""
+    endpoints_config = [
+        {
+            "path": "/orders",
+            "method": "GET",
+            "cache": {"ttl": 60, "key": ["headers.x-tenant"]},
+            "scenarios": [{"scenario_name": "orders", "rules": [], "response": {"data": {"token": "{{ uuid4() }}"}}}],
+        }
+    ]
+    client = create_app(endpoints_config).test_client()
+    first = client.get("/orders", headers={"x-tenant": "a"}).get_json()
+    assert client.get("/orders", headers={"X-TENANT": "a"}).get_json() == first
+    assert client.get("/orders", headers={"x-tenant": "b"}).get_json() != first
+
+
+def test_admin_endpoint_flushes_response_cache(cached_client):
+    """Test flushing cached responses through the admin endpoint."""
+    first = cached_client.get("/orders/1").get_json()
+    assert cached_client.get("/__pymock/cache").get_json()["entries"] == 1
+
+    resp = cached_client.delete("/__pymock/cache")
+    assert resp.get_json() == {"cleared": 1}
+    assert cached_client.get("/orders/1").get_json() != first
+
+
+def test_cache_key_on_path_params():
+    """Test that responses cached per path variable are not shared between variables."""
+    endpoints_config = [
+        {
+            "path": "/o/<oid>",
+            "method": "GET",
+            "cache": {"ttl": 60, "key": ["path_params.oid"]},
+            "scenarios": [{"scenario_name": "order", "rules": [], "response": {"data": {"token": "{{ uuid4() }}"}}}],
+        }
+    ]
+    client = create_app(endpoints_config).test_client()
+    first = client.get("/o/1").get_json()
+    assert client.get("/o/1").get_json() == first
+    assert client.get("/o/2").get_json() != first
+
+
+def test_static_scenario_supports_conditional_requests():
+    """Test that a fully static response carries an ETag and honours If-None-Match."""
+    endpoints_config = [
+        {
+            "path": "/status",
+            "method": "GET",
+            "scenarios": [{"scenario_name": "ok", "rules": [], "response": {"status": 200, "data": {"ok": True}}}],
+        }
+    ]
+    client = create_app(endpoints_config).test_client()
+    resp = client.get("/status")
+    assert resp.get_json() == {"ok": True}
+    etag = resp.headers["ETag"]
+
+    resp = client.get("/status", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.get_data() == b""
+
+
+def test_conditional_headers_are_ignored_for_unsafe_methods(client):
+    """Test that If-None-Match never turns a POST response into a 304."""
+    etag = client.post("/hello", json={"name": "John"}).headers["ETag"]
+    resp = client.post("/hello", json={"name": "John"}, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+def test_delayed_scenario():
+    """Test that the threaded server holds a delayed response for the configured time."""
+    endpoints_config = [
+        {
+            "path": "/slow",
+            "method": "GET",
+            "scenarios": [{"scenario_name": "slow", "rules": [], "response": {"delay": {"fixed": 50}, "data": {}}}],
+        }
+    ]
+    client = create_app(endpoints_config).test_client()
+    started = time.monotonic()
+    assert client.get("/slow").status_code == 200
+    assert time.monotonic() - started >= 0.05
+
+
+def test_file_scenario(tmp_path):
+    """Test that a scenario can answer with a file, including byte ranges."""
+    fixture = tmp_path / "users.json"
+    fixture.write_bytes(b'[{"id": 1}, {"id": 2}]')
+    endpoints_config = [
+        {
+            "path": "/users/export",
+            "method": "GET",
+            "scenarios": [{"scenario_name": "export", "rules": [], "response": {"file": str(fixture)}}],
+        }
+    ]
+    client = create_app(endpoints_config).test_client()
+    resp = client.get("/users/export")
+    assert resp.status_code == 200
+    assert resp.json == [{"id": 1}, {"id": 2}]
+    assert resp.headers["Content-Type"] == "application/json"
+
+    resp = client.get("/users/export", headers={"Range": "bytes=1-9"})
+    assert resp.status_code == 206
+    assert resp.get_data() == b'{"id": 1}'
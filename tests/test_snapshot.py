@@ -0,0 +1,87 @@
+# tests/test_snapshot.py
+import os
+import shutil
+
+import pytest
+import yaml
+
+from pymock.config.loader import ConfigLoader
+from pymock.config.snapshot import is_snapshot, read_snapshot
+from pymock.server.exceptions import ConfigError
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Fixture creating a config with two endpoint files."""
+    endpoints_dir = tmp_path / "endpoints"
+    endpoints_dir.mkdir()
+    (endpoints_dir / "a.yaml").write_text("path: /a\nmethod: GET\n", encoding="utf-8")
+    (endpoints_dir / "b.yaml").write_text("path: /b\nmethod: GET\n", encoding="utf-8")
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        yaml.safe_dump({"server": {"port": 8080}, "endpoints_path": [str(endpoints_dir)]}), encoding="utf-8"
+    )
+    return tmp_path
+
+
+def _compile_and_load(project):
+    snapshot_path = project / "mocks.snapshot"
+    ConfigLoader.compile_snapshot(str(project / "config.yaml"), str(snapshot_path))
+    return snapshot_path
+
+
+def _paths(config):
+    return [endpoint["path"] for endpoint in config["endpoints"]]
+
+
+def test_snapshot_round_trip(project):
+    """Test that a snapshot loads the same configuration as the YAML files."""
+    snapshot_path = _compile_and_load(project)
+    assert is_snapshot(snapshot_path)
+    assert not is_snapshot(project / "config.yaml")
+
+    config = ConfigLoader._load_snapshot(str(snapshot_path))
+    assert config == ConfigLoader._load_config(str(project / "config.yaml"))
+    assert _paths(config) == ["/a", "/b"]
+
+
+def test_changed_files_are_reloaded(project, caplog):
+    """Test that only edited, added and deleted files change the loaded endpoints."""
+    snapshot_path = _compile_and_load(project)
+    endpoints_dir = project / "endpoints"
+    (endpoints_dir / "a.yaml").write_text("path: /a2\nmethod: GET\n", encoding="utf-8")
+    (endpoints_dir / "b.yaml").unlink()
+    (endpoints_dir / "c.yml").write_text("path: /c\nmethod: GET\n", encoding="utf-8")
+
+    assert _paths(ConfigLoader._load_snapshot(str(snapshot_path))) == ["/a2", "/c"]
+    assert "2 re-parsed" in caplog.text
+
+
+def test_touched_files_are_not_reparsed(project, caplog):
+    """Test that a new modification time alone only costs a hash comparison."""
+    snapshot_path = _compile_and_load(project)
+    os.utime(project / "endpoints" / "a.yaml", ns=(0, 0))
+
+    assert _paths(ConfigLoader._load_snapshot(str(snapshot_path))) == ["/a", "/b"]
+    assert "Checked 1 of 2 endpoint files; 0 re-parsed" in caplog.text
+
+
+def test_missing_sources_fall_back_to_snapshot(project):
+    """Test that a snapshot can be served without the YAML sources."""
+    snapshot_path = _compile_and_load(project)
+    shutil.rmtree(project / "endpoints")
+    (project / "config.yaml").unlink()
+    assert _paths(ConfigLoader._load_snapshot(str(snapshot_path))) == ["/a", "/b"]
+
+
+def test_compile_rejects_invalid_endpoint_files(project):
+    """Test that broken endpoint files fail the compilation instead of being skipped."""
+    (project / "endpoints" / "bad.yaml").write_text("invalid: yaml: content", encoding="utf-8")
+    with pytest.raises(ConfigError, match=r"bad\.yaml"):
+        _compile_and_load(project)
+
+
+def test_read_snapshot_rejects_other_files(project):
+    """Test that arbitrary files are not unpickled."""
+    with pytest.raises(ConfigError, match="not a PyMock snapshot"):
+        read_snapshot(project / "config.yaml")
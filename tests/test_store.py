@@ -0,0 +1,175 @@
+# tests/test_store.py
+import threading
+
+import pytest
+
+from pymock.app import create_app
+from pymock.server.exceptions import ConfigError
+from pymock.server.store import Collection, ResourceStore
+
+
+@pytest.fixture(autouse=True)
+def reset_store():
+    """Fixture giving each test an empty shared store."""
+    ResourceStore.configure()
+    yield
+    ResourceStore.configure()
+
+
+def test_records_are_keyed_and_generated_keys_written_back():
+    """Test that records are found by key, whether given as a string or a number."""
+    orders = ResourceStore().collection("orders", "$.id")
+    assert orders.create({"item": "book"}) == ("1", {"id": 1, "item": "book"})
+    assert orders.create({"id": 7, "item": "pen"}) == ("7", {"id": 7, "item": "pen"})
+    assert orders.create({"id": "7"}) is None
+    assert orders.get("1") == orders.get(1) == {"id": 1, "item": "book"}
+
+    assert orders.update(7, {"item": "ink"}) == {"id": 7, "item": "ink"}
+    assert orders.replace("9", {"item": "cup"}) == {"id": "9", "item": "cup"}
+    assert orders.delete(1) == {"id": 1, "item": "book"}
+    assert orders.delete(1) is None
+    assert orders.update(1, {}) is None
+    assert [record["id"] for record in orders.find()] == [7, "9"]
+
+
+def test_indexed_and_scanned_queries_agree():
+    """Test that queries give the same records, oldest first, with or without indexes."""
+    indexed = ResourceStore().collection("orders", "$.id", ("status",))
+    scanned = Collection("orders")
+    for collection in (indexed, scanned):
+        for position in range(50):
+            collection.create({"status": ["new", "paid"][position % 2], "total": position % 5})
+        collection.update(1, {"status": "paid"})
+    assert len(indexed.find(status="paid")) == 26
+    assert indexed.find(status="paid", total="4") == scanned.find(status="paid", total=4)
+    assert indexed.query({"status": "lost"}) == []
+
+    scanned.declare(None, ("total",))
+    assert scanned.find(total=4) == indexed.find(total=4)
+
+
+def test_oldest_records_are_evicted_beyond_the_cap():
+    """Test that a shard keeps its share of max_records, dropping the oldest from its indexes."""
+    orders = ResourceStore(max_records=3, shards=1).collection("orders", "$.id", ("status",))
+    for position in range(5):
+        orders.create({"status": "new", "n": position})
+    orders.update(3, {"status": "paid"})
+    orders.create({"status": "new"})
+    assert [record["id"] for record in orders.find()] == [4, 5, 6]
+    assert orders.find(status="paid") == []
+
+
+def test_concurrent_writers_get_unique_keys():
+    """Test that creates from several threads never lose a record or reuse a key."""
+    tickets = ResourceStore(shards=4).collection("tickets")
+
+    def create_many():
+        for _ in range(2000):
+            tickets.create({"open": True})
+
+    threads = [threading.Thread(target=create_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(tickets) == 8000
+    assert {record["id"] for record in tickets.find(open=True)} == set(range(1, 8001))
+
+
+def test_save_and_restore(tmp_path):
+    """Test that a saved store is restored with its records, and that keys keep counting up."""
+    path = tmp_path / "store.json"
+    store = ResourceStore(file=str(path))
+    store.collection("orders", "$.id", ("status",)).create({"status": "new"})
+    store.collection("users", "$.email").create({"email": "a@example.com"})
+    assert store.save() == 2
+
+    restored = ResourceStore()
+    restored.collection("orders", "$.id", ("status",))
+    assert restored.restore(path) == 2
+    assert restored.orders.find(status="new") == [{"id": 1, "status": "new"}]
+    assert restored.users.get("a@example.com") == {"email": "a@example.com"}
+    assert restored.orders.create({})[0] == "2"
+
+    path.write_text("{}")
+    with pytest.raises(ConfigError, match="unsupported format"):
+        restored.restore(path)
+    with pytest.raises(ConfigError, match="No store file"):
+        ResourceStore().save()
+
+
+def test_invalid_settings():
+    """Test that conflicting keys and actions that need a path variable are rejected."""
+    store = ResourceStore()
+    store.collection("orders", "$.id")
+    with pytest.raises(ConfigError, match="keyed by"):
+        store.collection("orders", "$.uuid")
+    with pytest.raises(ConfigError, match="Invalid key"):
+        store.collection("users", "$..id")
+    endpoint = {"path": "/orders", "method": "DELETE", "store": "orders"}
+    with pytest.raises(ConfigError, match="path variable"):
+        create_app([endpoint])
+
+
+def test_crud_endpoints():
+    """Test that endpoints bound to a resource create, read, list, update and delete its records."""
+    endpoints = [
+        {"path": "/orders", "method": "POST", "store": {"resource": "orders", "indexes": ["status"]}},
+        {"path": "/orders", "method": "GET", "store": "orders"},
+        {"path": "/orders/<int:id>", "method": "GET", "store": "orders"},
+        {"path": "/orders/<int:id>", "method": "PATCH", "store": "orders"},
+        {"path": "/orders/<int:id>", "method": "DELETE", "store": "orders"},
+    ]
+    client = create_app(endpoints).test_client()
+
+    created = client.post("/orders", json={"item": "book", "status": "new"})
+    assert (created.status_code, created.get_json()) == (201, {"id": 1, "item": "book", "status": "new"})
+    assert client.post("/orders", json={"id": 1}).status_code == 409
+    assert client.post("/orders", json=["not", "an", "object"]).status_code == 400
+    client.post("/orders", json={"item": "pen", "status": "paid"})
+
+    assert client.get("/orders/1").get_json()["item"] == "book"
+    assert client.get("/orders/3").status_code == 404
+    assert [order["id"] for order in client.get("/orders?status=paid").get_json()] == [2]
+    assert client.patch("/orders/1", json={"status": "paid"}).get_json()["status"] == "paid"
+    assert len(client.get("/orders?status=paid").get_json()) == 2
+    assert client.delete("/orders/1").status_code == 204
+    assert client.delete("/orders/1").status_code == 404
+    assert client.get("/__pymock/store").get_json() == {"resources": {"orders": 1}, "max_records": 100_000}
+
+
+def test_scenarios_see_the_store_in_rules_and_templates(tmp_path):
+    """Test that scenarios answer before the store, reading it as the 'store' target and global."""
+    ResourceStore.configure(file=str(tmp_path / "store.json"))
+    endpoints = [
+        {"path": "/orders", "method": "POST", "store": "orders"},
+        {
+            "path": "/orders/<int:id>",
+            "method": "GET",
+            "store": "orders",
+            "scenarios": [
+                {
+                    "scenario_name": "missing",
+                    "rules": [{"target": "store", "op": "NULL"}],
+                    "response": {"status": 404, "data": {"error": "No order {{ request.view_args.id }}"}},
+                },
+                {
+                    "scenario_name": "paid",
+                    "rules": [{"target": "store", "prop": "$.status", "op": "EQUALS", "value": "paid"}],
+                    "response": {"data": {"paid": "{{ store.orders.get(request.view_args.id).item }}"}},
+                },
+            ],
+        },
+    ]
+    client = create_app(endpoints).test_client()
+    client.post("/orders", json={"item": "book", "status": "paid"})
+    client.post("/orders", json={"item": "pen", "status": "new"})
+
+    assert client.get("/orders/1").get_json() == {"paid": "book"}
+    assert client.get("/orders/2").get_json() == {"id": 2, "item": "pen", "status": "new"}
+    assert client.get("/orders/3").get_json() == {"error": "No order 3"}
+
+    assert client.post("/__pymock/store/snapshot").get_json() == {"saved": 2}
+    assert client.delete("/__pymock/store").get_json() == {"cleared": 2}
+    assert client.post("/__pymock/store/restore").get_json() == {"restored": 2}
+    assert client.get("/orders/2").status_code == 200
@@ -4,6 +4,13 @@ from pymock.server.exceptions import TemplateError
 from pymock.server.templates.handler import TemplateHandler
 
 
+@pytest.fixture(autouse=True)
+def reset_template_handler():
+    """Fixture restoring the default TemplateHandler options after each test."""
+    yield
+    TemplateHandler.configure()
+
+
 @pytest.fixture
 def temp_template(tmp_path):
     """Fixture creating a temporary Jinja2 template directory with a valid template."""
@@ -50,3 +57,37 @@ def test_render_template_empty_data(temp_template):
     templates_dir, template_name = temp_template
     result = TemplateHandler.render(template_name, {}, templates_dir)
     assert result == "Hello !"
+
+
+def test_environment_is_reused(temp_template):
+    """Test that environments are cached per templates directory and autoescape flag."""
+    templates_dir, template_name = temp_template
+    TemplateHandler.render(template_name, {}, templates_dir)
+    env = TemplateHandler._get_env(templates_dir)  # pylint: disable=protected-access
+    assert TemplateHandler._get_env(templates_dir) is env  # pylint: disable=protected-access
+    assert TemplateHandler._get_env(templates_dir, autoescape=False) is not env  # pylint: disable=protected-access
+
+
+def test_auto_reload_disabled_keeps_cached_template(temp_template):
+    """Test that without auto_reload changes on disk are only seen after clearing the cache."""
+    TemplateHandler.configure(auto_reload=False)
+    templates_dir, template_name = temp_template
+    assert TemplateHandler.render(template_name, {"name": "World"}, templates_dir) == "Hello World!"
+
+    (templates_dir / template_name).write_text("Bye {{ name }}!", encoding="utf-8")
+    assert TemplateHandler.render(template_name, {"name": "World"}, templates_dir) == "Hello World!"
+
+    TemplateHandler.clear_cache()
+    assert TemplateHandler.render(template_name, {"name": "World"}, templates_dir) == "Bye World!"
+
+
+def test_bytecode_cache_is_written_and_cleared(temp_template, tmp_path):
+    """Test the on-disk bytecode cache."""
+    bytecode_dir = tmp_path / "bytecode"
+    TemplateHandler.configure(bytecode_cache_dir=str(bytecode_dir))
+    templates_dir, template_name = temp_template
+    TemplateHandler.render(template_name, {}, templates_dir)
+    assert list(bytecode_dir.iterdir())
+
+    TemplateHandler.clear_cache()
+    assert not list(bytecode_dir.iterdir())
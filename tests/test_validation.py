@@ -0,0 +1,93 @@
+# tests/test_validation.py
+import time
+
+import pytest
+
+from pymock.app import create_app
+from pymock.server.exceptions import ConfigError
+from pymock.server.metrics import Metrics
+from pymock.server.validation import RequestValidator
+
+ORDER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "email": {"type": "string", "format": "email"},
+    },
+    "required": ["id"],
+}
+
+
+def make_endpoint(request_schema):
+    """Builds an order endpoint with the given request_schema and a single catch-all scenario."""
+    return {
+        "path": "/orders",
+        "method": "POST",
+        "request_schema": request_schema,
+        "scenarios": [{"scenario_name": "created", "rules": [], "response": {"status": 201, "data": {"ok": True}}}],
+    }
+
+
+def test_valid_requests_reach_the_scenarios():
+    """Test that requests matching the schemas are answered by the scenarios."""
+    schema = {"body": ORDER_SCHEMA, "params": {"properties": {"dry_run": {"enum": ["true", "false"]}}}}
+    client = create_app([make_endpoint(schema)]).test_client()
+    response = client.post("/orders?dry_run=true", json={"id": 1, "email": "a@example.com"})
+    assert (response.status_code, response.get_json()) == (201, {"ok": True})
+
+
+def test_invalid_requests_are_rejected_before_matching():
+    """Test that invalid targets get the configured status, listing each error with its path."""
+    metrics = Metrics()
+    schema = {"status": 422, "body": ORDER_SCHEMA, "headers": {"required": ["X-Tenant"]}}
+    client = create_app([make_endpoint(schema)], metrics=metrics).test_client()
+
+    response = client.post("/orders", json={"id": "one", "email": "not an email"})
+    assert response.status_code == 422
+    assert response.get_json() == {
+        "error": "Invalid request",
+        "details": [
+            {"target": "body", "path": "$.id", "message": "'one' is not of type 'integer'"},
+            {"target": "body", "path": "$.email", "message": "'not an email' is not a 'email'"},
+            {"target": "headers", "path": "$", "message": "'X-Tenant' is a required property"},
+        ],
+    }
+    labels = (("method", "POST"), ("path", "/orders"))
+    counters = metrics.collect()[0]
+    assert counters[("pymock_rejected_requests_total", labels)] == 1
+    assert ("pymock_requests_total", (*labels, ("scenario", "created"))) not in counters
+
+
+def test_malformed_json_body():
+    """Test that a body that is not valid JSON is rejected with the default status."""
+    client = create_app([make_endpoint({"body": ORDER_SCHEMA})]).test_client()
+    response = client.post("/orders", data="{", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["details"] == [{"target": "body", "path": "$", "message": "Malformed JSON body"}]
+
+
+def test_schemas_are_checked_when_compiling():
+    """Test that invalid schemas and settings are rejected when the endpoint is compiled."""
+    with pytest.raises(ConfigError, match=r"request_schema.body of POST /orders"):
+        create_app([make_endpoint({"body": {"type": "no such type"}})])
+    with pytest.raises(ConfigError, match="unknown keys"):
+        RequestValidator.from_config({"query": {}}, "POST /orders")
+    assert RequestValidator.from_config({"status": 422}, "POST /orders") is None
+
+
+def test_validation_is_not_timed_as_rules(monkeypatch):
+    """Test that the rules stage starts once the request was validated."""
+    validate = RequestValidator.validate
+
+    def slow_validate(self, request_data):
+        time.sleep(0.05)
+        return validate(self, request_data)
+
+    monkeypatch.setattr(RequestValidator, "validate", slow_validate)
+    metrics = Metrics()
+    client = create_app([make_endpoint({"body": ORDER_SCHEMA})], metrics=metrics).test_client()
+    assert client.post("/orders", json={"id": 1}).status_code == 201
+    histograms = metrics.collect()[1]
+    labels = (("method", "POST"), ("path", "/orders"))
+    assert histograms[("pymock_stage_duration_seconds", (*labels, ("stage", "validation")))].sum >= 0.05
+    assert histograms[("pymock_stage_duration_seconds", (*labels, ("stage", "rules")))].sum < 0.05